@@ -1,3 +1,4 @@
+import argparse
 import csv
 import os
 
@@ -10,6 +11,9 @@ from src.utilities.tools import (
     load_card_data,
 )
 
+CARDS_PATH = "data/tables/cards3.csv"
+AGGREGATED_CARDS_PATH = "data/tables/cards_aggregated.csv"
+
 
 def load_decklist(decklist_path: str) -> list:
     with open(decklist_path, "r") as file:
@@ -19,12 +23,83 @@ def load_decklist(decklist_path: str) -> list:
     return decklist
 
 
+def iter_deck_cards(deck: list):
+    """Yield (card_name, quantity, in_reserve) for each line of a loaded decklist."""
+    in_reserve = False
+    for card in deck:
+        # Check if we are entering the "Reserve" or "Tokens" section
+        if card.startswith("Reserve:"):
+            in_reserve = True
+            continue
+        elif card.startswith("Tokens:"):
+            break
+
+        card_quantity = int(card.split("\t", 1)[0].strip())
+        card_name = card.split("\t")[1]
+        yield card_name, card_quantity, in_reserve
+
+
+def get_card_row(
+    decklist_id: str,
+    player_name: str,
+    place: int,
+    card_name: str,
+    card_info: dict,
+    in_reserve: bool,
+    quantity: int,
+    card_id: str,
+) -> dict:
+    """Build a single row of the cards table."""
+    return {
+        "card_id": card_id,  # Primary key: image_file
+        "decklist_id": decklist_id,  # Foreign key: decklist file name
+        "place": place,
+        "player_name": player_name,
+        "quantity": quantity,
+        "brigade": card_info.get("Brigade", []),
+        "n_brigades": len(card_info.get("Brigade", [])),
+        "card_name": card_name,
+        "in_reserve": in_reserve,
+        "image_file": card_info.get("ImageFile", ""),
+        "official_set": card_info.get("OfficialSet", ""),
+        "type": card_info.get("Type", ""),
+        "strength": card_info.get("Strength"),
+        "toughness": card_info.get("Toughness"),
+        "class": card_info.get("Class", ""),
+        "identifier": card_info.get("Identifier", ""),
+        "special_ability": card_info.get("SpecialAbility", ""),
+        "rarity": card_info.get("Rarity", ""),
+        "reference": card_info.get("Reference", ""),
+        "alignment": card_info.get("Alignment", ""),
+        "legality": card_info.get("Legality", ""),
+    }
+
+
+def expand_card_rows(rows):
+    """Yield one row per physical copy from quantity-aggregated card rows.
+
+    The card_id of each copy matches the original per-copy table: the first copy
+    is '<player_name>_<image_file>' and later copies get a '_<n>' suffix.
+    """
+    for row in rows:
+        original_card_id = f"{row['player_name']}_{row['image_file']}"
+        for n in range(int(row["quantity"])):
+            card_id = f"{original_card_id}_{n}" if n > 0 else original_card_id
+            yield {**row, "card_id": card_id, "quantity": 1}
+
+
 def write_cards_to_csv(
     decklist_path: str,
     deck: list,
     card_data: dict,
     append: bool,
+    aggregate: bool = False,
 ):
+    """Write a deck to the cards table.
+
+    By default every physical copy gets its own row. With 'aggregate' set, one row
+    is written per (deck, card, zone) with the number of copies in 'quantity'.
+    """
     decklist_id = get_decklist_id(decklist_path)
     player_name = get_player_name(decklist_id)
     place = get_place(decklist_id)
@@ -32,72 +107,87 @@ def write_cards_to_csv(
     output_dir = "data/tables/"
     os.makedirs(output_dir, exist_ok=True)
 
-    output_file = "data/tables/cards3.csv"
+    output_file = AGGREGATED_CARDS_PATH if aggregate else CARDS_PATH
     if append:
         mode = "a"
     else:
         mode = "w"
+
+    quantities = {}
+    for card_name, card_quantity, in_reserve in iter_deck_cards(deck):
+        key = (card_name, in_reserve)
+        quantities[key] = quantities.get(key, 0) + card_quantity
+
+    rows = []
+    for (card_name, in_reserve), card_quantity in quantities.items():
+        card_info = card_data.get(card_name, {})
+        card_id = f"{player_name}_{card_info.get('ImageFile', '')}"
+        if in_reserve:
+            card_id += "_reserve"
+        rows.append(
+            get_card_row(
+                decklist_id,
+                player_name,
+                place,
+                card_name,
+                card_info,
+                in_reserve,
+                card_quantity,
+                card_id,
+            )
+        )
+    if not aggregate:
+        rows = expand_card_rows(rows)
+
     with open(output_file, mode, newline="") as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=card_schema)
-        in_reserve = False
-        writer.writeheader()
-
-        for card in deck:
-            # Check if we are entering the "Reserve" or "Tokens" section
-            if card.startswith("Reserve:"):
-                in_reserve = True
-                continue
-            elif card.startswith("Tokens:"):
-                break
-
-            card_quantity = int(card.split("\t", 1)[0].strip())
-            card_name = card.split("\t")[1]
-            card_info = card_data.get(card_name, {})
-            image_file = card_info.get("ImageFile", "")
-            card_id = f"{player_name}_{image_file}"
-            original_card_id = card_id
-            for n in range(0, card_quantity):
-                if n > 0:
-                    card_id = f"{original_card_id}_{n}"
-                writer.writerow(
-                    {
-                        "card_id": card_id,  # Primary key: image_file
-                        "decklist_id": decklist_id,  # Foreign key: decklist file name
-                        "place": place,
-                        "player_name": player_name,
-                        "brigade": card_data.get("Brigade"),
-                        "n_brigades": len(card_data.get("Brigade")),
-                        "card_name": card_name,
-                        "in_reserve": in_reserve,
-                        "image_file": image_file,
-                        "official_set": card_info.get("OfficialSet", ""),
-                        "type": card_info.get("Type", ""),
-                        "strength": card_info.get("Strength"),
-                        "toughness": card_info.get("Toughness"),
-                        "class": card_info.get("Class", ""),
-                        "identifier": card_info.get("Identifier", ""),
-                        "special_ability": card_info.get("SpecialAbility", ""),
-                        "rarity": card_info.get("Rarity", ""),
-                        "reference": card_info.get("Reference", ""),
-                        "alignment": card_info.get("Alignment", ""),
-                        "legality": card_info.get("Legality", ""),
-                    }
-                )
+        if not append:
+            writer.writeheader()
+        writer.writerows(rows)
     print(f"Deck for {player_name} from {decklist_id} written to {output_file}")
 
 
-def get_cards():
+def expand_cards_csv(
+    input_file: str = AGGREGATED_CARDS_PATH, output_file: str = CARDS_PATH
+):
+    """Rebuild the one-row-per-copy cards table from the aggregated one."""
+    with open(input_file, "r", newline="") as infile, open(
+        output_file, "w", newline=""
+    ) as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=card_schema)
+        writer.writeheader()
+        writer.writerows(expand_card_rows(csv.DictReader(infile)))
+    print(f"Expanded {input_file} into {output_file}")
+
+
+def get_cards(aggregate: bool = False):
     card_data = load_card_data()
     decklists = get_decklists()
     append = False
 
     for decklist_path in decklists:
         deck = load_decklist(decklist_path)
-        write_cards_to_csv(decklist_path, deck, card_data, append)
+        write_cards_to_csv(decklist_path, deck, card_data, append, aggregate)
         append = True
 
     return
 
 
 if __name__ == "__main__":
-    get_cards()
+    parser = argparse.ArgumentParser(description="Build the cards table")
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="write one row per (deck, card, zone) with a quantity column",
+    )
+    parser.add_argument(
+        "--expand",
+        action="store_true",
+        help="rebuild the one-row-per-copy table from the aggregated table",
+    )
+    args = parser.parse_args()
+
+    if args.expand:
+        expand_cards_csv()
+    else:
+        get_cards(aggregate=args.aggregate)
@@ -1,18 +1,65 @@
+import argparse
 import csv
+import glob
+import json
+import math
+import multiprocessing
+import os
 import random
+from array import array
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import NamedTuple
 
 from src.utilities.tools import load_card_data
 
-PACK_DISTRIBUTIONS = {
-    "Israel's Inheritance": {
-        "Roots": 5,
-        "Israel's Inheritance": {"Rare/Ultra-Rare": 1, "Common": 3},
-    },
-    "Israel's Rebellion": {
-        "Roots": 5,
-        "Israel's Rebellion": {"Rare/Ultra-Rare": 1, "Common": 3},
-    },
-}
+# Resolved from this file rather than the working directory, so the packs load
+# wherever the module is imported from
+PACK_DISTRIBUTIONS_FOLDER = Path(__file__).resolve().parents[2] / "data" / "packs"
+SIMULATION_CHUNK_SIZE = 1_000
+RARE_RARITIES = {"Rare", "Ultra-Rare", "Ultra Rare"}
+Z_95 = 1.96
+
+
+class PackSlot(NamedTuple):
+    """
+    A compiled pack slot: 'count' distinct cards of 'card_set', each drawn from
+    one of 'pools' of card indices with the matching chance in 'probabilities'.
+    """
+
+    card_set: str
+    count: int
+    pools: tuple
+    probabilities: tuple
+    cum_weights: tuple
+
+
+def load_pack_distributions(folder: str | Path = PACK_DISTRIBUTIONS_FOLDER) -> dict:
+    """
+    Read every pack configuration in 'folder' into {pack name: slots}.
+
+    Each file holds a 'name' and a list of 'slots'. A slot draws 'count' cards
+    of a 'set', optionally limited to the rarities in 'rarity_weights', which
+    map each rarity to the relative chance of drawing any one of its cards.
+
+    Raises FileNotFoundError if 'folder' does not exist.
+    """
+    if not os.path.isdir(folder):
+        raise FileNotFoundError(f"No pack distributions folder found at {folder}.")
+    distributions = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*.json"))):
+        with open(path, "r", encoding="utf-8") as file:
+            distribution = json.load(file)
+        if distribution["name"] in distributions:
+            raise ValueError(
+                f"Pack {distribution['name']} in {path} is already defined."
+            )
+        distributions[distribution["name"]] = distribution["slots"]
+    return distributions
+
+
+PACK_DISTRIBUTIONS = load_pack_distributions()
 
 
 def generate_dynamic_filename(pack_weight: dict) -> str:
@@ -24,61 +71,514 @@ def generate_dynamic_filename(pack_weight: dict) -> str:
 
 
 def save_to_json(filename: str, data: dict):
-    import json
-
     with open(filename, "w") as f:
         f.write(json.dumps(data, indent=4))
 
 
-def get_cards_by_rarity(card_set: str, rarity: str, card_data: dict) -> list[dict]:
-    """Retrieve cards by rarity from a specific card set."""
-    return [
-        card
-        for card in card_data.values()
-        if card["OfficialSet"] == card_set and card.get("Rarity") == rarity
+class PackGenerator:
+    """Open packs by sampling card indices from precomputed per-(set, rarity) pools.
+
+    The pools are built once from the card database, so drawing a pack costs
+    time in proportion to the pack size instead of the number of cards.
+    """
+
+    def __init__(
+        self,
+        card_data: dict,
+        distributions: dict = PACK_DISTRIBUTIONS,
+        rng: random.Random = None,
+    ):
+        self.cards = list(card_data.values())
+        self.rng = rng or random.Random()
+        self.pools = self._build_pools(self.cards)
+        # Looked up by every statistics chunk, so found once per generator
+        self.rare_indices = frozenset(
+            index
+            for index, card in enumerate(self.cards)
+            if card.get("Rarity") in RARE_RARITIES
+        )
+        self.slots = self._compile_distributions(distributions)
+
+    @staticmethod
+    def _build_pools(cards: list[dict]) -> dict:
+        """Group card indices by (set, rarity), and by set alone for sets like Roots."""
+        pools = {}
+        for index, card in enumerate(cards):
+            card_set = card["OfficialSet"]
+            pools.setdefault((card_set, card.get("Rarity")), array("I")).append(index)
+            pools.setdefault((card_set, None), array("I")).append(index)
+        return pools
+
+    def _compile_distributions(self, distributions: dict) -> dict:
+        """
+        Compile every pack's slots, checking them all against the card database.
+
+        Raises ValueError listing every slot that names a set or rarity without
+        cards, has a non-positive count or weight, or draws more cards than
+        its pool holds.
+        """
+        slots = {}
+        errors = []
+        for set_name, distribution in distributions.items():
+            slots[set_name] = []
+            for n_slot, slot in enumerate(distribution, start=1):
+                try:
+                    slots[set_name].append(self._compile_slot(slot))
+                except ValueError as e:
+                    errors.append(f"{set_name} slot {n_slot}: {e}")
+        if errors:
+            raise ValueError("Invalid pack distributions:\n" + "\n".join(errors))
+        return slots
+
+    def _compile_slot(self, slot: dict) -> PackSlot:
+        card_set = slot["set"]
+        count = slot["count"]
+        rarity_weights = slot.get("rarity_weights", {None: 1})
+        if count <= 0:
+            raise ValueError(f"count must be positive, got {count}")
+
+        pools = []
+        weights = []
+        for rarity, weight in rarity_weights.items():
+            pool = self.pools.get((card_set, rarity))
+            if not pool:
+                raise ValueError(
+                    f"no {rarity} cards in {card_set}"
+                    if rarity
+                    else f"no cards in {card_set}"
+                )
+            if weight <= 0:
+                raise ValueError(f"weight of {rarity} must be positive, got {weight}")
+            pools.append(pool)
+            weights.append(weight * len(pool))
+        if sum(len(pool) for pool in pools) < count:
+            raise ValueError(
+                f"draws {count} cards from {sum(len(pool) for pool in pools)}"
+            )
+
+        if len(set(rarity_weights.values())) == 1:
+            # Every card is equally likely, so draw from one combined pool
+            pools = [sum(pools, array("I"))]
+            weights = [1]
+        total = sum(weights)
+        probabilities = tuple(weight / total for weight in weights)
+        return PackSlot(
+            card_set=card_set,
+            count=count,
+            pools=tuple(pools),
+            probabilities=probabilities,
+            cum_weights=tuple(accumulate(probabilities)),
+        )
+
+    def _draw_weighted(self, slot: PackSlot) -> list[int]:
+        """Draw distinct cards, picking each card's pool by the slot's weights."""
+        drawn = []
+        while len(drawn) < slot.count:
+            pool = self.rng.choices(slot.pools, cum_weights=slot.cum_weights)[0]
+            index = self.rng.choice(pool)
+            if index not in drawn:
+                drawn.append(index)
+        return drawn
+
+    def draw_pack_indices(self, set_name: str) -> list[int]:
+        """Draw a single pack as a list of indices into self.cards."""
+        return self.draw_slots(self.slots[set_name])
+
+    def draw_slots(self, slots: list[PackSlot]) -> list[int]:
+        """Draw a pack from its compiled slots, as looked up in self.slots."""
+        indices = []
+        for slot in slots:
+            if len(slot.pools) == 1:
+                indices.extend(self.rng.sample(slot.pools[0], slot.count))
+            else:
+                indices.extend(self._draw_weighted(slot))
+        return indices
+
+    def get_pack(self, set_name: str) -> list[dict]:
+        """Create a single pack of cards based on the set name and card distribution."""
+        return [self.cards[index] for index in self.draw_pack_indices(set_name)]
+
+
+def get_pack_row_values(card: dict) -> tuple:
+    """Return the per-card columns of a pack row."""
+    return (
+        card["Name"],
+        card.get("Rarity", ""),
+        card["OfficialSet"],
+        card["Brigade"],
+        card["Type"],
+        card["Strength"],
+        card["Toughness"],
+        card["Class"],
+        card["Identifier"],
+        card["Reference"],
+        card["Alignment"],
+    )
+
+
+def simulate_chunk(
+    generator: PackGenerator,
+    pack_weight: dict,
+    chunk_start: int,
+    chunk_size: int,
+    seed: int = None,
+) -> list[list[list[int]]]:
+    """Open the packs for a contiguous chunk of simulations as card indices.
+
+    When a seed is given the generator's RNG is reseeded per chunk, so results do
+    not depend on how chunks are spread over workers.
+    """
+    if seed is not None:
+        generator.rng.seed(f"{seed}_{chunk_start}")
+    # Look the slots up once, so drawing a pack only works with card indices
+    pack_slots = [
+        (generator.slots[set_name], num_packs)
+        for set_name, num_packs in pack_weight.items()
     ]
+    simulations = []
+    for _ in range(chunk_size):
+        simulation = []
+        # Loop through each set and add the corresponding number of packs
+        for slots, num_packs in pack_slots:
+            for _ in range(num_packs):
+                simulation.append(generator.draw_slots(slots))
+        simulations.append(simulation)
+    return simulations
+
+
+def get_pack_rows(
+    generator: PackGenerator,
+    pack_weight: dict,
+    chunk_start: int,
+    chunk_size: int,
+    seed: int = None,
+) -> list[list]:
+    """Simulate a chunk and format each opened card as a CSV row."""
+    rows = []
+    simulations = simulate_chunk(generator, pack_weight, chunk_start, chunk_size, seed)
+    for sim_num, simulation in enumerate(simulations, start=chunk_start + 1):
+        for pack_num, pack in enumerate(simulation, start=1):
+            for index in pack:
+                values = get_pack_row_values(generator.cards[index])
+                rows.append([f"{sim_num}_{pack_num}_{values[0]}", sim_num, pack_num])
+                rows[-1].extend(values)
+    return rows
+
+
+_worker_generator = None
+
+
+def _init_worker():
+    """Give each worker process its own card database and pack generator."""
+    global _worker_generator
+    _worker_generator = PackGenerator(load_card_data())
+
+
+def _run_chunk(args: tuple):
+    chunk_function, pack_weight, chunk_start, chunk_size, seed = args
+    return chunk_function(_worker_generator, pack_weight, chunk_start, chunk_size, seed)
 
 
-def get_rare_ultra_rare_cards(card_set: str, card_data: dict) -> list[dict]:
-    """Retrieve cards that are either Rare or Ultra-Rare from a specific card set."""
-    return [
-        card
-        for card in card_data.values()
-        if card["OfficialSet"] == card_set and card["Rarity"] in ["Rare", "Ultra-Rare"]
+def iter_chunks(
+    chunk_function,
+    n_simulations: int,
+    pack_weight: dict,
+    seed: int = None,
+    workers: int = 1,
+    chunk_size: int = SIMULATION_CHUNK_SIZE,
+):
+    """Run chunk_function over the simulations chunk by chunk, in order.
+
+    With more than one worker, chunks are handed to a process pool a window at a
+    time so that only a bounded number of results are held in memory.
+    """
+    chunks = [
+        (
+            chunk_function,
+            pack_weight,
+            start,
+            min(chunk_size, n_simulations - start),
+            seed,
+        )
+        for start in range(0, n_simulations, chunk_size)
     ]
+    if workers <= 1:
+        _init_worker()
+        for chunk in chunks:
+            yield _run_chunk(chunk)
+            print(f"Finished simulations {chunk[2] + 1}-{chunk[2] + chunk[3]}")
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        window = workers * 2
+        for window_start in range(0, len(chunks), window):
+            window_chunks = chunks[window_start : window_start + window]
+            for chunk, result in zip(
+                window_chunks, pool.imap(_run_chunk, window_chunks)
+            ):
+                yield result
+                print(f"Finished simulations {chunk[2] + 1}-{chunk[2] + chunk[3]}")
+
+
+class PackStatistics:
+    """Running totals from pack simulations that can be merged across workers."""
+
+    def __init__(self):
+        self.n_simulations = 0
+        self.card_counts = Counter()
+        self.distinct_rares_total = 0
+        self.distinct_rares_squares = 0
+
+    def add(self, cards_opened: set, n_distinct_rares: int):
+        """Record the distinct cards and rares opened in one simulation."""
+        self.n_simulations += 1
+        self.card_counts.update(cards_opened)
+        self.distinct_rares_total += n_distinct_rares
+        self.distinct_rares_squares += n_distinct_rares**2
 
+    def merge(self, other: "PackStatistics"):
+        self.n_simulations += other.n_simulations
+        self.card_counts.update(other.card_counts)
+        self.distinct_rares_total += other.distinct_rares_total
+        self.distinct_rares_squares += other.distinct_rares_squares
 
-def get_cards_without_rarity(card_set: str, card_data: dict) -> list[dict]:
-    """Retrieve cards that do not have a rarity (like Roots)."""
-    return [card for card in card_data.values() if card["OfficialSet"] == card_set]
+    def card_probability(self, index: int) -> tuple[float, float, float]:
+        """Return the chance a card was opened with a 95% Wilson score interval."""
+        n = self.n_simulations
+        p = self.card_counts[index] / n
+        denominator = 1 + Z_95**2 / n
+        center = (p + Z_95**2 / (2 * n)) / denominator
+        margin = Z_95 * math.sqrt(p * (1 - p) / n + Z_95**2 / (4 * n**2)) / denominator
+        return p, max(center - margin, 0.0), min(center + margin, 1.0)
 
+    def distinct_rares(self) -> tuple[float, float, float]:
+        """Return the mean number of distinct rares with a 95% confidence interval."""
+        n = self.n_simulations
+        mean = self.distinct_rares_total / n
+        variance = max(self.distinct_rares_squares / n - mean**2, 0.0)
+        margin = Z_95 * math.sqrt(variance / n)
+        return mean, mean - margin, mean + margin
 
-def get_pack(set_name: str, card_data: dict) -> list[dict]:
-    """Create a single pack of cards based on the set name and card distribution."""
-    pack = []
-    distributions = PACK_DISTRIBUTIONS[set_name]
 
-    for card_set, rarity_distribution in distributions.items():
-        if isinstance(rarity_distribution, dict):
-            for rarity, count in rarity_distribution.items():
-                if rarity == "Rare/Ultra-Rare":
-                    rare_ultra_rare_cards = get_rare_ultra_rare_cards(
-                        card_set, card_data
+def get_chunk_statistics(
+    generator: PackGenerator,
+    pack_weight: dict,
+    chunk_start: int,
+    chunk_size: int,
+    seed: int = None,
+) -> PackStatistics:
+    """Simulate a chunk and fold it into a PackStatistics instead of CSV rows."""
+    statistics = PackStatistics()
+    for simulation in simulate_chunk(
+        generator, pack_weight, chunk_start, chunk_size, seed
+    ):
+        cards_opened = {index for pack in simulation for index in pack}
+        statistics.add(cards_opened, len(cards_opened & generator.rare_indices))
+    return statistics
+
+
+def get_open_probabilities(generator: PackGenerator, pack_weight: dict) -> dict:
+    """
+    Chance of opening each card at least once, from the pool sizes and weights.
+    Exact for slots drawing from one pool or drawing a single card.
+    """
+    miss_probabilities = {}
+    for set_name, num_packs in pack_weight.items():
+        for slot in generator.slots[set_name]:
+            for pool, probability in zip(slot.pools, slot.probabilities):
+                slot_miss = (1 - slot.count * probability / len(pool)) ** num_packs
+                for index in pool:
+                    miss_probabilities[index] = (
+                        miss_probabilities.get(index, 1.0) * slot_miss
                     )
-                    pack.extend(random.sample(rare_ultra_rare_cards, 1))
-                else:
-                    filtered_cards = get_cards_by_rarity(card_set, rarity, card_data)
-                    pack.extend(random.sample(filtered_cards, count))
-        else:
-            # Handle sets like "Roots" that don't have card rarities
-            filtered_cards = get_cards_without_rarity(card_set, card_data)
-            pack.extend(random.sample(filtered_cards, rarity_distribution))
+    return {index: 1 - miss for index, miss in miss_probabilities.items()}
+
+
+def get_slot_completion(pool_size: int, count: int, tolerance: float) -> list[float]:
+    """P(every card of a pool has been opened) after 0, 1, 2, ... packs.
+
+    Tracks the distribution of the number of distinct cards collected; each pack
+    adds a hypergeometric number of new cards from the 'count' drawn.
+    """
+    draws = math.comb(pool_size, count)
+    collected = [1.0] + [0.0] * pool_size
+    completion = [0.0]
+    while completion[-1] < 1 - tolerance:
+        next_collected = [0.0] * (pool_size + 1)
+        for n_collected, probability in enumerate(collected):
+            if not probability:
+                continue
+            for n_new in range(min(count, pool_size - n_collected) + 1):
+                ways = math.comb(pool_size - n_collected, n_new) * math.comb(
+                    n_collected, count - n_new
+                )
+                next_collected[n_collected + n_new] += probability * ways / draws
+        collected = next_collected
+        completion.append(collected[-1])
+    return completion
+
+
+def get_weighted_slot_completion(
+    pool_size: int, n_draws: int, probability: float, tolerance: float
+) -> list[float]:
+    """P(every card of a pool has been opened) after 0, 1, 2, ... packs, for a
+    pool each of a slot's 'n_draws' draws comes from with 'probability'.
+
+    The number of draws that landed in the pool after n packs is binomial, and
+    each of those draws is a uniform pick from the pool.
+    """
+    draw_completion = get_slot_completion(pool_size, 1, tolerance)
+    completion = [0.0]
+    while completion[-1] < 1 - tolerance:
+        n_total = len(completion) * n_draws
+        completion.append(
+            sum(
+                # Binomial probability of n_pool draws from this pool, in log
+                # space so long runs of packs do not overflow
+                math.exp(
+                    math.lgamma(n_total + 1)
+                    - math.lgamma(n_pool + 1)
+                    - math.lgamma(n_total - n_pool + 1)
+                    + n_pool * math.log(probability)
+                    + (n_total - n_pool) * math.log1p(-probability)
+                )
+                * draw_completion[min(n_pool, len(draw_completion) - 1)]
+                for n_pool in range(n_total + 1)
+            )
+        )
+    return completion
+
+
+def get_packs_to_complete(
+    generator: PackGenerator, set_name: str, tolerance: float = 1e-9
+) -> dict:
+    """Mean, median and 95th percentile packs of a set needed to open every card.
+
+    Each card set in the pack is completed independently from its own slots, so
+    the chance of completing it after n packs is the product over its slots.
+    The pools of a weighted slot are treated as independent too.
+    """
+    set_slots = {}
+    for slot in generator.slots[set_name]:
+        slot_completions = set_slots.setdefault(slot.card_set, [])
+        if len(slot.pools) == 1:
+            slot_completions.append(
+                get_slot_completion(len(slot.pools[0]), slot.count, tolerance)
+            )
+            continue
+        for pool, probability in zip(slot.pools, slot.probabilities):
+            slot_completions.append(
+                get_weighted_slot_completion(
+                    len(pool), slot.count, probability, tolerance
+                )
+            )
+
+    results = {}
+    for card_set, slot_completions in set_slots.items():
+        n_packs = max(len(completion) for completion in slot_completions)
+        completion = [
+            math.prod(c[min(n, len(c) - 1)] for c in slot_completions)
+            for n in range(n_packs)
+        ]
+        results[card_set] = {
+            "mean": sum(1 - p for p in completion),
+            "median": next(n for n, p in enumerate(completion) if p >= 0.5),
+            "p95": next(n for n, p in enumerate(completion) if p >= 0.95),
+        }
+    return results
+
+
+def get_pack_summary_rows(
+    generator: PackGenerator, pack_weight: dict, statistics: PackStatistics
+) -> list[dict]:
+    """Build the summary table from simulated statistics and analytic values."""
+    n_packs = sum(pack_weight.values())
+    rows = []
+    open_probabilities = get_open_probabilities(generator, pack_weight)
+    for index, analytic in sorted(
+        open_probabilities.items(), key=lambda item: generator.cards[item[0]]["Name"]
+    ):
+        estimate, ci_low, ci_high = statistics.card_probability(index)
+        rows.append(
+            {
+                "metric": f"p_open_in_{n_packs}_packs",
+                "subject": generator.cards[index]["Name"],
+                "estimate": estimate,
+                "ci_low": ci_low,
+                "ci_high": ci_high,
+                "analytic": analytic,
+            }
+        )
+
+    estimate, ci_low, ci_high = statistics.distinct_rares()
+    rows.append(
+        {
+            "metric": f"distinct_rares_in_{n_packs}_packs",
+            "subject": "all",
+            "estimate": estimate,
+            "ci_low": ci_low,
+            "ci_high": ci_high,
+            "analytic": sum(
+                p
+                for index, p in open_probabilities.items()
+                if index in generator.rare_indices
+            ),
+        }
+    )
+
+    for set_name in pack_weight:
+        for card_set, completion in get_packs_to_complete(generator, set_name).items():
+            for stat, value in completion.items():
+                rows.append(
+                    {
+                        "metric": f"packs_to_complete_{stat}",
+                        "subject": f"{card_set} from {set_name} packs",
+                        "estimate": "",
+                        "ci_low": "",
+                        "ci_high": "",
+                        "analytic": value,
+                    }
+                )
+    return rows
+
+
+def write_pack_summary_to_csv(filename: str, rows: list[dict]):
+    """Write the pack summary table to a CSV file."""
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(
+            file,
+            fieldnames=[
+                "metric",
+                "subject",
+                "estimate",
+                "ci_low",
+                "ci_high",
+                "analytic",
+            ],
+        )
+        writer.writeheader()
+        writer.writerows(rows)
+
 
-    return pack
+def get_pack_statistics(
+    n_simulations: int,
+    pack_weight: dict,
+    seed: int = None,
+    workers: int = 1,
+    chunk_size: int = SIMULATION_CHUNK_SIZE,
+) -> list[dict]:
+    """Simulate pack openings and return the summary table rows."""
+    statistics = PackStatistics()
+    for chunk_statistics in iter_chunks(
+        get_chunk_statistics, n_simulations, pack_weight, seed, workers, chunk_size
+    ):
+        statistics.merge(chunk_statistics)
+    generator = PackGenerator(load_card_data())
+    return get_pack_summary_rows(generator, pack_weight, statistics)
 
 
-def write_packs_to_csv(filename: str, packs: list):
-    """Write the packs to a CSV file, each card in a separate row."""
+def write_packs_to_csv(filename: str, row_chunks):
+    """Write chunks of pack rows to a CSV file, each card in a separate row."""
     with open(filename, mode="w", newline="") as file:
         writer = csv.writer(file)
         writer.writerow(
@@ -99,54 +599,71 @@ def write_packs_to_csv(filename: str, packs: list):
                 "Alignment",
             ]
         )  # Header
-        for sim_num, simulation in enumerate(packs, start=1):
-            for pack_num, pack in enumerate(simulation, start=1):
-                for card in pack:
-                    writer.writerow(
-                        [
-                            f"{sim_num}_{pack_num}_{card['Name']}",
-                            sim_num,
-                            pack_num,
-                            card["Name"],
-                            card.get("Rarity", ""),
-                            card["OfficialSet"],
-                            card["Brigade"],
-                            card["Type"],
-                            card["Strength"],
-                            card["Toughness"],
-                            card["Class"],
-                            card["Identifier"],
-                            card["Reference"],
-                            card["Alignment"],
-                        ]
-                    )
-
+        for rows in row_chunks:
+            writer.writerows(rows)
 
-def get_simulations(n_simulations: int, pack_weight: dict):
-    """Generate simulations based on pack weight."""
-    card_data = load_card_data()
-    simulations = []
 
-    for i in range(n_simulations):
-        simulation = []
-        # Loop through each set and add the corresponding number of packs
-        for set_name, num_packs in pack_weight.items():
-            for _ in range(num_packs):
-                pack = get_pack(set_name, card_data)
-                simulation.append(pack)
-        simulations.append(simulation)
-        print(f"Finished simulation {i + 1}")
-
-    return simulations
+def get_simulations(
+    n_simulations: int,
+    pack_weight: dict,
+    seed: int = None,
+    workers: int = 1,
+    chunk_size: int = SIMULATION_CHUNK_SIZE,
+):
+    """Generate simulations based on pack weight, yielding chunks of CSV rows."""
+    return iter_chunks(
+        get_pack_rows, n_simulations, pack_weight, seed, workers, chunk_size
+    )
 
 
 if __name__ == "__main__":
-    n_simulations = 10_000  # Number of simulations
+    parser = argparse.ArgumentParser(description="Simulate opening booster packs")
+    parser.add_argument(
+        "--n-simulations",
+        type=int,
+        default=10_000,
+        help="number of simulations to run",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed for reproducible simulations",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="write summary statistics instead of one row per opened card",
+    )
+    args = parser.parse_args()
+
     pack_weight = {
         "Israel's Inheritance": 3,  # Open 3 packs from this set
         "Israel's Rebellion": 3,  # Open 3 packs from this set
     }
 
-    simulations = get_simulations(n_simulations=n_simulations, pack_weight=pack_weight)
-    write_packs_to_csv(generate_dynamic_filename(pack_weight), simulations)
+    if args.summary:
+        summary_rows = get_pack_statistics(
+            n_simulations=args.n_simulations,
+            pack_weight=pack_weight,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        write_pack_summary_to_csv(
+            generate_dynamic_filename(pack_weight).replace(".csv", "_summary.csv"),
+            summary_rows,
+        )
+    else:
+        simulations = get_simulations(
+            n_simulations=args.n_simulations,
+            pack_weight=pack_weight,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        write_packs_to_csv(generate_dynamic_filename(pack_weight), simulations)
     print("Finished getting packs.")
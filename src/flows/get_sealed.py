@@ -0,0 +1,265 @@
+import argparse
+import csv
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+
+from src.flows.get_packs import (
+    PACK_DISTRIBUTIONS,
+    SIMULATION_CHUNK_SIZE,
+    PackGenerator,
+    iter_chunks,
+    simulate_chunk,
+)
+from src.m_count.decklist import get_card_tags
+from src.m_count.spectrograph_simulation import SpectrographSimulation
+
+SEALED_MIN_DECK_SIZE = 40
+# Good and evil brigades a sealed deck is built around
+BRIGADES_PER_SIDE = 2
+N_HANDS = 1_000
+SIMULATION_SETTINGS = {
+    "cycler_logic": "random",
+    "crowds_ineffectiveness_weight": 0.6,
+    "matthew_fizzle_rate": 0.15,
+}
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class SealedDeck:
+    """The parts of a Decklist the M-count simulation reads, built from a pool."""
+
+    mapped_main_deck_list: dict
+    deck_size: int
+
+    @classmethod
+    def from_indices(cls, cards: list[dict], indices: list[int]) -> "SealedDeck":
+        mapped_main_deck_list = {}
+        for index, quantity in Counter(indices).items():
+            card = cards[index]
+            mapped_main_deck_list[card["Name"]] = {
+                "name": card["Name"],
+                "type": card["Type"],
+                "brigade": card["Brigade"],
+                "alignment": card["Alignment"],
+                "quantity": quantity,
+                "tags": get_card_tags(card["Name"]),
+            }
+        return cls(mapped_main_deck_list, len(indices))
+
+
+def build_sealed_deck(
+    cards: list[dict],
+    pool: list[int],
+    min_deck_size: int = SEALED_MIN_DECK_SIZE,
+    brigades_per_side: int = BRIGADES_PER_SIDE,
+) -> list[int]:
+    """
+    Pick the cards of a sealed deck from an opened pool.
+
+    Fewer brigades in hand means fewer cards for an opposing Matthew, so the
+    deck keeps every card without a brigade and the cards of the most common
+    good and evil brigades in the pool. If that is short of 'min_deck_size',
+    the cards adding the fewest new brigades are added one at a time.
+    """
+    brigade_counts = {"Good": Counter(), "Evil": Counter()}
+    for index in pool:
+        card = cards[index]
+        if card["Alignment"] in brigade_counts:
+            brigade_counts[card["Alignment"]].update(card["Brigade"])
+    chosen = {
+        brigade
+        for counts in brigade_counts.values()
+        for brigade, _ in counts.most_common(brigades_per_side)
+    }
+
+    deck = []
+    left_out = []
+    for index in pool:
+        if chosen.issuperset(cards[index]["Brigade"]):
+            deck.append(index)
+        else:
+            left_out.append(index)
+
+    while len(deck) < min_deck_size and left_out:
+        index = min(left_out, key=lambda i: len(set(cards[i]["Brigade"]) - chosen))
+        left_out.remove(index)
+        deck.append(index)
+        chosen.update(cards[index]["Brigade"])
+    return deck
+
+
+def get_m_count(
+    deck: SealedDeck, n_hands: int = N_HANDS, rng: random.Random = None
+) -> float:
+    """Run the M-count simulation on a deck without writing a game log."""
+    simulation = SpectrographSimulation(
+        deck_file_path=None,
+        n_simulations=n_hands,
+        log_file=None,
+        rng=rng,
+        **SIMULATION_SETTINGS,
+    )
+    simulation.initialize_decklist(deck)
+    simulation.run(only_matthew_results=True)
+    return simulation.m_count
+
+
+class SealedStatistics:
+    """Per-pool results of sealed simulations that can be merged across workers."""
+
+    def __init__(self):
+        self.m_counts = []
+        self.deck_sizes = []
+        self.n_brigades = []
+
+    def add(self, m_count: float, deck: SealedDeck):
+        self.m_counts.append(m_count)
+        self.deck_sizes.append(deck.deck_size)
+        self.n_brigades.append(
+            len(
+                {
+                    brigade
+                    for card in deck.mapped_main_deck_list.values()
+                    for brigade in card["brigade"]
+                }
+            )
+        )
+
+    def merge(self, other: "SealedStatistics"):
+        self.m_counts.extend(other.m_counts)
+        self.deck_sizes.extend(other.deck_sizes)
+        self.n_brigades.extend(other.n_brigades)
+
+    def summary(self) -> dict:
+        """Mean, standard deviation and percentiles of the M-count over pools."""
+        n = len(self.m_counts)
+        mean = sum(self.m_counts) / n
+        variance = sum((m_count - mean) ** 2 for m_count in self.m_counts) / n
+        m_counts = sorted(self.m_counts)
+        row = {"n_pools": n, "mean_m_count": mean, "std_m_count": math.sqrt(variance)}
+        for percentile in PERCENTILES:
+            # Nearest-rank percentile
+            rank = max(math.ceil(percentile / 100 * n), 1)
+            row[f"p{percentile}_m_count"] = m_counts[rank - 1]
+        row["mean_deck_size"] = sum(self.deck_sizes) / n
+        row["mean_n_brigades"] = sum(self.n_brigades) / n
+        return row
+
+
+def get_chunk_sealed_statistics(
+    generator: PackGenerator,
+    pack_weight: dict,
+    chunk_start: int,
+    chunk_size: int,
+    seed: int = None,
+    min_deck_size: int = SEALED_MIN_DECK_SIZE,
+    n_hands: int = N_HANDS,
+) -> SealedStatistics:
+    """Open a chunk of sealed pools, build a deck from each and simulate it."""
+    # Seeded per chunk like simulate_chunk, without touching the global random
+    rng = random.Random(f"{seed}_{chunk_start}_hands") if seed is not None else None
+    statistics = SealedStatistics()
+    for simulation in simulate_chunk(
+        generator, pack_weight, chunk_start, chunk_size, seed
+    ):
+        pool = [index for pack in simulation for index in pack]
+        deck = SealedDeck.from_indices(
+            generator.cards, build_sealed_deck(generator.cards, pool, min_deck_size)
+        )
+        statistics.add(get_m_count(deck, n_hands, rng), deck)
+    return statistics
+
+
+def get_sealed_statistics(
+    n_pools: int,
+    pack_weight: dict,
+    seed: int = None,
+    workers: int = 1,
+    min_deck_size: int = SEALED_MIN_DECK_SIZE,
+    n_hands: int = N_HANDS,
+    chunk_size: int = SIMULATION_CHUNK_SIZE // 10,
+) -> SealedStatistics:
+    """Simulate 'n_pools' sealed pools opened from the packs in 'pack_weight'."""
+    statistics = SealedStatistics()
+    chunk_function = partial(
+        get_chunk_sealed_statistics, min_deck_size=min_deck_size, n_hands=n_hands
+    )
+    for chunk_statistics in iter_chunks(
+        chunk_function, n_pools, pack_weight, seed, workers, chunk_size
+    ):
+        statistics.merge(chunk_statistics)
+    return statistics
+
+
+def get_set_mixes(n_packs: int) -> dict:
+    """Each set on its own, and all sets in PACK_DISTRIBUTIONS split evenly."""
+    set_mixes = {set_name: {set_name: n_packs} for set_name in PACK_DISTRIBUTIONS}
+    if len(PACK_DISTRIBUTIONS) > 1:
+        packs_per_set = max(n_packs // len(PACK_DISTRIBUTIONS), 1)
+        set_mixes[" + ".join(PACK_DISTRIBUTIONS)] = {
+            set_name: packs_per_set for set_name in PACK_DISTRIBUTIONS
+        }
+    return set_mixes
+
+
+def write_sealed_summary_to_csv(filename: str, rows: list[dict]):
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Simulate sealed pools, build a deck from each and M-count it"
+    )
+    parser.add_argument(
+        "--n-pools", type=int, default=1_000, help="number of pools per set mix"
+    )
+    parser.add_argument(
+        "--n-packs", type=int, default=6, help="number of packs in a sealed pool"
+    )
+    parser.add_argument(
+        "--n-hands",
+        type=int,
+        default=N_HANDS,
+        help="number of opening hands simulated per deck",
+    )
+    parser.add_argument(
+        "--deck-size",
+        type=int,
+        default=SEALED_MIN_DECK_SIZE,
+        help="minimum sealed deck size",
+    )
+    parser.add_argument("--seed", type=int, help="seed for reproducible simulations")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="number of worker processes"
+    )
+    args = parser.parse_args()
+
+    rows = []
+    for set_mix, pack_weight in get_set_mixes(args.n_packs).items():
+        print(f"Simulating {args.n_pools} sealed pools of {set_mix}")
+        statistics = get_sealed_statistics(
+            n_pools=args.n_pools,
+            pack_weight=pack_weight,
+            seed=args.seed,
+            workers=args.workers,
+            min_deck_size=args.deck_size,
+            n_hands=args.n_hands,
+        )
+        row = {"set_mix": set_mix}
+        row.update(statistics.summary())
+        print(
+            f"{set_mix}: mean M-count {row['mean_m_count']:.2f} "
+            f"(median {row['p50_m_count']:.2f}, 5-95% "
+            f"{row['p5_m_count']:.2f}-{row['p95_m_count']:.2f})"
+        )
+        rows.append(row)
+
+    write_sealed_summary_to_csv(f"data/tables/sealed_{args.n_packs}_packs.csv", rows)
+    print("Finished sealed simulations.")
@@ -0,0 +1,226 @@
+import csv
+import os
+import sqlite3
+
+from src.flows.get_cards import iter_deck_cards, load_decklist
+from src.utilities.tools import (
+    get_decklist_id,
+    get_decklists,
+    get_place,
+    get_player_name,
+    load_card_data,
+)
+
+STORE_PATH = "data/tables/nationals.sqlite"
+DECKS_TABLE_PATH = "data/tables/decks5.csv"
+N_ROUNDS = 7
+
+SCHEMA = """
+CREATE TABLE card_dim (
+    card_id INTEGER PRIMARY KEY,
+    card_name TEXT NOT NULL UNIQUE,
+    image_file TEXT,
+    official_set TEXT,
+    type TEXT,
+    brigade TEXT,
+    n_brigades INTEGER,
+    strength TEXT,
+    toughness TEXT,
+    class TEXT,
+    identifier TEXT,
+    special_ability TEXT,
+    rarity TEXT,
+    reference TEXT,
+    alignment TEXT,
+    legality TEXT
+);
+CREATE TABLE card_brigade (
+    card_id INTEGER NOT NULL REFERENCES card_dim (card_id),
+    brigade TEXT NOT NULL,
+    PRIMARY KEY (card_id, brigade)
+);
+CREATE TABLE deck_fact (
+    decklist_id TEXT PRIMARY KEY,
+    player_name TEXT,
+    place INTEGER,
+    offense TEXT,
+    defense TEXT,
+    m_count REAL,
+    n_cards INTEGER,
+    soul_differential INTEGER,
+    win_percentage REAL,
+    n_games_played INTEGER
+);
+CREATE TABLE deck_card (
+    decklist_id TEXT NOT NULL REFERENCES deck_fact (decklist_id),
+    card_id INTEGER NOT NULL REFERENCES card_dim (card_id),
+    in_reserve INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    PRIMARY KEY (decklist_id, card_id, in_reserve)
+);
+CREATE TABLE round_fact (
+    decklist_id TEXT NOT NULL REFERENCES deck_fact (decklist_id),
+    round_number INTEGER NOT NULL,
+    opponent TEXT,
+    score REAL,
+    ls_differential INTEGER,
+    player_score INTEGER,
+    opponent_score INTEGER,
+    opponent_offense TEXT,
+    opponent_defense TEXT,
+    PRIMARY KEY (decklist_id, round_number)
+);
+CREATE INDEX idx_card_dim_type ON card_dim (type);
+CREATE INDEX idx_card_brigade_brigade ON card_brigade (brigade);
+CREATE INDEX idx_deck_fact_offense ON deck_fact (offense);
+CREATE INDEX idx_deck_fact_defense ON deck_fact (defense);
+CREATE INDEX idx_deck_card_card_id ON deck_card (card_id);
+CREATE INDEX idx_round_fact_opponent ON round_fact (opponent);
+"""
+
+
+def _to_number(value: str, cast=float):
+    """Convert a CSV cell to a number, keeping blanks as NULL."""
+    if value is None or value == "":
+        return None
+    return cast(float(value))
+
+
+def load_deck_table(decks_table_path: str = DECKS_TABLE_PATH) -> dict:
+    """Load the wide decks table keyed by decklist_id, if it has been generated."""
+    if not os.path.exists(decks_table_path):
+        print(f"No deck table found at {decks_table_path}. Skipping deck metrics.")
+        return {}
+    with open(decks_table_path, "r", newline="") as csvfile:
+        return {row["decklist_id"]: row for row in csv.DictReader(csvfile)}
+
+
+def insert_cards(connection: sqlite3.Connection, card_data: dict) -> dict:
+    """Fill the card dimension and return a card name -> card_id lookup."""
+    card_ids = {}
+    for card_id, (card_name, card_info) in enumerate(card_data.items(), start=1):
+        brigades = card_info.get("Brigade") or []
+        connection.execute(
+            "INSERT INTO card_dim VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                card_id,
+                card_name,
+                card_info.get("ImageFile", ""),
+                card_info.get("OfficialSet", ""),
+                card_info.get("Type", ""),
+                "/".join(brigades),
+                len(brigades),
+                card_info.get("Strength", ""),
+                card_info.get("Toughness", ""),
+                card_info.get("Class", ""),
+                card_info.get("Identifier", ""),
+                card_info.get("SpecialAbility", ""),
+                card_info.get("Rarity", ""),
+                card_info.get("Reference", ""),
+                card_info.get("Alignment", ""),
+                card_info.get("Legality", ""),
+            ),
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO card_brigade VALUES (?, ?)",
+            [(card_id, brigade) for brigade in brigades],
+        )
+        card_ids[card_name] = card_id
+    return card_ids
+
+
+def get_card_id(connection: sqlite3.Connection, card_ids: dict, card_name: str) -> int:
+    """Look up a card_id, adding a bare dimension row for cards missing from the DB."""
+    if card_name not in card_ids:
+        print(f"Could not find {card_name} in card data. Adding it without metadata.")
+        cursor = connection.execute(
+            "INSERT INTO card_dim (card_name, n_brigades) VALUES (?, 0)", (card_name,)
+        )
+        card_ids[card_name] = cursor.lastrowid
+    return card_ids[card_name]
+
+
+def insert_deck(connection: sqlite3.Connection, decklist_id: str, deck_row: dict):
+    """Insert the deck fact and its round facts from a row of the decks table."""
+    connection.execute(
+        "INSERT INTO deck_fact VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            decklist_id,
+            get_player_name(decklist_id),
+            get_place(decklist_id),
+            deck_row.get("offense"),
+            deck_row.get("defense"),
+            _to_number(deck_row.get("m_count")),
+            _to_number(deck_row.get("n_cards"), int),
+            _to_number(deck_row.get("soul_differential"), int),
+            _to_number(deck_row.get("win_percentage")),
+            _to_number(deck_row.get("n_games_played"), int),
+        ),
+    )
+    if not deck_row:
+        return
+    connection.executemany(
+        "INSERT INTO round_fact VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                decklist_id,
+                n,
+                deck_row.get(f"round_{n}_opponent"),
+                _to_number(deck_row.get(f"round_{n}_score")),
+                _to_number(deck_row.get(f"round_{n}_ls_differential"), int),
+                _to_number(deck_row.get(f"round_{n}_player_score"), int),
+                _to_number(deck_row.get(f"round_{n}_opponent_score"), int),
+                deck_row.get(f"round_{n}_opponent_offense"),
+                deck_row.get(f"round_{n}_opponent_defense"),
+            )
+            for n in range(1, N_ROUNDS + 1)
+        ],
+    )
+
+
+def insert_deck_cards(
+    connection: sqlite3.Connection, decklist_id: str, deck: list, card_ids: dict
+):
+    """Insert one bridge row per (deck, card, zone) with the summed quantity."""
+    quantities = {}
+    for card_name, quantity, in_reserve in iter_deck_cards(deck):
+        key = (get_card_id(connection, card_ids, card_name), int(in_reserve))
+        quantities[key] = quantities.get(key, 0) + quantity
+    connection.executemany(
+        "INSERT INTO deck_card VALUES (?, ?, ?, ?)",
+        [
+            (decklist_id, card_id, in_reserve, quantity)
+            for (card_id, in_reserve), quantity in quantities.items()
+        ],
+    )
+
+
+def get_store(store_path: str = STORE_PATH):
+    """Export the card and deck tables into a normalized SQLite star schema."""
+    card_data = load_card_data()
+    deck_table = load_deck_table()
+
+    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+    if os.path.exists(store_path):
+        os.remove(store_path)
+
+    connection = sqlite3.connect(store_path)
+    try:
+        connection.executescript(SCHEMA)
+        card_ids = insert_cards(connection, card_data)
+        for decklist_path in get_decklists():
+            decklist_id = get_decklist_id(decklist_path)
+            insert_deck(connection, decklist_id, deck_table.get(decklist_id, {}))
+            insert_deck_cards(
+                connection, decklist_id, load_decklist(decklist_path), card_ids
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+    print(f"Wrote analytical store to {store_path}")
+
+
+if __name__ == "__main__":
+    get_store()
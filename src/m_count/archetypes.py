@@ -0,0 +1,452 @@
+import argparse
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations
+
+from src.m_count.bulk_loader import load_decks
+from src.m_count.card_catalog import load_card_catalog
+from src.m_count.compact_deck import MAIN_DECK
+from src.schemas.decks import metadata_tags
+from src.utilities.tools import get_place
+
+OFFENSE = "offense"
+DEFENSE = "defense"
+SIDE_ALIGNMENTS = {OFFENSE: "Good", DEFENSE: "Evil"}
+CHARACTER_TYPES = ("Hero", "Evil Character", "GE", "EE")
+MISC_LABEL = "misc"
+
+# Identifiers that name an archetype on their own, checked before brigades
+ARCHETYPE_IDENTIFIERS = {
+    OFFENSE: {
+        "nativity": "nativity",
+        "musician": "music leader",
+        "wilderness": "wilderness",
+        "tabernacle high priest": "priests",
+        "priest": "priests",
+    },
+    DEFENSE: {
+        "herod": "herods",
+        "thief": "thieves",
+        "demon": "demons",
+        "babylonian": "babylonians",
+    },
+}
+# Shares of a side's character copies needed to name the archetype after an
+# identifier, a single brigade, or the second of two brigades
+IDENTIFIER_SHARE = 0.2
+MAIN_BRIGADE_SHARE = 0.5
+SECOND_BRIGADE_SHARE = 0.3
+BRIGADE_SEPARATORS = re.compile(r"[/()]")
+
+METRICS = ("jaccard", "cosine")
+DEFAULT_THRESHOLD = 0.3
+# Above this many decks, pairs are found with MinHash instead of exactly
+MINHASH_MIN_VECTORS = 1000
+MINHASH_PRIME = (1 << 61) - 1
+N_HASHES = 128
+# Bits below the card id that hold the copy number of a card copy element, far
+# more than any card quantity
+COPY_BITS = 32
+# Candidate pairs are drawn with a band threshold below the similarity
+# threshold, so few similar pairs are missed
+BAND_THRESHOLD_MARGIN = 0.8
+
+
+def weighted_jaccard(a: dict, b: dict) -> float:
+    """Sum of the smaller quantities over sum of the larger, for card counts."""
+    shared = sum(
+        min(quantity, b[card_id]) for card_id, quantity in a.items() if card_id in b
+    )
+    total = sum(a.values()) + sum(b.values()) - shared
+    return shared / total if total else 0.0
+
+
+def cosine_similarity(a: dict, b: dict) -> float:
+    dot = sum(quantity * b[card_id] for card_id, quantity in a.items() if card_id in b)
+    norm = (sum(q * q for q in a.values()) * sum(q * q for q in b.values())) ** 0.5
+    return dot / norm if norm else 0.0
+
+
+def get_similarity(a: dict, b: dict, metric: str) -> float:
+    if metric == "jaccard":
+        return weighted_jaccard(a, b)
+    if metric == "cosine":
+        return cosine_similarity(a, b)
+    raise ValueError(f"Unknown similarity metric: {metric}")
+
+
+def get_elements(vector: dict) -> frozenset:
+    """
+    Each copy of a card as its own element, the card id above the copy number,
+    so the elements two vectors share are exactly the card copies they share.
+    """
+    return frozenset(
+        card_id << COPY_BITS | copy
+        for card_id, quantity in vector.items()
+        for copy in range(quantity)
+    )
+
+
+class PairScorer:
+    """
+    Similarity of pairs of vectors with the per-vector work done once.
+
+    For weighted Jaccard every card copy in the collection is numbered, and
+    each vector is kept as a bitmask of its copies, so the copies two vectors
+    share are counted with one AND. For cosine each vector keeps the set of its
+    card ids and its norm, so only the shared cards are multiplied.
+    """
+
+    def __init__(self, vectors: list, metric: str):
+        if metric == "jaccard":
+            element_bits = {}
+            self.masks = []
+            for vector in vectors:
+                mask = 0
+                for element in get_elements(vector):
+                    mask |= 1 << element_bits.setdefault(element, len(element_bits))
+                self.masks.append(mask)
+            self.totals = [sum(vector.values()) for vector in vectors]
+        elif metric == "cosine":
+            self.card_ids = [frozenset(vector) for vector in vectors]
+            self.norms = [
+                sum(q * q for q in vector.values()) ** 0.5 for vector in vectors
+            ]
+        else:
+            raise ValueError(f"Unknown similarity metric: {metric}")
+        self.vectors = vectors
+        self.metric = metric
+
+    def get_similar_pairs(self, pairs, threshold: float) -> list:
+        """Keep the (i, j) pairs at least 'threshold' similar, with their similarity."""
+        similar_pairs = []
+        if self.metric == "jaccard":
+            masks, totals = self.masks, self.totals
+            for i, j in pairs:
+                shared = bin(masks[i] & masks[j]).count("1")
+                if not shared:
+                    continue
+                similarity = shared / (totals[i] + totals[j] - shared)
+                if similarity >= threshold:
+                    similar_pairs.append((i, j, similarity))
+            return similar_pairs
+
+        vectors, card_ids, norms = self.vectors, self.card_ids, self.norms
+        for i, j in pairs:
+            vector_i, vector_j = vectors[i], vectors[j]
+            dot = sum(
+                vector_i[card_id] * vector_j[card_id]
+                for card_id in card_ids[i] & card_ids[j]
+            )
+            if not dot:
+                continue
+            similarity = dot / (norms[i] * norms[j])
+            if similarity >= threshold:
+                similar_pairs.append((i, j, similarity))
+        return similar_pairs
+
+
+def get_exact_pairs(vectors: list, threshold: float, metric: str) -> list:
+    """
+    Return (i, j, similarity) for every pair of vectors at least 'threshold'
+    similar. Each vector is only compared with the vectors found through an
+    inverted index of card id to vectors, so pairs without a card in common
+    are never visited.
+    """
+    scorer = PairScorer(vectors, metric)
+    postings = {}
+    for i, vector in enumerate(vectors):
+        for card_id in vector:
+            postings.setdefault(card_id, []).append(i)
+
+    candidates = (
+        (i, j)
+        for i, vector in enumerate(vectors)
+        for j in set().union(*(postings[card_id] for card_id in vector))
+        if j > i
+    )
+    return scorer.get_similar_pairs(candidates, threshold)
+
+
+class MinHasher:
+    """
+    MinHash signatures of card-count vectors. Each copy of a card is its own
+    element, so the share of matching signature slots estimates the weighted
+    Jaccard similarity of two decks.
+
+    The same card copies appear in many decks, so each element's hashes are
+    computed once and kept for the life of the hasher.
+    """
+
+    def __init__(self, n_hashes: int = N_HASHES, seed: int = 0):
+        rng = random.Random(seed)
+        self.coefficients = [
+            (rng.randrange(1, MINHASH_PRIME), rng.randrange(MINHASH_PRIME))
+            for _ in range(n_hashes)
+        ]
+        self._element_hashes = {}
+
+    def get_hashes(self, element: int) -> tuple:
+        hashes = self._element_hashes.get(element)
+        if hashes is None:
+            hashes = tuple(
+                (a * element + b) % MINHASH_PRIME for a, b in self.coefficients
+            )
+            self._element_hashes[element] = hashes
+        return hashes
+
+    def signature(self, vector: dict) -> tuple:
+        elements = get_elements(vector)
+        if not elements:
+            return (MINHASH_PRIME,) * len(self.coefficients)
+        return tuple(map(min, zip(*map(self.get_hashes, elements))))
+
+
+def get_band_rows(threshold: float, n_hashes: int = N_HASHES) -> int:
+    """
+    Return the most signature slots per band for which pairs about as similar
+    as 'threshold' are still likely to share a band. With b bands of r rows,
+    pairs become likely candidates above a similarity of about (1/b)^(1/r).
+    """
+    rows = 1
+    while (
+        n_hashes % (rows * 2) == 0
+        and (rows * 2 / n_hashes) ** (1 / (rows * 2))
+        <= threshold * BAND_THRESHOLD_MARGIN
+    ):
+        rows *= 2
+    return rows
+
+
+def get_candidate_pairs(signatures: list, rows: int) -> set:
+    """
+    Locality-sensitive hashing: vectors whose signatures agree on every slot of
+    at least one band of 'rows' slots become a candidate pair.
+    """
+    candidates = set()
+    for band in range(len(signatures[0]) // rows):
+        buckets = {}
+        for i, signature in enumerate(signatures):
+            key = signature[band * rows : (band + 1) * rows]
+            buckets.setdefault(key, []).append(i)
+        for bucket in buckets.values():
+            candidates.update(combinations(bucket, 2))
+    return candidates
+
+
+def get_similar_pairs(
+    vectors: list, threshold: float = DEFAULT_THRESHOLD, metric: str = "jaccard"
+) -> list:
+    """
+    Return (i, j, similarity) for the pairs of vectors at least 'threshold'
+    similar. Small collections are compared exactly; larger ones only compare
+    the candidate pairs found by MinHash, which may miss a few borderline pairs.
+    """
+    if len(vectors) <= MINHASH_MIN_VECTORS:
+        return get_exact_pairs(vectors, threshold, metric)
+
+    scorer = PairScorer(vectors, metric)
+    min_hasher = MinHasher()
+    signatures = [min_hasher.signature(vector) for vector in vectors]
+    candidates = get_candidate_pairs(signatures, get_band_rows(threshold))
+    return scorer.get_similar_pairs(candidates, threshold)
+
+
+def cluster_vectors(
+    vectors: list, threshold: float = DEFAULT_THRESHOLD, metric: str = "jaccard"
+) -> list[list[int]]:
+    """
+    Group vectors into clusters, largest first.
+
+    The vector with the most unclustered neighbours at least 'threshold'
+    similar starts a cluster with those neighbours, and this repeats until
+    every vector is clustered. Unlike joining every similar pair, a hybrid
+    deck cannot chain two archetypes into one cluster.
+    """
+    neighbours = [set() for _ in vectors]
+    for i, j, _ in get_similar_pairs(vectors, threshold, metric):
+        neighbours[i].add(j)
+        neighbours[j].add(i)
+
+    unclustered = set(range(len(vectors)))
+    clusters = []
+    while unclustered:
+        center = max(
+            sorted(unclustered), key=lambda i: len(neighbours[i] & unclustered)
+        )
+        cluster = sorted({center} | (neighbours[center] & unclustered))
+        unclustered.difference_update(cluster)
+        clusters.append(cluster)
+    return clusters
+
+
+def get_side_vector(deck, catalog, side: str) -> dict:
+    """Return {card id: quantity} for the main deck cards on one side."""
+    alignment = SIDE_ALIGNMENTS[side]
+    return {
+        card_id: quantity
+        for card_id, quantity in deck.iter_cards(MAIN_DECK)
+        if catalog.get_row(card_id)["alignment"] == alignment
+    }
+
+
+def merge_printings(vector: dict, catalog) -> dict:
+    """Count every printing of a card under the id of its first printing."""
+    merged = Counter()
+    for card_id, quantity in vector.items():
+        merged[catalog.get_base_id(card_id)] += quantity
+    return dict(merged)
+
+
+def get_brigades(brigade: str) -> set:
+    """Split a brigade field such as 'Purple (Clay)' or 'White/Clay' into names."""
+    return {
+        name.strip().lower()
+        for name in BRIGADE_SEPARATORS.split(brigade)
+        if name.strip()
+    }
+
+
+def propose_label(counts: dict, catalog, side: str) -> str:
+    """
+    Name the archetype of a side's card counts from its characters and
+    enhancements: an archetype identifier carried by enough of them, otherwise
+    the brigade most of them belong to, or the two brigades they share.
+    """
+    identifier_counts = Counter()
+    brigade_counts = Counter()
+    n_characters = 0
+    for card_id, quantity in counts.items():
+        row = catalog.get_row(card_id)
+        if not any(card_type in row["type"] for card_type in CHARACTER_TYPES):
+            continue
+        n_characters += quantity
+        labels = {
+            ARCHETYPE_IDENTIFIERS[side].get(identifier.strip().lower())
+            for identifier in row["identifier"].split(",")
+        }
+        for label in labels - {None}:
+            identifier_counts[label] += quantity
+        for brigade in get_brigades(row["brigade"]):
+            brigade_counts[brigade] += quantity
+
+    if not n_characters:
+        return MISC_LABEL
+    if identifier_counts:
+        label, count = identifier_counts.most_common(1)[0]
+        if count / n_characters >= IDENTIFIER_SHARE:
+            return label
+
+    top = brigade_counts.most_common(2)
+    if top and top[0][1] / n_characters >= MAIN_BRIGADE_SHARE:
+        return top[0][0]
+    if len(top) == 2 and top[1][1] / n_characters >= SECOND_BRIGADE_SHARE:
+        return "/".join(sorted(brigade for brigade, _ in top))
+    return MISC_LABEL
+
+
+@dataclass
+class Archetype:
+    side: str
+    label: str
+    deck_names: list
+
+
+def find_archetypes(
+    decks: list,
+    catalog,
+    side: str,
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "jaccard",
+) -> list[Archetype]:
+    """
+    Cluster the decks by the cards on one side and label each cluster from the
+    combined card counts of its decks. Reprints count as the same card when
+    comparing decks, but keep their own identifiers for the label.
+    """
+    vectors = [get_side_vector(deck, catalog, side) for deck in decks]
+    merged_vectors = [merge_printings(vector, catalog) for vector in vectors]
+    archetypes = []
+    for cluster in cluster_vectors(merged_vectors, threshold, metric):
+        counts = Counter()
+        for i in cluster:
+            counts.update(vectors[i])
+        archetypes.append(
+            Archetype(
+                side=side,
+                label=propose_label(counts, catalog, side),
+                deck_names=[decks[i].name for i in cluster],
+            )
+        )
+    return archetypes
+
+
+def propose_metadata_tags(
+    decks: list,
+    catalog,
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "jaccard",
+) -> dict:
+    """
+    Propose {deck name: {'offense': label, 'defense': label}}, the shape of
+    'metadata_tags', with every deck labelled by its archetype on each side.
+    """
+    tags = {deck.name: {} for deck in decks}
+    for side in (OFFENSE, DEFENSE):
+        for archetype in find_archetypes(decks, catalog, side, threshold, metric):
+            for deck_name in archetype.deck_names:
+                tags[deck_name][side] = archetype.label
+    return tags
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cluster decks into offense and defense archetypes."
+    )
+    parser.add_argument("path", help="Folder or zip archive of .txt/.dek decks")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Similarity needed to put two decks in the same archetype",
+    )
+    parser.add_argument("--metric", choices=METRICS, default="jaccard")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of decks to parse in parallel"
+    )
+    args = parser.parse_args()
+
+    catalog = load_card_catalog()
+    errors = []
+    decks = list(load_decks(args.path, workers=args.workers, errors=errors))
+    for entry_name, error in errors:
+        print(f"Error parsing {entry_name}: {error}")
+
+    tags = {}
+    for side in (OFFENSE, DEFENSE):
+        archetypes = find_archetypes(decks, catalog, side, args.threshold, args.metric)
+        print(f"{len(archetypes)} {side} archetype(s):")
+        for archetype in archetypes:
+            print(f"  {archetype.label} ({len(archetype.deck_names)}):")
+            for deck_name in archetype.deck_names:
+                print(f"    {deck_name}")
+                tags.setdefault(deck_name, {})[side] = archetype.label
+
+    # Compare with the hand-entered tags where the deck's place has them
+    n_compared = 0
+    n_agreed = Counter()
+    for deck_name, deck_tags in tags.items():
+        hand_tags = metadata_tags.get(str(get_place(deck_name)))
+        if hand_tags is None:
+            continue
+        n_compared += 1
+        for side in (OFFENSE, DEFENSE):
+            n_agreed[side] += deck_tags[side] == hand_tags[side]
+    if n_compared:
+        print(
+            f"Agreement with metadata_tags over {n_compared} deck(s): "
+            f"offense {n_agreed[OFFENSE] / n_compared:.0%}, "
+            f"defense {n_agreed[DEFENSE] / n_compared:.0%}"
+        )
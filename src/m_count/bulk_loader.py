@@ -0,0 +1,162 @@
+import argparse
+import io
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src.m_count.card_catalog import CARD_DATA_PATH, load_card_catalog
+from src.m_count.compact_deck import CompactDeck
+from src.m_count.decklist import parse_dek_file, parse_txt_lines
+from src.utilities.deck_index import DECK_EXTENSIONS
+
+# Decks parsed or waiting in the pool per worker, which bounds how many
+# undecoded files are held in memory at once
+MAX_PENDING_PER_WORKER = 4
+
+
+def is_deck_entry(entry_name: str) -> bool:
+    """Skip folders and the resource fork files macOS adds to zip archives."""
+    base_name = os.path.basename(entry_name)
+    return (
+        entry_name.lower().endswith(DECK_EXTENSIONS)
+        and not entry_name.startswith("__MACOSX/")
+        and not base_name.startswith("._")
+    )
+
+
+def iter_deck_sources(path: str):
+    """
+    Yield (entry name, file contents) for every deck file in a folder, a folder
+    tree or a zip archive, in name order. Files are read one at a time.
+
+    Raises FileNotFoundError if 'path' does not exist.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            entries = [
+                info
+                for info in archive.infolist()
+                if not info.is_dir() and is_deck_entry(info.filename)
+            ]
+            for info in sorted(entries, key=lambda info: info.filename):
+                yield info.filename, archive.read(info)
+        return
+
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"No deck folder or zip archive found at {path}.")
+    for folder, subfolders, file_names in os.walk(path):
+        subfolders.sort()
+        for file_name in sorted(file_names):
+            entry_path = os.path.join(folder, file_name)
+            entry_name = os.path.relpath(entry_path, path)
+            if is_deck_entry(entry_name):
+                with open(entry_path, "rb") as file:
+                    yield entry_name, file.read()
+
+
+def parse_deck_source(
+    entry_name: str, contents: bytes, card_data_path: str = CARD_DATA_PATH
+) -> CompactDeck:
+    """Parse one .txt or .dek deck into a CompactDeck."""
+    if entry_name.lower().endswith(".dek"):
+        main_deck_list, reserve_list = parse_dek_file(io.BytesIO(contents))
+    else:
+        text = contents.decode("utf-8-sig", errors="replace")
+        main_deck_list, reserve_list, _ = parse_txt_lines(text.splitlines())
+    name = os.path.splitext(os.path.basename(entry_name))[0]
+    return CompactDeck.from_card_lists(
+        name, main_deck_list, reserve_list, load_card_catalog(card_data_path)
+    )
+
+
+def _init_parse_worker(card_data_path: str):
+    # Load the card database once per worker rather than once per deck
+    load_card_catalog(card_data_path)
+
+
+def load_decks(
+    path: str,
+    workers: int = 1,
+    errors: list = None,
+    card_data_path: str = CARD_DATA_PATH,
+):
+    """
+    Yield a CompactDeck for every deck in a folder or zip archive, in name order.
+
+    Decks are parsed by up to 'workers' processes that each load the card
+    database once. Only a few decks per worker are read ahead, so memory does
+    not grow with the size of the archive.
+
+    Decks that fail to parse are skipped and added to 'errors' as
+    (entry name, error) pairs.
+    """
+    if errors is None:
+        errors = []
+    sources = iter_deck_sources(path)
+
+    if workers <= 1:
+        for entry_name, contents in sources:
+            try:
+                yield parse_deck_source(entry_name, contents, card_data_path)
+            except Exception as e:
+                errors.append((entry_name, e))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_parse_worker,
+        initargs=(card_data_path,),
+    ) as executor:
+        pending = deque()
+        for entry_name, contents in sources:
+            pending.append(
+                (
+                    entry_name,
+                    executor.submit(
+                        parse_deck_source, entry_name, contents, card_data_path
+                    ),
+                )
+            )
+            if len(pending) < workers * MAX_PENDING_PER_WORKER:
+                continue
+            entry_name, future = pending.popleft()
+            try:
+                yield future.result()
+            except Exception as e:
+                errors.append((entry_name, e))
+
+        while pending:
+            entry_name, future = pending.popleft()
+            try:
+                yield future.result()
+            except Exception as e:
+                errors.append((entry_name, e))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Parse every deck in a folder or zip archive."
+    )
+    parser.add_argument("path", help="Folder or zip archive of .txt/.dek decks")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of decks to parse in parallel"
+    )
+    args = parser.parse_args()
+
+    errors = []
+    n_decks = 0
+    for deck in load_decks(args.path, workers=args.workers, errors=errors):
+        n_decks += 1
+        unresolved = (
+            f" ({len(deck.unresolved_cards)} unresolved)"
+            if deck.unresolved_cards
+            else ""
+        )
+        print(
+            f"{deck.name}: {deck.deck_size} cards, "
+            f"{deck.reserve_size} in reserve{unresolved}"
+        )
+    for entry_name, error in errors:
+        print(f"Error parsing {entry_name}: {error}")
+    print(f"Loaded {n_decks} deck(s), {len(errors)} error(s).")
@@ -0,0 +1,70 @@
+from functools import lru_cache
+
+from src.m_count.decklist import iter_card_rows
+from src.utilities.card_names import (
+    get_base_key,
+    load_card_name_index,
+    normalize_card_name,
+)
+
+CARD_DATA_PATH = "data/carddata/carddata.txt"
+
+
+class CardCatalog:
+    """
+    The card database with a small integer id for every card name.
+
+    Ids are the position of the card's row in the card data, so they are the
+    same in every process that loads the same file. When a name appears on
+    several rows the last one wins, as it does in Decklist.
+    """
+
+    def __init__(self, card_data_path: str = CARD_DATA_PATH):
+        self.card_data_path = card_data_path
+        self.names = []
+        self.rows = []
+        self._ids = {}
+        self._base_ids = None
+        for card_name, row in iter_card_rows(card_data_path):
+            self._ids[card_name] = len(self.rows)
+            self.names.append(card_name)
+            self.rows.append(row)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_card_id(self, card_name: str) -> int:
+        """
+        Return the id of 'card_name', resolving misspelled and variant names.
+        Returns None if the name does not unambiguously match a card.
+        """
+        card_id = self._ids.get(card_name)
+        if card_id is None:
+            resolved_name = load_card_name_index(self.card_data_path).resolve(card_name)
+            card_id = self._ids.get(resolved_name)
+        return card_id
+
+    def get_base_id(self, card_id: int) -> int:
+        """
+        Return the id shared by every printing of a card: the first card whose
+        name is the same once case, punctuation and the set suffix are ignored.
+        """
+        if self._base_ids is None:
+            first_ids = {}
+            self._base_ids = [
+                first_ids.setdefault(get_base_key(normalize_card_name(name)), i)
+                for i, name in enumerate(self.names)
+            ]
+        return self._base_ids[card_id]
+
+    def get_name(self, card_id: int) -> str:
+        return self.names[card_id]
+
+    def get_row(self, card_id: int) -> dict:
+        return self.rows[card_id]
+
+
+@lru_cache(maxsize=None)
+def load_card_catalog(card_data_path: str = CARD_DATA_PATH) -> CardCatalog:
+    """Load the catalog once per process."""
+    return CardCatalog(card_data_path)
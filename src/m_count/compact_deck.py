@@ -0,0 +1,127 @@
+from array import array
+from dataclasses import dataclass, field
+
+from src.m_count.decklist import clean_card_name
+
+# Zone flag stored in the lowest bit of each card key
+MAIN_DECK = 0
+RESERVE = 1
+ZONES = (MAIN_DECK, RESERVE)
+
+
+def get_card_key(card_id: int, zone: int) -> int:
+    return card_id << 1 | zone
+
+
+def split_card_key(card_key: int) -> tuple[int, int]:
+    """Return the (card id, zone) of a card key."""
+    return card_key >> 1, card_key & 1
+
+
+@dataclass(eq=False)
+class CompactDeck:
+    """
+    A deck as a sparse vector of card quantities over a shared CardCatalog.
+
+    Each card is stored once per zone as a key, its catalog id shifted left
+    with the zone flag in the lowest bit, and a quantity. Keys are sorted, so
+    two decks with the same cards have identical arrays whatever order the
+    cards were listed in. Equality and hashing compare the cards only and
+    ignore the deck name, so duplicate lists can be found with a set or dict.
+    """
+
+    name: str
+    card_keys: array
+    quantities: array
+    unresolved_cards: tuple = field(default=())
+
+    @classmethod
+    def from_quantities(
+        cls, name: str, card_quantities: dict, unresolved_cards=()
+    ) -> "CompactDeck":
+        """Build the deck from a {card key: quantity} mapping."""
+        card_keys = sorted(card_quantities)
+        return cls(
+            name=name,
+            card_keys=array("I", card_keys),
+            quantities=array("H", (card_quantities[key] for key in card_keys)),
+            unresolved_cards=tuple(unresolved_cards),
+        )
+
+    @classmethod
+    def from_card_lists(
+        cls, name: str, main_deck_list: list, reserve_list: list, catalog
+    ) -> "CompactDeck":
+        """
+        Build the deck from the {'quantity', 'name'} lists of the deck parsers.
+        Repeated names are summed, and names that are not in the catalog are
+        kept in 'unresolved_cards'.
+        """
+        card_quantities = {}
+        unresolved_cards = []
+        for zone, card_list in zip(ZONES, (main_deck_list, reserve_list)):
+            for card in card_list:
+                card_name = clean_card_name(card["name"])
+                card_id = catalog.get_card_id(card_name)
+                if card_id is None:
+                    unresolved_cards.append(card_name)
+                    continue
+                card_key = get_card_key(card_id, zone)
+                card_quantities[card_key] = (
+                    card_quantities.get(card_key, 0) + card["quantity"]
+                )
+        return cls.from_quantities(name, card_quantities, unresolved_cards)
+
+    @classmethod
+    def from_decklist(cls, name: str, decklist, catalog) -> "CompactDeck":
+        """Build the deck from the cards a Decklist has already matched."""
+        card_quantities = {}
+        for zone, mapped_list in zip(
+            ZONES, (decklist.mapped_main_deck_list, decklist.mapped_reserve_list)
+        ):
+            for card_name, card_details in mapped_list.items():
+                card_key = get_card_key(catalog.get_card_id(card_name), zone)
+                card_quantities[card_key] = card_details["quantity"]
+        unresolved_cards = [card_name for card_name, _ in decklist.unresolved_cards]
+        return cls.from_quantities(name, card_quantities, unresolved_cards)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactDeck):
+            return NotImplemented
+        return self.card_keys == other.card_keys and self.quantities == other.quantities
+
+    def __hash__(self) -> int:
+        return hash((self.card_keys.tobytes(), self.quantities.tobytes()))
+
+    def __len__(self) -> int:
+        """Number of distinct cards across both zones."""
+        return len(self.card_keys)
+
+    def iter_cards(self, zone: int = None):
+        """Yield (card id, quantity) for the cards in 'zone', or in both zones."""
+        for card_key, quantity in zip(self.card_keys, self.quantities):
+            card_id, card_zone = split_card_key(card_key)
+            if zone is None or card_zone == zone:
+                yield card_id, quantity
+
+    def get_counts(self, zone: int = MAIN_DECK) -> dict:
+        """Return {card id: quantity} for the cards in 'zone'."""
+        return dict(self.iter_cards(zone))
+
+    @property
+    def deck_size(self) -> int:
+        return sum(quantity for _, quantity in self.iter_cards(MAIN_DECK))
+
+    @property
+    def reserve_size(self) -> int:
+        return sum(quantity for _, quantity in self.iter_cards(RESERVE))
+
+    def to_card_lists(self, catalog) -> tuple[list, list]:
+        """Return the main deck and reserve as {'quantity', 'name'} lists."""
+        card_lists = ([], [])
+        for card_key, quantity in zip(self.card_keys, self.quantities):
+            card_id, zone = split_card_key(card_key)
+            card_lists[zone].append(
+                {"quantity": quantity, "name": catalog.get_name(card_id)}
+            )
+        return card_lists
@@ -4,6 +4,137 @@ import xml.etree.ElementTree as ET
 
 from src.m_count.constants import EMPERORS
 from src.utilities.brigades import normalize_brigade_field
+from src.utilities.card_names import load_card_name_index
+
+
+def normalize_apostrophes(text):
+    """Replaces curly apostrophes with straight ones in the provided text."""
+    return text.replace("\u2019", "'")
+
+
+def clean_card_name(card_name: str) -> str:
+    """Undo the quote doubling of names exported from a spreadsheet."""
+    return card_name.replace('""', '"').strip('"')
+
+
+def get_card_tags(card_name: str) -> dict:
+    """Return the custom tags the simulation looks for on a card."""
+    output = {}
+    if card_name in EMPERORS:
+        output["is_emperor"] = True
+
+    return output
+
+
+def iter_card_rows(card_data_path: str):
+    """Yield (card name, row with lower-cased keys) for each card in the card data."""
+    with open(card_data_path, "r", newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file, delimiter="\t")
+        for row in reader:
+            # Create a new dictionary with all keys converted to lower case
+            row_with_lower_keys = {key.lower(): value for key, value in row.items()}
+            yield normalize_apostrophes(
+                row_with_lower_keys["name"]
+            ), row_with_lower_keys
+
+
+def parse_txt_lines(lines) -> tuple[list, list, bool]:
+    """
+    Parse the lines of a Lackey .txt deck.
+
+    Returns:
+        tuple: The main deck and reserve as lists of {'quantity', 'name'} dicts,
+            and whether the deck has a reserve section
+    """
+    main_deck_list = []
+    reserve_list = []
+    has_reserve = False
+    for line in lines:
+        line = line.strip()
+        if line.startswith("Tokens:"):
+            break
+        if line.startswith("Reserve:"):
+            has_reserve = True
+            continue
+
+        parts = line.split("\t", 1)
+        if len(parts) > 1:
+            card_info = {
+                "quantity": int(parts[0].strip()),
+                "name": normalize_apostrophes(parts[1].strip()),
+            }
+            if has_reserve:
+                reserve_list.append(card_info)
+            else:
+                main_deck_list.append(card_info)
+
+    if len(main_deck_list) == 0:
+        raise AssertionError(
+            "Please load a deck_file that contains at least one card in the main deck."
+        )
+    return main_deck_list, reserve_list, has_reserve
+
+
+def iter_dek_decks(source):
+    """
+    Yield the main deck and reserve of each <deck> in a Lackey .dek file, from a
+    path or a binary file object, as lists of {'quantity', 'name'} dicts.
+
+    The XML is read incrementally and each card is dropped once counted, so
+    large collections or files holding several decks parse in constant memory.
+    Repeated cards are counted into one entry in the order first seen.
+    """
+    zones = {"main": {}, "reserve": {}}
+    zone = None
+    zone_element = None
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if element.tag == "superzone":
+                zone_name = element.get("name")
+                zone_element = element
+                # Skip the Tokens superzone
+                zone = (
+                    None
+                    if zone_name == "Tokens"
+                    else zones["reserve" if zone_name == "Reserve" else "main"]
+                )
+            continue
+
+        if element.tag == "card" and zone_element is not None:
+            card_name = element.findtext("name")
+            if card_name and zone is not None:
+                card_name = normalize_apostrophes(card_name.strip())
+                zone[card_name] = zone.get(card_name, 0) + 1
+            zone_element.remove(element)
+        elif element.tag == "superzone":
+            element.clear()
+            zone = None
+            zone_element = None
+        elif element.tag == "deck":
+            yield tuple(
+                [
+                    {"quantity": quantity, "name": card_name}
+                    for card_name, quantity in zones[zone_key].items()
+                ]
+                for zone_key in ("main", "reserve")
+            )
+            element.clear()
+            zones = {"main": {}, "reserve": {}}
+
+
+def parse_dek_file(source) -> tuple[list, list]:
+    """
+    Parse a Lackey .dek deck from a path or a binary file object.
+
+    Returns:
+        tuple: The main deck and reserve as lists of {'quantity', 'name'} dicts
+    """
+    main_deck_list, reserve_list = next(iter_dek_decks(source), ([], []))
+    if len(main_deck_list) == 0:
+        raise AssertionError(
+            "Please load a deck_file that contains at least one card in the main deck."
+        )
+    return main_deck_list, reserve_list
 
 
 class Decklist:
@@ -14,6 +145,8 @@ class Decklist:
         self.main_deck_list = []
         self.reserve_list = []
         self.has_reserve = False
+        # (name in the deck file, suggested card names) for cards that were skipped
+        self.unresolved_cards = []
         self._load_file()
         self.card_data = self._load_card_data()
         self.mapped_main_deck_list = self._map_card_metadata(self.main_deck_list)
@@ -40,7 +173,7 @@ class Decklist:
     @staticmethod
     def normalize_apostrophes(text):
         """Replaces curly apostrophes with straight ones in the provided text."""
-        return text.replace("\u2019", "'")
+        return normalize_apostrophes(text)
 
     def _save_json(self, filename: str, dictionary_to_save: dict):
         """Debugging tool used to inspect json file.s"""
@@ -56,71 +189,19 @@ class Decklist:
 
     def _load_dek_file(self):
         """Parse the .dek file into internal variables."""
-        tree = ET.parse(self.deck_file_path)
-        root = tree.getroot()
-
-        for superzone in root.findall("superzone"):
-            zone_name = superzone.get("name")
-            if zone_name == "Tokens":
-                continue  # Skip the Tokens superzone
-            for card in superzone.findall("card"):
-                card_name = card.find("name").text
-                card_info = {
-                    "quantity": 1,
-                    "name": self.normalize_apostrophes(card_name.strip()),
-                }
-                if zone_name == "Reserve":
-                    self.reserve_list.append(card_info)
-                    self.has_reserve = True
-                else:
-                    self.main_deck_list.append(card_info)
-
-        if len(self.main_deck_list) == 0:
-            raise AssertionError(
-                "Please load a deck_file that contains at least one card in the main deck."
-            )
+        self.main_deck_list, self.reserve_list = parse_dek_file(self.deck_file_path)
+        self.has_reserve = bool(self.reserve_list)
 
     def _load_txt_file(self):
         """Parse the .txt file into internal variables."""
         with open(self.deck_file_path, "r") as file:
-            for line in file:
-                line = line.strip()
-                if line.startswith("Tokens:"):
-                    break
-                if line.startswith("Reserve:"):
-                    self.has_reserve = True
-                    continue
-
-                parts = line.split("\t", 1)
-                if len(parts) > 1:
-                    card_info = {
-                        "quantity": int(parts[0].strip()),
-                        "name": self.normalize_apostrophes(parts[1].strip()),
-                    }
-                    if self.has_reserve:
-                        self.reserve_list.append(card_info)
-                    else:
-                        self.main_deck_list.append(card_info)
-
-        if len(self.main_deck_list) == 0:
-            raise AssertionError(
-                "Please load a deck_file that contains at least one card in the main deck."
+            self.main_deck_list, self.reserve_list, self.has_reserve = parse_txt_lines(
+                file
             )
 
     def _load_card_data(self) -> dict:
         """Take the data found in 'card_data_path' and load it into a csv."""
-        card_database = {}
-        with open(self.card_data_path, "r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file, delimiter="\t")
-            for row in reader:
-                # Create a new dictionary with all keys converted to lower case
-                row_with_lower_keys = {key.lower(): value for key, value in row.items()}
-                normalized_name = self.normalize_apostrophes(
-                    row_with_lower_keys["name"]
-                )
-                card_database[normalized_name] = row_with_lower_keys
-
-        return card_database
+        return dict(iter_card_rows(self.card_data_path))
 
     def _map_card_metadata(self, card_list: list[dict]) -> dict:
         """
@@ -134,8 +215,10 @@ class Decklist:
         """
         result = {}
         for card in card_list:
-            card_name = card["name"].replace('""', '"').strip('"')
+            card_name = clean_card_name(card["name"])
             quantity = card["quantity"]
+            if card_name not in self.card_data:
+                card_name = self._resolve_card_name(card_name)
             if card_name in self.card_data:
                 if card_name in result:
                     result[card_name]["quantity"] += quantity
@@ -147,25 +230,40 @@ class Decklist:
                     card_details["brigade"] = normalize_brigade_field(
                         brigade=card_details.get("brigade", ""),
                         alignment=card_details.get("alignment", ""),
-                        card_name=card["name"],
+                        card_name=card_name,
                     )
                     # add custom tags
                     card_details["tags"] = self._add_tags(card_name, card_details)
                     result[card_name] = card_details
-            else:
-                print(
-                    f"Could not find {card['name']}. Skipping loading it. Notify BaboonyTim."
-                )
 
         return result
 
+    def _resolve_card_name(self, card_name: str) -> str:
+        """
+        Match a name that is not in the card database to a card whose name only
+        differs in quoting, punctuation, set suffix or a typo. Unresolved names
+        are recorded in 'unresolved_cards' along with the closest card names.
+        """
+        card_name_index = load_card_name_index(self.card_data_path)
+        resolved_name = card_name_index.resolve(card_name)
+        if resolved_name is not None:
+            print(f"Resolved {card_name} to {resolved_name}.")
+            return resolved_name
+
+        suggestions = [name for name, _ in card_name_index.suggest(card_name)]
+        self.unresolved_cards.append((card_name, suggestions))
+        did_you_mean = (
+            f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        )
+        print(
+            f"Could not find {card_name}. Skipping loading it.{did_you_mean} "
+            "Notify BaboonyTim."
+        )
+        return card_name
+
     def _add_tags(self, card_name: str, card_details: dict) -> dict:
         """Add some tags to the card."""
-        output = {}
-        if card_name in EMPERORS:
-            output["is_emperor"] = True
-
-        return output
+        return get_card_tags(card_name)
 
     def to_json(self) -> dict:
         return {
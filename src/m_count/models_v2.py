@@ -27,10 +27,14 @@ class Card:
 
 
 class Zone:
-    def __init__(self, cards: Optional[List[Card]] = None):
+    def __init__(
+        self, cards: Optional[List[Card]] = None, rng: Optional[random.Random] = None
+    ):
         # Store the original state
         self.original_cards = cards.copy() if cards else None
         self.cards = cards or []
+        # The module-level random unless a seeded random.Random is given
+        self.rng = rng or random
 
     def reset(self):
         """Reset the zone to its original state, if an original state was provided."""
@@ -142,7 +146,7 @@ class Zone:
 
     def shuffle(self):
         """Randomize the order of cards."""
-        self.cards = list(random.sample(self.cards, len(self.cards)))
+        self.cards = list(self.rng.sample(self.cards, len(self.cards)))
 
 
 class Hand(Zone):
@@ -169,18 +173,22 @@ class Discard(Zone):
 class Deck(Zone):
     """Zone used to represent the deck."""
 
-    def __init__(self, cards: Optional[List[Card]] = None):
-        super().__init__(cards if cards else [])
+    def __init__(
+        self, cards: Optional[List[Card]] = None, rng: Optional[random.Random] = None
+    ):
+        super().__init__(cards if cards else [], rng)
 
     @staticmethod
-    def load_decklist(decklist: Decklist) -> "Deck":
+    def load_decklist(
+        decklist: Decklist, rng: Optional[random.Random] = None
+    ) -> "Deck":
         cards = []
         for card_metadata in decklist.mapped_main_deck_list.values():
             if "alignment" not in card_metadata:
                 card_metadata["alignment"] = ""
             for i in range(int(card_metadata["quantity"])):
                 cards.append(Card(**card_metadata))
-        return Deck(cards)
+        return Deck(cards, rng)
 
     def reset(self, shuffle=True):
         """Extend the base reset to optionally shuffle the deck."""
@@ -201,7 +209,7 @@ class Deck(Zone):
     def bottom_cards(self, cards: List[Card], random_order=False) -> None:
         """Return some card(s) to the bottom of the deck."""
         if random_order:
-            cards = list(random.sample(cards, len(cards)))
+            cards = list(self.rng.sample(cards, len(cards)))
         if isinstance(cards, list):
             self.cards.extend(cards)
         else:
@@ -240,7 +248,7 @@ class Deck(Zone):
                 )
                 top_six_cards.remove(card_gotten_with_virgin_birth)
             else:
-                lost_soul_card = random.choice(top_six_cards)
+                lost_soul_card = self.rng.choice(top_six_cards)
                 card_gotten_with_virgin_birth = lost_soul_card
                 top_six_cards.remove(lost_soul_card)
         else:
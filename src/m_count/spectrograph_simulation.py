@@ -25,12 +25,18 @@ class SpectrographSimulation:
         cycler_logic: str,
         crowds_ineffectiveness_weight: float,
         matthew_fizzle_rate: float,
+        log_file: str = MATTHEW_CSV_FILE,
+        rng: random.Random = None,
     ):
         self.deck_file_path = deck_file_path
         self.n_simulations = n_simulations
         self.cycler_logic = cycler_logic
         self.crowds_ineffectiveness_weight = crowds_ineffectiveness_weight
         self.matthew_fizzle_rate = matthew_fizzle_rate
+        # Set to None to keep the game log in memory, e.g. in worker processes
+        self.log_file = log_file
+        # Shared with the deck, so a seeded random.Random repeats the whole run
+        self.rng = rng or random
         self.m_count = 0
         self.whiff_percentage = 0
 
@@ -51,10 +57,13 @@ class SpectrographSimulation:
             writer = csv.DictWriter(f, fieldnames=headers)
             writer.writeheader()
 
-    def initialize_decklist(self):
-        """Load the deck in."""
-        self.decklist = self._load_raw_deck(self.deck_file_path)
-        self.deck = Deck.load_decklist(self.decklist)
+    def initialize_decklist(self, decklist: Decklist = None):
+        """
+        Load the deck in. A 'decklist' built in memory, anything with a
+        'mapped_main_deck_list' and 'deck_size', is used instead of the deck file.
+        """
+        self.decklist = decklist or self._load_raw_deck(self.deck_file_path)
+        self.deck = Deck.load_decklist(self.decklist, self.rng)
         self.territory = Territory(cards=[])
         self.discard = Discard(cards=[])
         self.hand = Hand(cards=[])
@@ -177,7 +186,7 @@ class SpectrographSimulation:
 
     def _calculate_matthew_count(self, sim_number) -> dict:
         """Actions to take when when Matthew inevitably attacks."""
-        if random.random() < self.matthew_fizzle_rate:
+        if self.rng.random() < self.matthew_fizzle_rate:
             # matthew deck fizzled
             n_brigades_in_hand = 0
         # crowds lost soul logic
@@ -189,7 +198,7 @@ class SpectrographSimulation:
             )
             > 0
             # factor in the times matthew decks will have an answer
-            and random.random() > self.crowds_ineffectiveness_weight
+            and self.rng.random() > self.crowds_ineffectiveness_weight
         ):
             # we have hand protection. 0 brigades drawn with Matthew
             n_brigades_in_hand = 0
@@ -329,8 +338,13 @@ class SpectrographSimulation:
             # Collect logs
             all_logs.append(turn_log)
 
+        if all_logs:
+            n_brigades_drawn = sum(log["n_cards_matthew_draw"] for log in all_logs)
+            self.m_count = n_brigades_drawn / len(all_logs)
+
         # # Bulk write logs at the end of all simulations
-        self.append_log_to_file(all_logs, MATTHEW_CSV_FILE)
+        if self.log_file:
+            self.append_log_to_file(all_logs, self.log_file)
 
     def print_results(self) -> tuple[float, float]:
         """Print the summary statistics of the simulation."""
@@ -340,7 +354,11 @@ class SpectrographSimulation:
         four_drachma_count = 0
         whiff_count = 0
 
-        with open(MATTHEW_CSV_FILE, "r") as csv_file:
+        if self.log_file is None:
+            # Nothing was logged, and run() already set m_count from the games
+            return
+
+        with open(self.log_file, "r") as csv_file:
             csv_reader = csv.DictReader(csv_file)
             for row in csv_reader:
                 try:
@@ -1,43 +1,57 @@
+from functools import lru_cache
+
 from src.utilities.vars import EVIL_BRIGADES, GOOD_BRIGADES
 
+COMPLEX_BRIGADES = {
+    "Delivered": ["Green", "Teal", "Evil Gold", "Pale Green"],
+    "Eternal Judgment": ["Green", "White", "Brown", "Crimson"],
+    "Scapegoat (PoC)": ["Teal", "Green", "Crimson"],
+    "Zion": ["Purple"],
+    "Ashkelon": ["Good Gold"],
+    "Raamses": ["White"],
+    "Babel (FoM)": ["Blue"],
+    "Sodom & Gomorrah": ["Silver"],
+    "City of Enoch": ["Blue"],
+    "Hebron": ["Red"],
+    "Damascus (LoC)": ["Red"],
+    "Damascus (Promo)": ["Red"],
+    "Bethlehem (Promo)": ["White"],
+    "Samaria": ["Green"],
+    "Nineveh": ["Green"],
+    "City of Refuge": ["Teal"],
+    "Jerusalem (GoC)": ["Purple", "Good Gold", "White"],
+    "Sychar (GoC)": ["Good Gold", "Purple"],
+    "Fire Foxes": ["Good Gold", "Crimson", "Black"],
+    "Bethlehem (LoC)": ["Good Gold", "White"],
+    "New Jerusalem (Bride of Christ) (RoJ AB)": GOOD_BRIGADES,
+    "Doubt (LoC Plus)": [],
+    "Doubt (LoC)": [],
+    "Angel of God [2023 - National]": [],
+    "City of Refuge (PoC)": ["Teal"],
+    "Fullness of Time": [],
+    "Melchizedek (CoW AB)": ["Purple", "Teal"],
+    "Philistine Outpost": [],
+    "Philosophy": GOOD_BRIGADES + EVIL_BRIGADES,
+    "Unified Language": GOOD_BRIGADES + EVIL_BRIGADES,
+    "Saul/Paul": ["Gray"] + GOOD_BRIGADES,
+    "Coat of Many Colors (FoM)": ["Brown"] + GOOD_BRIGADES,
+}
+ALLOWED_BRIGADES = frozenset(GOOD_BRIGADES + EVIL_BRIGADES)
+MULTI_REPLACEMENTS = {
+    "Good": "Good Multi",
+    "Evil": "Evil Multi",
+    "Neutral": "Good Multi",
+}
+# Neutral cards whose gold brigade is good even when it is not listed first
+NEUTRAL_GOOD_GOLD_CARDS = (
+    "First Bowl of Wrath (RoJ)",
+    "Banks of the Nile/Pharaoh's Court",
+)
+
 
 def handle_complex_brigades(card_name: str, brigade: str) -> list:
-    complex_brigades = {
-        "Delivered": ["Green", "Teal", "Evil Gold", "Pale Green"],
-        "Eternal Judgment": ["Green", "White", "Brown", "Crimson"],
-        "Scapegoat (PoC)": ["Teal", "Green", "Crimson"],
-        "Zion": ["Purple"],
-        "Ashkelon": ["Good Gold"],
-        "Raamses": ["White"],
-        "Babel (FoM)": ["Blue"],
-        "Sodom & Gomorrah": ["Silver"],
-        "City of Enoch": ["Blue"],
-        "Hebron": ["Red"],
-        "Damascus (LoC)": ["Red"],
-        "Damascus (Promo)": ["Red"],
-        "Bethlehem (Promo)": ["White"],
-        "Samaria": ["Green"],
-        "Nineveh": ["Green"],
-        "City of Refuge": ["Teal"],
-        "Jerusalem (GoC)": ["Purple", "Good Gold", "White"],
-        "Sychar (GoC)": ["Good Gold", "Purple"],
-        "Fire Foxes": ["Good Gold", "Crimson", "Black"],
-        "Bethlehem (LoC)": ["Good Gold", "White"],
-        "New Jerusalem (Bride of Christ) (RoJ AB)": GOOD_BRIGADES,
-        "Doubt (LoC Plus)": [],
-        "Doubt (LoC)": [],
-        "Angel of God [2023 - National]": [],
-        "City of Refuge (PoC)": ["Teal"],
-        "Fullness of Time": [],
-        "Melchizedek (CoW AB)": ["Purple", "Teal"],
-        "Philistine Outpost": [],
-        "Philosophy": GOOD_BRIGADES + EVIL_BRIGADES,
-        "Unified Language": GOOD_BRIGADES + EVIL_BRIGADES,
-        "Saul/Paul": ["Gray"] + GOOD_BRIGADES,
-        "Coat of Many Colors (FoM)": ["Brown"] + GOOD_BRIGADES,
-    }
-    if card_name in complex_brigades:
-        return complex_brigades[card_name]
+    if card_name in COMPLEX_BRIGADES:
+        return COMPLEX_BRIGADES[card_name]
     else:
         return handle_simple_brigades(brigade)
 
@@ -74,9 +88,7 @@ def handle_gold_brigade(card_name, alignment, brigades_list):
         "Evil": "Evil Gold",
         "Neutral": (
             "Good Gold"
-            if brigades_list[0] == "Gold"
-            or card_name
-            in ["First Bowl of Wrath (RoJ)", "Banks of the Nile/Pharaoh's Court"]
+            if brigades_list[0] == "Gold" or card_name in NEUTRAL_GOOD_GOLD_CARDS
             else "Evil Gold"
         ),
         None: "Good Gold",
@@ -84,30 +96,34 @@ def handle_gold_brigade(card_name, alignment, brigades_list):
     return replace_brigades(brigades_list, "Gold", gold_replacement.get(alignment))
 
 
-def normalize_brigade_field(brigade: str, alignment: str, card_name: str) -> list:
-    if not brigade:
-        return []
-
+@lru_cache(maxsize=8192)
+def _normalize_brigade_field(brigade: str, alignment: str, card_name: str) -> tuple:
     brigades_list = handle_complex_brigades(card_name, brigade)
     if "Multi" in brigades_list:
-        multi_replacements = {
-            "Good": "Good Multi",
-            "Evil": "Evil Multi",
-            "Neutral": "Good Multi",
-        }
         brigades_list = replace_brigades(
             brigades_list,
             "Multi",
-            multi_replacements.get(card_name, multi_replacements.get(alignment)),
+            MULTI_REPLACEMENTS.get(card_name, MULTI_REPLACEMENTS.get(alignment)),
         )
     if "Gold" in brigades_list:
         brigades_list = handle_gold_brigade(card_name, alignment, brigades_list)
 
     brigades_list = replace_multi_brigades(brigades_list)
-    allowed_brigades = set(GOOD_BRIGADES + EVIL_BRIGADES)
     for brigade in brigades_list:
         assert (
-            brigade in allowed_brigades
+            brigade in ALLOWED_BRIGADES
         ), f"Card {card_name} has an invalid brigade: {brigade}."
 
-    return sorted(brigades_list)
+    return tuple(sorted(brigades_list))
+
+
+def normalize_brigade_field(brigade: str, alignment: str, card_name: str) -> list:
+    """
+    Return the sorted list of brigades a card belongs to.
+
+    Results are memoized per (brigade, alignment, card name), so each card in
+    the card data is normalized once per process.
+    """
+    if not brigade:
+        return []
+    return list(_normalize_brigade_field(brigade, alignment, card_name))
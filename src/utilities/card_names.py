@@ -0,0 +1,183 @@
+import csv
+import re
+from collections import Counter
+from functools import lru_cache
+
+NGRAM_SIZE = 3
+# Candidates from the n-gram index that are scored by edit distance
+MAX_CANDIDATES = 20
+# A name with no exact match resolves on its own only to a card one typo away,
+# and only if the names are long enough for one typo to be a small change
+MAX_AUTO_RESOLVE_EDITS = 1
+AUTO_RESOLVE_SIMILARITY = 0.85
+MIN_SUGGESTION_SIMILARITY = 0.5
+# Words that tell numbered cards apart, such as the bowls of wrath and trumpets
+NUMBER_WORDS = frozenset(
+    (
+        "first second third fourth fifth sixth seventh eighth ninth tenth "
+        "eleventh twelfth one two three four five six seven eight nine ten "
+        "eleven twelve"
+    ).split()
+)
+
+QUOTE_TRANSLATION = str.maketrans(
+    {"\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"', "[": "(", "]": ")"}
+)
+NON_WORD_PATTERN = re.compile(r"[^0-9a-z()]+")
+DIGIT_PATTERN = re.compile(r"[0-9]")
+SET_SUFFIX_PATTERN = re.compile(r"\s*\([^()]*\)$")
+
+
+def normalize_card_name(card_name: str) -> str:
+    """
+    Reduce a card name to a lookup key that ignores case, quoting, apostrophes,
+    punctuation, spacing and whether the set suffix uses brackets or parentheses.
+    """
+    card_name = card_name.translate(QUOTE_TRANSLATION).lower().replace("'", "")
+    return NON_WORD_PATTERN.sub(" ", card_name).strip()
+
+
+def get_base_key(key: str) -> str:
+    """Drop the trailing set suffix, such as '(roots)', from a normalized name."""
+    return SET_SUFFIX_PATTERN.sub("", key)
+
+
+def get_ngrams(key: str) -> set:
+    padded = f" {key} "
+    return {padded[i : i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance using the bit-parallel algorithm of Myers and Hyyro:
+    each column of the distance matrix is a pair of bit vectors, so comparing
+    two names costs a few integer operations per character of 'b'.
+    """
+    if not a:
+        return len(b)
+    char_masks = {}
+    for i, char in enumerate(a):
+        char_masks[char] = char_masks.get(char, 0) | (1 << i)
+    all_bits = (1 << len(a)) - 1
+    last_bit = 1 << (len(a) - 1)
+
+    positive, negative, distance = all_bits, 0, len(a)
+    for char in b:
+        matches = char_masks.get(char, 0)
+        vertical = matches | negative
+        horizontal = (
+            (((matches & positive) + positive) ^ positive) | matches
+        ) & all_bits
+        horizontal_positive = (negative | ~(horizontal | positive)) & all_bits
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last_bit:
+            distance += 1
+        elif horizontal_negative & last_bit:
+            distance -= 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & all_bits
+        horizontal_negative = (horizontal_negative << 1) & all_bits
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & all_bits
+        negative = horizontal_positive & vertical
+    return distance
+
+
+def changes_number(key: str, other_key: str) -> bool:
+    """Check whether two normalized names differ in a word with a number in it."""
+    words, other_words = Counter(key.split()), Counter(other_key.split())
+    changed_words = (words - other_words) + (other_words - words)
+    return any(
+        DIGIT_PATTERN.search(word) or word in NUMBER_WORDS for word in changed_words
+    )
+
+
+class CardNameIndex:
+    """
+    Resolve card names that do not exactly match the card database.
+
+    Names are first looked up by their normalized key, then by their key without
+    the set suffix. Otherwise candidates sharing the most character trigrams
+    with the name are ranked by edit distance.
+    """
+
+    def __init__(self, card_names):
+        self.card_names = list(card_names)
+        self._keys = [normalize_card_name(card_name) for card_name in self.card_names]
+        self._by_key = {}
+        self._by_base_key = {}
+        self._by_ngram = {}
+        self._resolved = {}
+        for card_id, key in enumerate(self._keys):
+            self._by_key.setdefault(key, []).append(card_id)
+            self._by_base_key.setdefault(get_base_key(key), []).append(card_id)
+            for ngram in get_ngrams(key):
+                self._by_ngram.setdefault(ngram, []).append(card_id)
+
+    def _get_candidates(self, key: str) -> list[tuple[int, int, float]]:
+        """
+        Return (card id, edit distance, similarity) for the cards sharing the
+        most character trigrams with 'key'.
+        """
+        shared = Counter()
+        for ngram in get_ngrams(key):
+            shared.update(self._by_ngram.get(ngram, ()))
+
+        candidates = []
+        for card_id, _ in shared.most_common(MAX_CANDIDATES):
+            candidate_key = self._keys[card_id]
+            distance = edit_distance(key, candidate_key)
+            similarity = 1 - distance / max(len(key), len(candidate_key))
+            candidates.append((card_id, distance, similarity))
+        return candidates
+
+    def suggest(self, card_name: str, limit: int = 3) -> list[tuple[str, float]]:
+        """
+        Return up to 'limit' (card name, similarity) pairs, most similar first.
+        Names with the same normalized key, or the same key once the set suffix
+        is dropped, have a similarity of 1.
+        """
+        key = normalize_card_name(card_name)
+        card_ids = self._by_key.get(key) or self._by_base_key.get(key)
+        if card_ids:
+            return [(self.card_names[card_id], 1.0) for card_id in card_ids[:limit]]
+
+        suggestions = [
+            (self.card_names[card_id], similarity)
+            for card_id, _, similarity in self._get_candidates(key)
+            if similarity >= MIN_SUGGESTION_SIMILARITY
+        ]
+        suggestions.sort(key=lambda suggestion: -suggestion[1])
+        return suggestions[:limit]
+
+    def resolve(self, card_name: str) -> str:
+        """
+        Return the card name that 'card_name' unambiguously refers to, or None.
+
+        A name resolves when its normalized key, or its key without the set
+        suffix, matches exactly one card. Otherwise it resolves only to the one
+        card a single typo away that differs in no number, so 'Sixth Bowl of
+        Wrath' never becomes 'Fifth Bowl of Wrath'; closer misses are left to
+        suggest(). Results are remembered, since batch imports see the same
+        names often.
+        """
+        if card_name not in self._resolved:
+            key = normalize_card_name(card_name)
+            card_ids = self._by_key.get(key) or self._by_base_key.get(key)
+            if not card_ids:
+                card_ids = [
+                    card_id
+                    for card_id, distance, similarity in self._get_candidates(key)
+                    if distance <= MAX_AUTO_RESOLVE_EDITS
+                    and similarity >= AUTO_RESOLVE_SIMILARITY
+                    and not changes_number(key, self._keys[card_id])
+                ]
+            resolved = self.card_names[card_ids[0]] if len(card_ids) == 1 else None
+            self._resolved[card_name] = resolved
+        return self._resolved[card_name]
+
+
+@lru_cache(maxsize=None)
+def load_card_name_index(card_data_path: str) -> CardNameIndex:
+    """Build the index over the card data once per process."""
+    with open(card_data_path, "r", newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file, delimiter="\t")
+        return CardNameIndex(row["Name"].replace("\u2019", "'") for row in reader)
@@ -0,0 +1,78 @@
+import bisect
+import os
+
+DECK_EXTENSIONS = (".txt", ".dek")
+
+
+class DeckIndex:
+    """
+    Sorted index of the deck files in a folder, keyed by lower-cased file name.
+
+    The folder is scanned on first use and again only when its modification
+    time changes, which happens whenever a deck is added, removed or renamed.
+    Prefix lookups are a binary search over the sorted names.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._mtime = None
+        self._names = []
+        self._paths = {}
+
+    def _refresh(self):
+        mtime = os.stat(self.folder).st_mtime_ns
+        if mtime == self._mtime:
+            return
+        paths = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(DECK_EXTENSIONS):
+                    paths[entry.name.lower()] = entry.path
+        self._names = sorted(paths)
+        self._paths = paths
+        self._mtime = mtime
+
+    def find_prefix(self, prefix: str) -> list:
+        """Return the paths of all deck files starting with 'prefix', by name."""
+        self._refresh()
+        prefix = prefix.lower()
+        matches = []
+        for name in self._names[bisect.bisect_left(self._names, prefix) :]:
+            if not name.startswith(prefix):
+                break
+            matches.append(self._paths[name])
+        return matches
+
+    def find(self, deck_name: str) -> str:
+        """
+        Return the path of the deck file named 'deck_name'.
+
+        An exact file name or a name without its extension wins, otherwise the
+        name must be the prefix of exactly one deck file.
+
+        Raises FileNotFoundError if no deck matches and ValueError if the name
+        matches several decks.
+        """
+        matches = self.find_prefix(deck_name)
+        if not matches:
+            raise FileNotFoundError(
+                f"Decklist file starting with '{deck_name}' not found in {self.folder}."
+            )
+
+        lower_deck_name = deck_name.lower()
+        exact = [
+            path
+            for path in matches
+            if os.path.basename(path).lower() == lower_deck_name
+            or os.path.splitext(os.path.basename(path))[0].lower() == lower_deck_name
+        ]
+        if len(exact) == 1:
+            return exact[0]
+        candidates = exact or matches
+        if len(candidates) > 1:
+            raise ValueError(
+                f"Decklist name '{deck_name}' matches {len(candidates)} files in "
+                f"{self.folder}: "
+                + ", ".join(os.path.basename(path) for path in candidates)
+            )
+        return candidates[0]
@@ -0,0 +1,76 @@
+import math
+import os
+
+import PIL.Image as Image
+
+DZI_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" '
+    'TileSize="{tile_size}" Overlap="{overlap}" Format="{tile_format}">'
+    '<Size Width="{width}" Height="{height}"/></Image>\n'
+)
+
+
+def get_levels(image: Image.Image):
+    """Yield (level, image) from the full-size image down to a single pixel."""
+    max_level = math.ceil(math.log2(max(image.size)))
+    level_image = image
+    for level in range(max_level, -1, -1):
+        scale = 2 ** (max_level - level)
+        size = (
+            max(math.ceil(image.width / scale), 1),
+            max(math.ceil(image.height / scale), 1),
+        )
+        if level_image.size != size:
+            # Halve the previous level rather than resampling the full image
+            level_image = level_image.resize(size, Image.LANCZOS)
+        yield level, level_image
+
+
+def save_deepzoom(
+    image: Image.Image,
+    output_base: str,
+    tile_size: int = 254,
+    overlap: int = 1,
+    tile_format: str = "webp",
+    quality: int = 80,
+) -> str:
+    """
+    Save an image as a DeepZoom pyramid so viewers only load visible tiles.
+
+    Writes '<output_base>.dzi' and the tiles under '<output_base>_files/<level>/',
+    named '<column>_<row>.<tile_format>'.
+
+    Returns:
+        str: The path of the .dzi descriptor
+    """
+    tiles_folder = f"{output_base}_files"
+    for level, level_image in get_levels(image):
+        level_folder = os.path.join(tiles_folder, str(level))
+        os.makedirs(level_folder, exist_ok=True)
+        columns = math.ceil(level_image.width / tile_size)
+        rows = math.ceil(level_image.height / tile_size)
+        for column in range(columns):
+            for row in range(rows):
+                left = max(column * tile_size - overlap, 0)
+                top = max(row * tile_size - overlap, 0)
+                right = min((column + 1) * tile_size + overlap, level_image.width)
+                bottom = min((row + 1) * tile_size + overlap, level_image.height)
+                tile = level_image.crop((left, top, right, bottom))
+                tile.save(
+                    os.path.join(level_folder, f"{column}_{row}.{tile_format}"),
+                    quality=quality,
+                )
+
+    dzi_path = f"{output_base}.dzi"
+    with open(dzi_path, "w") as dzi_file:
+        dzi_file.write(
+            DZI_TEMPLATE.format(
+                tile_size=tile_size,
+                overlap=overlap,
+                tile_format=tile_format,
+                width=image.width,
+                height=image.height,
+            )
+        )
+    return dzi_path
@@ -0,0 +1,191 @@
+import io
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import PIL.Image as Image
+
+
+@dataclass
+class OptimizationResult:
+    path: str
+    original_bytes: int
+    optimized_bytes: int
+    seconds: float
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+
+class ImageOptimizer(ABC):
+    """Base class for post-processing stages that shrink an image file in place."""
+
+    name = "none"
+
+    @abstractmethod
+    def optimize(self, path: str) -> None:
+        pass
+
+    @staticmethod
+    def _keep_if_smaller(path: str, data: bytes) -> None:
+        """Overwrite the file only when the new encoding is actually smaller."""
+        if len(data) < os.path.getsize(path):
+            with open(path, "wb") as file:
+                file.write(data)
+
+
+class TargetSizeOptimizer(ImageOptimizer):
+    """
+    Binary search the encoder setting that gets closest to 'target_bytes'
+    without going over: WebP quality for .webp files and palette size for .png.
+    """
+
+    name = "target-size"
+
+    def __init__(self, target_bytes: int):
+        self.target_bytes = target_bytes
+
+    @staticmethod
+    def _encode(image: Image.Image, extension: str, setting: int) -> bytes:
+        buffer = io.BytesIO()
+        if extension == ".webp":
+            image.save(buffer, format="WEBP", quality=setting, method=6)
+        else:
+            image.quantize(colors=setting).save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    def optimize(self, path: str) -> None:
+        extension = os.path.splitext(path)[1].lower()
+        low, high = (1, 95) if extension == ".webp" else (2, 256)
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+
+        best = self._encode(image, extension, low)
+        while low <= high:
+            setting = (low + high) // 2
+            data = self._encode(image, extension, setting)
+            if len(data) <= self.target_bytes:
+                best = data
+                low = setting + 1
+            else:
+                high = setting - 1
+        self._keep_if_smaller(path, best)
+
+
+def is_lossy_webp(path: str) -> bool:
+    """Check the RIFF chunks of a WebP file for a lossy 'VP8 ' bitstream."""
+    with open(path, "rb") as file:
+        header = file.read(12)
+        if header[:4] != b"RIFF" or header[8:12] != b"WEBP":
+            return False
+        while chunk := file.read(8):
+            if len(chunk) < 8:
+                return False
+            chunk_id = chunk[:4]
+            if chunk_id in (b"VP8 ", b"VP8L"):
+                return chunk_id == b"VP8 "
+            chunk_size = int.from_bytes(chunk[4:], "little")
+            # Chunks are padded to an even size
+            file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    return False
+
+
+class LosslessOptimizer(ImageOptimizer):
+    """
+    Re-encode without further quality loss: lossless WebP or optimized PNG.
+
+    Lossy WebP files are skipped. Their detail is already gone, and a lossless
+    re-encode of the decoded pixels is almost always larger than the original.
+    """
+
+    name = "lossless"
+
+    def optimize(self, path: str) -> None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".webp" and is_lossy_webp(path):
+            return
+        buffer = io.BytesIO()
+        with Image.open(path) as image:
+            if extension == ".webp":
+                image.save(buffer, format="WEBP", lossless=True, quality=100, method=6)
+            else:
+                image.save(buffer, format="PNG", optimize=True)
+        self._keep_if_smaller(path, buffer.getvalue())
+
+
+class TinifyOptimizer(ImageOptimizer):
+    """
+    Compress through the remote TinyPNG service. The 'client' defaults to the
+    optional tinify package and can be replaced with a stand-in for offline use.
+    """
+
+    name = "tinify"
+
+    def __init__(self, api_key: str = None, client=None):
+        if client is None:
+            try:
+                import tinify as client
+            except ImportError:
+                raise ImportError(
+                    "The tinify optimizer needs the tinify package: pip install tinify"
+                )
+        self.client = client
+        self.client.key = api_key or os.getenv("TINIFY_API_KEY")
+
+    def optimize(self, path: str) -> None:
+        self.client.from_file(path).to_file(path)
+
+
+def get_optimizer(name: str, target_kb: int = 500) -> ImageOptimizer:
+    """Build the optimizer selected on the command line."""
+    if name == TargetSizeOptimizer.name:
+        return TargetSizeOptimizer(target_bytes=target_kb * 1024)
+    if name == LosslessOptimizer.name:
+        return LosslessOptimizer()
+    if name == TinifyOptimizer.name:
+        return TinifyOptimizer()
+    raise ValueError(f"Unknown image optimizer: {name}")
+
+
+def optimize_image(path: str, optimizer: ImageOptimizer) -> OptimizationResult:
+    original_bytes = os.path.getsize(path)
+    start = time.perf_counter()
+    optimizer.optimize(path)
+    return OptimizationResult(
+        path=path,
+        original_bytes=original_bytes,
+        optimized_bytes=os.path.getsize(path),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def optimize_images(
+    paths: list, optimizer: ImageOptimizer, workers: int = 1
+) -> list[OptimizationResult]:
+    """Run the optimizer over every image and report bytes saved and time spent.
+
+    Pillow releases the GIL while encoding, so a thread pool is enough to use
+    several cores and keeps remote clients usable without pickling them.
+    """
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        results = list(
+            executor.map(lambda path: optimize_image(path, optimizer), paths)
+        )
+
+    for result in results:
+        print(
+            f"Optimized {result.path}: {result.original_bytes / 1024:.0f}KB -> "
+            f"{result.optimized_bytes / 1024:.0f}KB "
+            f"(saved {result.bytes_saved / 1024:.0f}KB) in {result.seconds:.2f}s"
+        )
+    if results:
+        total_saved = sum(result.bytes_saved for result in results)
+        total_seconds = sum(result.seconds for result in results)
+        print(
+            f"Optimized {len(results)} image(s) with {optimizer.name}: "
+            f"saved {total_saved / 1024:.0f}KB in {total_seconds:.2f}s"
+        )
+    return results
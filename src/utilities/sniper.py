@@ -1,16 +1,31 @@
-@ -0,0 +1,416 @@
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from io import BytesIO
 
 import dotenv
 import PIL.Image as Image
 import PIL.ImageDraw as ImageDraw
-from PyPDF2 import PdfReader, PdfWriter
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
 from src.m_count.decklist import Decklist
-from src.utilities.text_to_pdf import generate_decklist
+from src.utilities.deck_index import DeckIndex
+from src.utilities.deepzoom import save_deepzoom
+from src.utilities.image_optimizer import (
+    ImageOptimizer,
+    get_optimizer,
+    optimize_images,
+)
+from src.utilities.text_to_pdf import (
+    RESERVE_TEMPLATE_PATHS,
+    generate_decklist,
+    generate_reserve_list,
+    render_check_sheet_overlay,
+    render_reserve_list_overlay,
+    write_check_sheets,
+    write_reserve_lists,
+)
+from src.utilities.tile_cache import TileCache
 
 dotenv.load_dotenv()
 DECKLIST_FOLDER = "/Applications/LackeyCCG/plugins/Redemption/decks"
@@ -20,7 +35,11 @@ DECKLIST_IMAGES_FOLDER = (
 OUTPUT_IMAGES_FOLDER = "./deck_images"
 OUTPUT_PDF_FOLDER = "tbd"
 
-TINIFY_API_KEY = os.getenv("TINIFY_API_KEY")
+# Deck file names, rescanned only when the deck folder changes
+DECK_INDEX = DeckIndex(DECKLIST_FOLDER)
+
+# Decoded card images shared by every deck rendered in this process
+TILE_CACHE = TileCache()
 
 # Create output folders if they don't exist
 os.makedirs(OUTPUT_PDF_FOLDER, exist_ok=True)
@@ -31,92 +50,71 @@ def load_deck_data(decklist_file_path: str) -> dict:
 
 
 def find_decklist_file(decklist_name: str) -> str:
-    for file_name in os.listdir(DECKLIST_FOLDER):
-        lower_decklist_name = decklist_name.lower()
-        lower_file_name = file_name.lower()
-        if lower_file_name.startswith(lower_decklist_name) and (
-            file_name.endswith(".txt") or file_name.endswith(".dek")
-        ):
-            print(f"Found decklist file: {file_name}")
-            return os.path.join(DECKLIST_FOLDER, file_name)
-    raise FileNotFoundError(
-        f"Decklist file starting with '{decklist_name}' not found in {DECKLIST_FOLDER}."
-    )
+    decklist_file_path = DECK_INDEX.find(decklist_name)
+    print(f"Found decklist file: {os.path.basename(decklist_file_path)}")
+    return decklist_file_path
 
 
-def generate_image(
-    deck_data: dict, deck_key: str, output_filename: str, cards_per_row: int = 10
-):
-    """Generate an image for the specified deck (either 'main_deck' or 'reserve')."""
-    if cards_per_row == 0:
-        cards_per_row = 10
-    # Get the deck data
-    deck = deck_data.get(deck_key, {})
-    if not deck:
-        print(f"No data found for '{deck_key}' deck.")
-        return
+BACKGROUND_COLOR = (30, 32, 43)  # RGB for #1e202b
+SEPARATOR_COLOR = (20, 22, 33)
+SEPARATOR_HEIGHT = 50
+SEPARATOR_PADDING = 50
+
+
+def get_card_image_path(card_data: dict) -> str:
+    image_file = card_data["imagefile"]
+    # Ensure the image file has the correct extension
+    if not image_file.lower().endswith(".jpg"):
+        image_file += ".jpg"
+    return os.path.join(DECKLIST_IMAGES_FOLDER, image_file)
 
-    # Expand deck items by quantity
+
+def expand_deck_items(deck: dict) -> list:
+    """Expand deck items by quantity and sort them by 'type' alphabetically."""
     expanded_deck_items = []
     for card_key, card_data in deck.items():
         for _ in range(card_data.get("quantity", 1)):
             expanded_deck_items.append((card_key, card_data))
+    return sorted(expanded_deck_items, key=lambda item: item[1]["type"])
 
-    # Sort the deck by 'type' alphabetically
-    sorted_deck_items = sorted(expanded_deck_items, key=lambda item: item[1]["type"])
-
-    # Load the first card image to determine the size for consistent dimensions
-    sample_image_path = os.path.join(
-        DECKLIST_IMAGES_FOLDER,
-        sorted_deck_items[0][1][
-            "imagefile"
-        ],  # Access the first card in the sorted deck
-    )
-    # Ensure the image has the correct extension
-    if not sample_image_path.lower().endswith(".jpg"):
-        sample_image_path += ".jpg"
-
-    sample_image = Image.open(sample_image_path)
-    card_width, card_height = sample_image.size
 
-    # Set overlap amount to 10% of card height
+def get_grid_height(num_cards: int, cards_per_row: int, card_height: int) -> int:
+    """Height of a grid of cards where each row overlaps the one above by 10%."""
+    if num_cards == 0:
+        return 0
     card_overlap = int(card_height * 0.10)
+    rows = (num_cards + cards_per_row - 1) // cards_per_row
+    return (card_height * rows) - (card_overlap * (rows - 1))
 
-    # Calculate output image dimensions based on the number of cards, considering the overlap
-    num_cards = len(expanded_deck_items)
-    rows = (
-        num_cards + cards_per_row - 1
-    ) // cards_per_row  # Calculate required number of rows
-    output_width = card_width * cards_per_row
-    output_height = (card_height * rows) - (card_overlap * (rows - 1))
-
-    # Create a blank canvas of the correct size with the new background color
-    background_color = (30, 32, 43)  # RGB for #1e202b
-    output_image = Image.new("RGB", (output_width, output_height), background_color)
-
-    # Track positioning for placing card images on the canvas
-    x_offset, y_offset = 0, 0
 
-    for card_key, card_data in sorted_deck_items:
-        image_file = card_data["imagefile"]
-        # Ensure the image file has the correct extension
-        if not image_file.lower().endswith(".jpg"):
-            image_file += ".jpg"
-        card_image_path = os.path.join(DECKLIST_IMAGES_FOLDER, image_file)
+def paste_card_grid(
+    output_image: Image.Image,
+    deck_items: list,
+    top: int,
+    cards_per_row: int,
+    card_size: tuple,
+    resize: bool = False,
+):
+    """
+    Paste the cards onto the canvas in rows, starting at y = top. If 'resize' is
+    set, card images are resampled to 'card_size' (once, through the tile cache).
+    """
+    card_width, card_height = card_size
+    card_overlap = int(card_height * 0.10)
+    x_offset, y_offset = 0, top
 
+    for card_key, card_data in deck_items:
+        card_image_path = get_card_image_path(card_data)
         try:
-            card_image = Image.open(card_image_path)
-
-            # Ensure the card image has the same mode as the output canvas
-            if card_image.mode != output_image.mode:
-                card_image = card_image.convert(output_image.mode)
+            # Decoded once per process and converted to RGB like the canvas
+            card_image = TILE_CACHE.get(card_image_path, card_size if resize else None)
 
-            # Paste the card image directly without resizing to preserve quality
+            # Paste at native resolution unless a target width was requested
             output_image.paste(card_image, (x_offset, y_offset))
 
             # Update x_offset, and wrap to the next row if necessary
             x_offset += card_width
-            if x_offset >= output_width:
+            if x_offset >= card_width * cards_per_row:
                 x_offset = 0
                 y_offset += card_height - card_overlap
         except FileNotFoundError:
@@ -124,72 +122,77 @@ def generate_image(
                 f"Warning: Image for card '{card_key}' not found at {card_image_path}"
             )
 
-    # Save the generated deck image as WebP
-    output_image_path = os.path.join(OUTPUT_IMAGES_FOLDER, f"{output_filename}.webp")
-    output_image.save(output_image_path, format="WEBP", quality=80, optimize=True)
-    print(f"Deck image saved to {output_image_path}")
 
-
-def combine_images(
-    main_deck_image_path: str, reserve_deck_image_path: str, output_filename: str
-):
+def render_deck_image(
+    deck_data: dict, cards_per_row: int = 10, target_width: int = None
+) -> Image.Image:
     """
-    Combine the main deck and reserve deck images into a single image,
-    adding a line and padding between them.
-    """
-
-    # Load the main deck and reserve deck images
-    main_deck_image = Image.open(main_deck_image_path)
-    # check if the reserve deck image exists
-    if not os.path.exists(reserve_deck_image_path):
-        return
-    reserve_deck_image = Image.open(reserve_deck_image_path)
+    Render the main deck and reserve onto a single canvas, with a separator line
+    and padding between them. The layout is computed up front from card counts.
 
-    # Set line height for the red separator line
-    line_height = 50
-
-    # Set padding between main deck and reserve deck
-    padding = 50  # You can adjust this value as needed
-
-    # Calculate the combined image size
-    combined_width = max(main_deck_image.width, reserve_deck_image.width)
-    combined_height = (
-        main_deck_image.height + reserve_deck_image.height + line_height + padding
-    )
+    Cards are pasted at native resolution to preserve quality unless
+    'target_width' is given, in which case the whole layout is scaled so the
+    canvas is that many pixels wide.
+    """
+    if cards_per_row == 0:
+        cards_per_row = 10
+    main_deck_items = expand_deck_items(deck_data.get("main_deck", {}))
+    reserve_items = expand_deck_items(deck_data.get("reserve", {}))
+    if not main_deck_items and not reserve_items:
+        print("No data found for 'main_deck' or 'reserve' deck.")
+        return None
+
+    # Use the first card image to determine the size for consistent dimensions
+    sample_card = (main_deck_items or reserve_items)[0][1]
+    card_width, card_height = TILE_CACHE.get(get_card_image_path(sample_card)).size
+    separator_height, separator_padding = SEPARATOR_HEIGHT, SEPARATOR_PADDING
+    resize = target_width is not None and target_width != card_width * cards_per_row
+    if resize:
+        scale = (target_width // cards_per_row) / card_width
+        card_width, card_height = target_width // cards_per_row, round(
+            card_height * scale
+        )
+        separator_height = max(round(SEPARATOR_HEIGHT * scale), 1)
+        separator_padding = round(SEPARATOR_PADDING * scale)
+
+    main_height = get_grid_height(len(main_deck_items), cards_per_row, card_height)
+    reserve_height = get_grid_height(len(reserve_items), cards_per_row, card_height)
+    reserve_top = main_height
+    if main_deck_items and reserve_items:
+        reserve_top += separator_height + separator_padding
 
-    # Create a blank canvas for the combined image with the new background color
-    background_color = (30, 32, 43)  # RGB for #1e202b
-    combined_image = Image.new(
-        "RGB", (combined_width, combined_height), background_color
+    output_width = card_width * cards_per_row
+    output_image = Image.new(
+        "RGB", (output_width, reserve_top + reserve_height), BACKGROUND_COLOR
     )
-
-    # Paste the main deck image at the top
-    combined_image.paste(main_deck_image, (0, 0))
-
-    # Draw a red line below the main deck image
-    draw = ImageDraw.Draw(combined_image)
-    line_color = (20, 22, 33)
-    line_y_start = main_deck_image.height + (line_height // 2)
-    draw.line(
-        (0, line_y_start, combined_width, line_y_start),
-        fill=line_color,
-        width=line_height,
+    paste_card_grid(
+        output_image,
+        main_deck_items,
+        0,
+        cards_per_row,
+        (card_width, card_height),
+        resize,
     )
 
-    # Paste the reserve deck image below the line, with added padding
-    reserve_y_offset = main_deck_image.height + line_height + padding
-    combined_image.paste(reserve_deck_image, (0, reserve_y_offset))
-
-    # Save the combined image using WebP optimization
-    print("Saving combined image as WebP...")
-    combined_image_path = os.path.join(
-        OUTPUT_IMAGES_FOLDER, f"{output_filename}_optimized.webp"
+    if main_deck_items and reserve_items:
+        # Draw a line below the main deck
+        draw = ImageDraw.Draw(output_image)
+        line_y_start = main_height + (separator_height // 2)
+        draw.line(
+            (0, line_y_start, output_width, line_y_start),
+            fill=SEPARATOR_COLOR,
+            width=separator_height,
+        )
+
+    paste_card_grid(
+        output_image,
+        reserve_items,
+        reserve_top,
+        cards_per_row,
+        (card_width, card_height),
+        resize,
     )
-    combined_image.save(combined_image_path, format="WEBP", quality=80, optimize=True)
-
-    file_size_mb = os.path.getsize(combined_image_path) / (1024 * 1024)
-    print(f"Combined deck image saved to {combined_image_path}")
-    print(f"File size: {file_size_mb:.2f}MB")
+    return output_image
 
 
 def find_decks(prefix: str):
@@ -199,15 +202,9 @@ def find_decks(prefix: str):
         prefix (str): The prefix to search for in deck file names
 
     Returns:
-        list: A list of file paths for decks matching the prefix
+        list: A list of file paths for decks matching the prefix, sorted by name
     """
-    matching_decks = []
-    for file_name in os.listdir(DECKLIST_FOLDER):
-        if file_name.lower().startswith(prefix.lower()) and (
-            file_name.endswith(".txt") or file_name.endswith(".dek")
-        ):
-            deck_path = os.path.join(DECKLIST_FOLDER, file_name)
-            matching_decks.append(deck_path)
+    matching_decks = DECK_INDEX.find_prefix(prefix)
 
     if not matching_decks:
         print(f"No decks found with prefix '{prefix}'")
@@ -217,7 +214,13 @@ def find_decks(prefix: str):
     return matching_decks
 
 
-def generate_deck_images(deck_type: str, deck_data, filename: str):
+def generate_deck_images(
+    deck_type: str,
+    deck_data,
+    filename: str,
+    target_width: int = None,
+    deepzoom: bool = False,
+):
     # Extract base filename from path if it's a full path
     base_filename = (
         os.path.splitext(os.path.basename(filename))[0]
@@ -225,132 +228,273 @@ def generate_deck_images(deck_type: str, deck_data, filename: str):
         else filename
     )
 
-    main_deck_filename = f"{base_filename}_main"
-    reserve_deck_filename = f"{base_filename}_reserve"
     if deck_type == "type_2":
         cards_per_row = 15
     else:
         cards_per_row = 10
-    generate_image(
-        deck_data,
-        "reserve",
-        reserve_deck_filename,
-        cards_per_row=cards_per_row,
-    )
-    generate_image(
-        deck_data,
-        "main_deck",
-        main_deck_filename,
-        cards_per_row=cards_per_row,
+    combined_image = render_deck_image(
+        deck_data, cards_per_row=cards_per_row, target_width=target_width
     )
+    if combined_image is None:
+        return None
+
+    if deepzoom:
+        # Tiled pyramid for web viewers that only fetch the visible tiles
+        dzi_path = save_deepzoom(
+            combined_image,
+            os.path.join(OUTPUT_IMAGES_FOLDER, f"{base_filename}_combined"),
+        )
+        print(f"DeepZoom deck image saved to {dzi_path}")
+        return None
 
-    main_deck_image_path = os.path.join(
-        OUTPUT_IMAGES_FOLDER, f"{main_deck_filename}.webp"
-    )
-    reserve_deck_image_path = os.path.join(
-        OUTPUT_IMAGES_FOLDER, f"{reserve_deck_filename}.webp"
-    )
-    combine_images(
-        main_deck_image_path, reserve_deck_image_path, f"{base_filename}_combined"
+    # Save the combined image using WebP optimization
+    print("Saving combined image as WebP...")
+    os.makedirs(OUTPUT_IMAGES_FOLDER, exist_ok=True)
+    combined_image_path = os.path.join(
+        OUTPUT_IMAGES_FOLDER, f"{base_filename}_combined_optimized.webp"
     )
+    combined_image.save(combined_image_path, format="WEBP", quality=80, optimize=True)
 
-    # Delete the individual deck images after combining
-    try:
-        if os.path.exists(main_deck_image_path):
-            os.remove(main_deck_image_path)
-            print(f"Deleted main deck image: {main_deck_image_path}")
-        if os.path.exists(reserve_deck_image_path):
-            os.remove(reserve_deck_image_path)
-            print(f"Deleted reserve deck image: {reserve_deck_image_path}")
-    except OSError as e:
-        print(f"Error deleting individual deck images: {e}")
-
-
-def generate_text_decklist(deck_type: str, deck_data, filename: str) -> None:
-    # generate_reserve_list(deck_data.get("reserve", {}))
+    file_size_mb = os.path.getsize(combined_image_path) / (1024 * 1024)
+    print(f"Combined deck image saved to {combined_image_path}")
+    print(f"File size: {file_size_mb:.2f}MB")
+    return combined_image_path
+
+
+def generate_text_decklist(
+    deck_type: str, deck_data, filename: str, reserve_list: bool = False
+) -> None:
     generate_decklist(deck_type, deck_data, filename=filename)
+    if reserve_list:
+        generate_reserve_list(
+            deck_type, deck_data.get("reserve", {}), filename=f"{filename}_reserve_list"
+        )
+
+
+def render_deck(
+    deck_type: str,
+    mode: str,
+    deck_path: str,
+    filename: str = None,
+    target_width: int = None,
+    deepzoom: bool = False,
+    reserve_list: bool = False,
+):
+    """Load a single deck file and render it in the given mode.
+
+    Returns:
+        str: The path of the saved deck image in png mode, otherwise None
+    """
+    deck_data = load_deck_data(deck_path)
+    if filename is None:
+        filename = os.path.splitext(os.path.basename(deck_path))[0]
+    if mode == "png":
+        return generate_deck_images(
+            deck_type,
+            deck_data,
+            filename=filename,
+            target_width=target_width,
+            deepzoom=deepzoom,
+        )
+    elif mode == "pdf":
+        generate_text_decklist(
+            deck_type, deck_data, filename=filename, reserve_list=reserve_list
+        )
+    return None
+
+
+def _init_render_worker(tile_cache_max_bytes: int, tile_cache_dir: str):
+    """Give each worker process its own tile cache with the parent's settings."""
+    TILE_CACHE.max_bytes = tile_cache_max_bytes
+    TILE_CACHE.cache_dir = tile_cache_dir
+
+
+def render_decks_in_parallel(
+    deck_type: str,
+    mode: str,
+    deck_paths: list,
+    workers: int,
+    target_width: int = None,
+    deepzoom: bool = False,
+    reserve_list: bool = False,
+) -> tuple[list, list]:
+    """Render decks in a process pool, reporting progress as each one finishes.
 
+    Returns:
+        tuple: The saved image paths, and (deck_path, error) pairs for the decks
+            that failed to render
+    """
+    output_paths = []
+    errors = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(TILE_CACHE.max_bytes, TILE_CACHE.cache_dir),
+    ) as executor:
+        futures = {
+            executor.submit(
+                render_deck,
+                deck_type,
+                mode,
+                deck_path,
+                target_width=target_width,
+                deepzoom=deepzoom,
+                reserve_list=reserve_list,
+            ): deck_path
+            for deck_path in deck_paths
+        }
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            deck_path = futures[future]
+            try:
+                output_path = future.result()
+                if output_path:
+                    output_paths.append(output_path)
+                print(f"[{n_done}/{len(futures)}] Rendered {deck_path}")
+            except Exception as e:
+                errors.append((deck_path, e))
+                print(f"[{n_done}/{len(futures)}] Error rendering {deck_path}: {e}")
+
+    if errors:
+        print(f"Failed to render {len(errors)} of {len(deck_paths)} deck(s)")
+    return output_paths, errors
+
+
+def render_deck_overlays(
+    deck_type: str, deck_path: str, reserve_list: bool = False
+) -> tuple[bytes, bytes, Exception]:
+    """Load a deck file and draw its check sheet and reserve list overlays.
+
+    The reserve list is drawn separately from the check sheet, so a reserve that
+    cannot be listed does not lose the deck's check sheet.
 
-def generate_reserve_list(reserve_data):
-    # Check reserve size
-    total_cards = sum(
-        card_info.get("quantity", 1) for card_info in reserve_data.values()
-    )
-    assert (
-        total_cards <= 10
-    ), f"Reserve list contains {total_cards} cards. Maximum allowed is 10."
-
-    # Create a temporary file for the text overlay
-    temp_overlay = os.path.join(OUTPUT_PDF_FOLDER, "temp_overlay.pdf")
-    c = canvas.Canvas(temp_overlay, pagesize=(1137, 1469))  # Match template dimensions
-
-    # Define grid layout parameters
-    cols = 3
-    rows = 4
-    cell_width = 280  # Approximate width for each column
-    cell_height = 246  # Approximate height for each row
-    start_y = 968
-    margin_left = 60  # Left margin for first column
-    line_spacing = 16  # Space between lines
-
-    # Sort card names once
-    sorted_cards = sorted([(name, info) for name, info in reserve_data.items()])
-
-    # Configure text settings
-    c.setFont("Helvetica", 12)
-
-    # Iterate through grid cells
-    for row in range(rows):
-        for col in range(cols):
-            # Calculate position for current cell
-            x = margin_left + (col * cell_width)
-            y = start_y - (row * cell_height)
-
-            # Reset font for card names
-            c.setFont("Helvetica", 12)
-
-            # Write card names for this cell
-            current_y = y
-            for card_name, card_info in sorted_cards:
-                # text = f"{card_info.get('quantity', 1)}x {card_name}"
-                text = f"{card_name}"
-                c.drawString(x, current_y, text)
-                current_y -= line_spacing
-
-                # Break to next cell if we're getting too close to the next row
-                if current_y < (y - cell_height + 40):
-                    break
-
-    c.save()
-
-    # Combine with the template PDF
-    template_path = "data/pdfs/Reserve List T1.pdf"
-    output_path = os.path.join(OUTPUT_PDF_FOLDER, "output_reserve_list.pdf")
-
-    # Merge the overlay with the template
+    Returns:
+        tuple: The check sheet and reserve list overlays as PDF bytes, and the
+            error raised drawing the reserve list. The reserve list is None
+            unless 'reserve_list' is set and it was drawn.
+    """
+    deck_data = load_deck_data(deck_path)
+    check_sheet = render_check_sheet_overlay(deck_type, deck_data).getvalue()
+    if not reserve_list:
+        return check_sheet, None, None
     try:
-        template_pdf = PdfReader(template_path)
-        overlay_pdf = PdfReader(temp_overlay)
+        reserve = render_reserve_list_overlay(deck_type, deck_data.get("reserve", {}))
+    except Exception as e:
+        return check_sheet, None, e
+    return check_sheet, reserve.getvalue(), None
 
-        output = PdfWriter()
-        page = template_pdf.pages[0]
-        page.merge_page(overlay_pdf.pages[0])
-        output.add_page(page)
 
-        with open(output_path, "wb") as output_file:
-            output.write(output_file)
+def iter_deck_overlays(
+    deck_type: str,
+    deck_paths: list,
+    workers: int,
+    errors: list,
+    reserve_list: bool = False,
+    reserve_errors: list = None,
+):
+    """Yield each deck's overlays in deck order, rendering up to 'workers' at once.
 
-        print(f"Reserve list generated: {output_path}")
-    except Exception as e:
-        print(f"Error generating PDF: {str(e)}")
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_overlay):
-            os.remove(temp_overlay)
+    Decks that fail to render are skipped and added to 'errors' as
+    (deck_path, error) pairs. Decks whose reserve list fails still yield their
+    check sheet, with None for the reserve list, and are added to
+    'reserve_errors'. With a single worker decks are rendered in this process,
+    one at a time.
+    """
+    if reserve_errors is None:
+        reserve_errors = errors
+    if workers <= 1:
+        results = (
+            partial(render_deck_overlays, deck_type, deck_path, reserve_list)
+            for deck_path in deck_paths
+        )
+        yield from _collect_overlays(deck_paths, results, errors, reserve_errors)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(render_deck_overlays, deck_type, deck_path, reserve_list)
+            for deck_path in deck_paths
+        ]
+        yield from _collect_overlays(
+            deck_paths, (future.result for future in futures), errors, reserve_errors
+        )
+
+
+def _collect_overlays(deck_paths: list, results, errors: list, reserve_errors: list):
+    """Read each deck's result in order, recording the decks that failed."""
+    for n_done, (deck_path, get_result) in enumerate(zip(deck_paths, results), start=1):
+        try:
+            check_sheet, reserve, reserve_error = get_result()
+        except Exception as e:
+            errors.append((deck_path, e))
+            print(f"[{n_done}/{len(deck_paths)}] Error rendering {deck_path}: {e}")
+            continue
+        if reserve_error is not None:
+            reserve_errors.append((deck_path, reserve_error))
+            print(
+                f"[{n_done}/{len(deck_paths)}] Rendered {deck_path} without its "
+                f"reserve list: {reserve_error}"
+            )
+        else:
+            print(f"[{n_done}/{len(deck_paths)}] Rendered {deck_path}")
+        yield BytesIO(check_sheet), reserve and BytesIO(reserve)
+
+
+def generate_check_sheet_batch(
+    deck_type: str,
+    deck_paths: list,
+    filename: str,
+    workers: int = 1,
+    reserve_list: bool = False,
+) -> tuple[str, list, list]:
+    """Write the check sheets of every deck into one multi-page PDF.
+
+    With 'reserve_list', the reserve lists are written to a second PDF,
+    '<filename>_reserve_lists.pdf', in the same deck order. A deck whose reserve
+    list fails keeps its check sheet and is left out of the reserve lists.
+
+    Returns:
+        tuple: The path of the check sheet PDF, (deck_path, error) pairs for the
+            decks that failed to render, and (deck_path, error) pairs for the
+            reserve lists that failed to render
+    """
+    output_path = os.path.join(OUTPUT_PDF_FOLDER, f"{filename}.pdf")
+    errors = []
+    reserve_errors = []
+    reserve_overlays = []
+
+    def iter_check_sheets():
+        for check_sheet, reserve in iter_deck_overlays(
+            deck_type, deck_paths, workers, errors, reserve_list, reserve_errors
+        ):
+            if reserve is not None:
+                reserve_overlays.append(reserve)
+            yield check_sheet
+
+    n_pages = write_check_sheets(deck_type, iter_check_sheets(), output_path)
+    if errors:
+        print(f"Failed to render {len(errors)} of {len(deck_paths)} deck(s)")
+    print(f"Wrote {n_pages} check sheet(s) to {output_path}")
+
+    if reserve_list:
+        if reserve_errors:
+            print(f"Failed to render {len(reserve_errors)} reserve list(s)")
+        reserve_path = os.path.join(OUTPUT_PDF_FOLDER, f"{filename}_reserve_lists.pdf")
+        n_pages = write_reserve_lists(deck_type, reserve_overlays, reserve_path)
+        print(f"Wrote {n_pages} reserve list(s) to {reserve_path}")
+    return output_path, errors, reserve_errors
 
 
 def process_decklist(
-    deck_type: str, mode: str, deck_name: str = None, prefix: str = None
+    deck_type: str,
+    mode: str,
+    deck_name: str = None,
+    prefix: str = None,
+    workers: int = 1,
+    target_width: int = None,
+    deepzoom: bool = False,
+    optimizer: ImageOptimizer = None,
+    batch: bool = False,
+    reserve_list: bool = False,
 ):
     """Process deck list(s) based on either deck name or prefix.
 
@@ -359,26 +503,63 @@ def process_decklist(
         mode (str): Processing mode ('png' or 'pdf')
         deck_name (str, optional): Specific deck name to process
         prefix (str, optional): Prefix to match multiple decks
+        workers (int, optional): Number of processes used to render prefix matches
+        target_width (int, optional): Width in pixels to scale deck images to
+        deepzoom (bool, optional): Save deck images as DeepZoom tile pyramids
+        optimizer (ImageOptimizer, optional): Post-processing stage run on the
+            saved deck images
+        batch (bool, optional): Write the check sheets of all prefix matches into
+            one PDF (pdf mode)
+        reserve_list (bool, optional): Also write reserve list sheets (pdf mode)
     """
     if not deck_name and not prefix:
         raise ValueError("Either deck_name or prefix must be provided")
 
+    output_paths = []
     if prefix:
         decks = find_decks(prefix)
-        for deck_path in decks:
-            deck_data = load_deck_data(deck_path)
-            filename = os.path.splitext(os.path.basename(deck_path))[0]
-            if mode == "png":
-                generate_deck_images(deck_type, deck_data, filename=filename)
-            elif mode == "pdf":
-                generate_text_decklist(deck_type, deck_data, filename=filename)
+        if batch and mode == "pdf":
+            if decks:
+                generate_check_sheet_batch(
+                    deck_type,
+                    decks,
+                    f"{prefix}_check_sheets",
+                    workers=workers,
+                    reserve_list=reserve_list,
+                )
+        elif workers > 1 and len(decks) > 1:
+            output_paths, _ = render_decks_in_parallel(
+                deck_type, mode, decks, workers, target_width, deepzoom, reserve_list
+            )
+        else:
+            for deck_path in decks:
+                output_paths.append(
+                    render_deck(
+                        deck_type,
+                        mode,
+                        deck_path,
+                        target_width=target_width,
+                        deepzoom=deepzoom,
+                        reserve_list=reserve_list,
+                    )
+                )
     else:
         decklist_file_path = find_decklist_file(deck_name)
-        deck_data = load_deck_data(decklist_file_path)
-        if mode == "png":
-            generate_deck_images(deck_type, deck_data, filename=deck_name)
-        elif mode == "pdf":
-            generate_text_decklist(deck_type, deck_data, filename=deck_name)
+        output_paths.append(
+            render_deck(
+                deck_type,
+                mode,
+                decklist_file_path,
+                filename=deck_name,
+                target_width=target_width,
+                deepzoom=deepzoom,
+                reserve_list=reserve_list,
+            )
+        )
+
+    output_paths = [path for path in output_paths if path]
+    if optimizer and output_paths:
+        optimize_images(output_paths, optimizer, workers=workers)
 
 
 if __name__ == "__main__":
@@ -403,15 +584,77 @@ if __name__ == "__main__":
         "--prefix",
         help="prefix to match multiple deck names",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes used to render decks matched by --prefix",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="write the check sheets of all --prefix matches into one PDF (pdf mode)",
+    )
+    parser.add_argument(
+        "--reserve-list",
+        action="store_true",
+        help="also write reserve list sheets for each deck (pdf mode)",
+    )
+    parser.add_argument(
+        "--target-width",
+        type=int,
+        help="scale deck images to this width in pixels (png mode)",
+    )
+    parser.add_argument(
+        "--deepzoom",
+        action="store_true",
+        help="save deck images as DeepZoom tile pyramids (png mode)",
+    )
+    parser.add_argument(
+        "--optimize",
+        choices=["target-size", "lossless", "tinify"],
+        help="post-process deck images to reduce their file size (png mode)",
+    )
+    parser.add_argument(
+        "--target-kb",
+        type=int,
+        default=500,
+        help="file size to aim for with --optimize target-size",
+    )
+    parser.add_argument(
+        "--tile-cache-mb",
+        type=int,
+        default=512,
+        help="memory budget for decoded card images in MB",
+    )
+    parser.add_argument(
+        "--tile-cache-dir",
+        help="folder for resized card images kept between runs",
+    )
 
     args = parser.parse_args()
 
     if not args.deck_name and not args.prefix:
         parser.error("Either --deck-name or --prefix must be provided")
+    if args.reserve_list and args.deck_type not in RESERVE_TEMPLATE_PATHS:
+        parser.error(f"--reserve-list has no template for {args.deck_type} decks")
+
+    TILE_CACHE.max_bytes = args.tile_cache_mb * 1024 * 1024
+    TILE_CACHE.cache_dir = args.tile_cache_dir
 
     process_decklist(
         deck_type=args.deck_type,
         mode=args.mode,
         deck_name=args.deck_name,
         prefix=args.prefix,
-    )
\ No newline at end of file
+        workers=args.workers,
+        target_width=args.target_width,
+        deepzoom=args.deepzoom,
+        optimizer=(
+            get_optimizer(args.optimize, target_kb=args.target_kb)
+            if args.optimize
+            else None
+        ),
+        batch=args.batch,
+        reserve_list=args.reserve_list,
+    )
@@ -1,12 +1,105 @@
 # This script will add metadata tags to a a .txt file.
+import argparse
 import csv
+import hashlib
+import itertools
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
 CARD_DATA_PATH = "data/carddata/carddata.txt"
+CARD_DATA_ORIGINAL_PATH = "data/carddata/carddata_original.txt"
+MANIFEST_PATH = "data/carddata/carddata_manifest.json"
+# Bump when the tagging rules change, so the next run re-tags every card
+TAGGER_VERSION = 1
+# Cards listed per category in the tagging report
+REPORT_LIMIT = 20
 
+OT_BOOKS = (
+    "Genesis",
+    "Exodus",
+    "Leviticus",
+    "Numbers",
+    "Deuteronomy",
+    "Joshua",
+    "Judges",
+    "Ruth",
+    "I Samuel",
+    "II Samuel",
+    "I Kings",
+    "II Kings",
+    "I Chronicles",
+    "II Chronicles",
+    "Ezra",
+    "Nehemiah",
+    "Esther",
+    "Job",
+    "Psalms",
+    "Psalm",
+    "Proverbs",
+    "Ecclesiastes",
+    "Song of Solomon",
+    "Isaiah",
+    "Jeremiah",
+    "Lamentations",
+    "Ezekiel",
+    "Daniel",
+    "Hosea",
+    "Joel",
+    "Amos",
+    "Obadiah",
+    "Jonah",
+    "Micah",
+    "Nahum",
+    "Habakkuk",
+    "Zephaniah",
+    "Haggai",
+    "Zechariah",
+    "Malachi",
+    "Old Testament",
+)
 
-def load_card_data(card_data_path: str) -> dict:
-    """Take the data found in 'card_data_path' and load it into a dictionary."""
-    card_database = {}
+NT_BOOKS = (
+    "Matthew",
+    "Mark",
+    "Luke",
+    "John",
+    "Acts",
+    "Romans",
+    "I Corinthians",
+    "II Corinthians",
+    "Galatians",
+    "Ephesians",
+    "Philippians",
+    "Colossians",
+    "I Thessalonians",
+    "II Thessalonians",
+    "I Timothy",
+    "II Timothy",
+    "Titus",
+    "Philemon",
+    "Hebrews",
+    "James",
+    "I Peter",
+    "II Peter",
+    "I John",
+    "II John",
+    "III John",
+    "Jude",
+    "Revelation",
+    "New Testament",
+)
+
+GOSPEL_BOOKS = {"Matthew", "Mark", "Luke", "John"}
+
+REFERENCE_TAGS = ("Nativity", "[Gospel]", "[OT]", "[NT]")
+
+
+def iter_card_rows(card_data_path: str):
+    """Yield (card key, row) for each card in 'card_data_path', in file order."""
     with open(card_data_path, "r", newline="", encoding="utf-8") as file:
         reader = csv.DictReader(
             file,
@@ -15,22 +108,31 @@ def load_card_data(card_data_path: str) -> dict:
         )
         for row in reader:
             # Preserve the exact string values without any processing
-            card_database[f"{row['Name']}____{row['OfficialSet']}"] = {
+            yield f"{row['Name']}____{row['OfficialSet']}", {
                 k: str(v) if v is not None else "" for k, v in row.items()
             }
 
-    return card_database
 
+def load_card_data(card_data_path: str) -> dict:
+    """Take the data found in 'card_data_path' and load it into a dictionary."""
+    return dict(iter_card_rows(card_data_path))
 
-def save_card_data(card_database: dict, card_data_path: str) -> None:
-    """Save the card database to a .txt file, then remove the final CRLF."""
-    if not card_database:
+
+def write_card_rows(cards, card_data_path: str) -> int:
+    """
+    Write cards to a .txt file as they are yielded, then remove the final CRLF.
+
+    Returns:
+        int: The number of cards written
+    """
+    cards = iter(cards)
+    first_card = next(cards, None)
+    if first_card is None:
         print("Error: Card database is empty")
-        return
+        return 0
 
-    first_card = next(iter(card_database.values()))
     terminator = "\r\n"
-
+    n_cards = 0
     with open(card_data_path, "w+", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(
             f,
@@ -42,160 +144,283 @@ def save_card_data(card_database: dict, card_data_path: str) -> None:
             lineterminator=terminator,
         )
         writer.writeheader()
-        for card in card_database.values():
+        for card in itertools.chain([first_card], cards):
             writer.writerow(card)
+            n_cards += 1
         f.seek(f.tell() - len(terminator))
         f.truncate()
+    return n_cards
+
+
+def save_card_data(card_database: dict, card_data_path: str) -> None:
+    """Save the card database to a .txt file, then remove the final CRLF."""
+    write_card_rows(card_database.values(), card_data_path)
+
+
+def get_citation_pattern() -> re.Pattern:
+    """One alternation over every book name, longest first, then chapter:verses."""
+    book_names = sorted(OT_BOOKS + NT_BOOKS, key=len, reverse=True)
+    return re.compile(
+        r"\b(?P<book>" + "|".join(map(re.escape, book_names)) + r")\b"
+        r"(?:\s+(?P<chapter>\d+)(?::(?P<first_verse>\d+)(?:-(?P<last_verse>\d+))?)?)?"
+    )
+
+
+CITATION_PATTERN = get_citation_pattern()
+
+
+class Citation(NamedTuple):
+    book: str
+    chapter: Optional[int]
+    first_verse: Optional[int]
+    last_verse: Optional[int]
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+@lru_cache(maxsize=None)
+def parse_reference(ref: str) -> tuple[Citation, ...]:
+    """
+    Parse every book, chapter and verse range cited in a reference, such as
+    'Isaiah 11:10/Romans 15:12'. A single verse has first_verse == last_verse.
+    """
+    citations = []
+    for match in CITATION_PATTERN.finditer(ref):
+        first_verse = _to_int(match.group("first_verse"))
+        last_verse = _to_int(match.group("last_verse"))
+        citations.append(
+            Citation(
+                match.group("book"),
+                _to_int(match.group("chapter")),
+                first_verse,
+                last_verse if last_verse is not None else first_verse,
+            )
+        )
+    return tuple(citations)
+
+
+def is_nativity_passage(citation: Citation) -> bool:
+    """Check if a citation is a Nativity passage."""
+    if citation.book == "Matthew":
+        # Matthew 1:18-25, or the whole of chapter 2
+        if citation.chapter == 1 and citation.first_verse is not None:
+            return citation.first_verse >= 18 and citation.last_verse <= 25
+        return citation.chapter == 2 and citation.first_verse is None
+    if citation.book == "Luke":
+        return citation.chapter in (1, 2)
+    return False
+
+
+@lru_cache(maxsize=None)
+def get_reference_tags(ref: str) -> tuple[str, ...]:
+    """Return the Nativity, Gospel and testament tags for a single reference."""
+    citations = parse_reference(ref.strip())
+    tags = []
+    if any(is_nativity_passage(citation) for citation in citations):
+        tags.append("Nativity")
+    if any(citation.book in GOSPEL_BOOKS for citation in citations):
+        tags.append("[Gospel]")
+    if any(citation.book in OT_BOOKS for citation in citations):
+        tags.append("[OT]")
+    else:
+        tags.append("[NT]")
+    return tuple(tags)
+
+
+def split_references(reference_field: str) -> list:
+    """Split a Reference field into single references.
+
+    References are separated by semicolons, and a reference may list more in
+    parentheses, separated by commas.
+    """
+    references = []
+    for ref_group in reference_field.split(";"):
+        ref_group = ref_group.strip()
+
+        # Check if there are parenthetical references
+        if "(" in ref_group and ")" in ref_group:
+            # Extract the main reference
+            main_ref = ref_group.split("(")[0].strip()
+            references.append(main_ref)
+
+            # Extract parenthetical references
+            paren_content = ref_group[ref_group.find("(") + 1 : ref_group.find(")")]
+            # Split by commas if multiple references in parentheses
+            references.extend(pr.strip() for pr in paren_content.split(","))
+        else:
+            references.append(ref_group)
+    return references
+
+
+def tag_card(card_data: dict) -> dict:
+    """Add scripture reference tags to a card's Identifier field."""
+    if not card_data.get("Reference"):
+        return card_data
+
+    # Tags already in the Identifier are not added again. Cards marked
+    # 'O.T.' never get an [NT] tag.
+    identifier = card_data["Identifier"]
+    skipped_tags = {tag for tag in REFERENCE_TAGS if tag in identifier}
+    if "O.T." in identifier:
+        skipped_tags.add("[NT]")
+
+    tags = []
+    for ref in split_references(card_data["Reference"]):
+        for tag in get_reference_tags(ref):
+            if tag not in skipped_tags:
+                tags.append(tag)  # No sorting, maintain original order
+                skipped_tags.add(tag)
+
+    # Update Identifier field
+    if tags:
+        current_identifier = identifier.strip()
+        tag_string = ",".join(tags)
+        card_data["Identifier"] = (
+            f"{current_identifier},{tag_string}" if current_identifier else tag_string
+        )
+    return card_data
 
 
 def add_tags(card_database: dict) -> dict:
     """Add scripture reference tags to the Identifier field."""
+    for card_data in card_database.values():
+        tag_card(card_data)
+    return card_database
 
-    ot_books = [
-        "Genesis",
-        "Exodus",
-        "Leviticus",
-        "Numbers",
-        "Deuteronomy",
-        "Joshua",
-        "Judges",
-        "Ruth",
-        "I Samuel",
-        "II Samuel",
-        "I Kings",
-        "II Kings",
-        "I Chronicles",
-        "II Chronicles",
-        "Ezra",
-        "Nehemiah",
-        "Esther",
-        "Job",
-        "Psalms",
-        "Psalm",
-        "Proverbs",
-        "Ecclesiastes",
-        "Song of Solomon",
-        "Isaiah",
-        "Jeremiah",
-        "Lamentations",
-        "Ezekiel",
-        "Daniel",
-        "Hosea",
-        "Joel",
-        "Amos",
-        "Obadiah",
-        "Jonah",
-        "Micah",
-        "Nahum",
-        "Habakkuk",
-        "Zephaniah",
-        "Haggai",
-        "Zechariah",
-        "Malachi",
-        "Old Testament",
-    ]
-
-    gospel_books = ["Matthew", "Mark", "Luke", "John"]
-
-    johns_epistles = ["I John", "II John", "III John"]
-
-    def is_nativity_reference(ref: str) -> bool:
-        """Check if reference is a Nativity passage."""
-        ref = ref.strip()
-
-        # Handle specific Matthew references
-        if ref.startswith("Matthew 1:"):
-            try:
-                verse_part = ref.split("Matthew 1:")[1]
-                if "-" in verse_part:
-                    start, end = map(int, verse_part.split("-"))
-                    return start >= 18 and end <= 25
-                verse = int(verse_part)
-                return 18 <= verse <= 25
-            except (ValueError, IndexError):
-                return False
-
-        # Handle specific Luke references
-        if ref.startswith("Luke 1:") or ref.startswith("Luke 2:"):
-            try:
-                chapter = int(ref.split("Luke ")[1].split(":")[0])
-                return chapter in [1, 2]
-            except (ValueError, IndexError):
-                return False
-
-        # Handle full chapter references
-        return ref == "Matthew 2" or ref == "Luke 1" or ref == "Luke 2"
-
-    for card_key, card_data in card_database.items():
-        if not card_data.get("Reference"):
-            continue
-
-        # Handle both semicolon separated references and parenthetical references
-        references = []
-
-        # First split by semicolons
-        for ref_group in card_data["Reference"].split(";"):
-            ref_group = ref_group.strip()
-
-            # Check if there are parenthetical references
-            if "(" in ref_group and ")" in ref_group:
-                # Extract the main reference
-                main_ref = ref_group.split("(")[0].strip()
-                references.append(main_ref)
-
-                # Extract parenthetical references
-                paren_content = ref_group[ref_group.find("(") + 1 : ref_group.find(")")]
-                # Split by commas if multiple references in parentheses
-                paren_refs = [pr.strip() for pr in paren_content.split(",")]
-                references.extend(paren_refs)
-            else:
-                references.append(ref_group)
-
-        tags = []
-
-        for ref in references:
-            # Check for Nativity references
-            if is_nativity_reference(ref):
-                if "Nativity" not in tags and "Nativity" not in card_data["Identifier"]:
-                    tags.append("Nativity")
-
-            # Check for gospel references (excluding John's epistles)
-            if any(gospel in ref for gospel in gospel_books) and not any(
-                epistle in ref for epistle in johns_epistles
-            ):
-                if "[Gospel]" not in tags and "[Gospel]" not in card_data["Identifier"]:
-                    tags.append("[Gospel]")
-
-            # Determine testament (separate logic from gospel check)
-            if any(ot_book in ref for ot_book in ot_books):
-                if "[OT]" not in tags and "[OT]" not in card_data["Identifier"]:
-                    tags.append("[OT]")
+
+@dataclass
+class TagReport:
+    """The cards re-tagged, dropped and reused by an incremental tagging run."""
+
+    added: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    unchanged: int = 0
+
+    def print(self):
+        for label, card_keys in [
+            ("Added", self.added),
+            ("Changed", self.changed),
+            ("Removed", self.removed),
+        ]:
+            for card_key in card_keys[:REPORT_LIMIT]:
+                print(f"{label}: {card_key.replace('____', ' / ')}")
+            if len(card_keys) > REPORT_LIMIT:
+                print(f"{label}: ... and {len(card_keys) - REPORT_LIMIT} more")
+        print(
+            f"Tagged {len(self.added)} new and {len(self.changed)} changed card(s), "
+            f"removed {len(self.removed)}, kept {self.unchanged} unchanged"
+        )
+
+
+def get_row_hash(card_data: dict) -> str:
+    """Hash every column of an untagged card row."""
+    content = "\t".join(f"{key}={value}" for key, value in card_data.items())
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def load_manifest(manifest_path: str) -> dict:
+    """Load the card key -> row hash manifest, if it matches the tagging rules."""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != TAGGER_VERSION:
+        print("Tagging rules changed since the last run. Re-tagging every card.")
+        return {}
+    return manifest["cards"]
+
+
+def save_manifest(row_hashes: dict, manifest_path: str) -> None:
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"version": TAGGER_VERSION, "cards": row_hashes}, f)
+
+
+def get_previous_row(previous_rows, pending: dict, card_key: str):
+    """
+    Find a card in the previous output by reading ahead in it.
+
+    The previous output is in the same order as the source apart from added and
+    removed cards, so the card is usually next. Rows read past are kept in
+    'pending' in case the source was reordered.
+    """
+    if card_key in pending:
+        return pending.pop(card_key)
+    for previous_key, previous_row in previous_rows:
+        if previous_key == card_key:
+            return previous_row
+        pending[previous_key] = previous_row
+    return None
+
+
+def update_card_data(
+    source_path: str = CARD_DATA_ORIGINAL_PATH,
+    output_path: str = CARD_DATA_PATH,
+    manifest_path: str = MANIFEST_PATH,
+    full: bool = False,
+) -> TagReport:
+    """
+    Tag only the cards that are new or changed since the last run.
+
+    The source is streamed in order and merged with the previous output: rows
+    whose hash matches the manifest are copied from the previous output, and
+    the rest are tagged. Without a manifest or previous output, or with
+    'full', every card is tagged.
+    """
+    manifest = {}
+    if not full and os.path.exists(output_path):
+        manifest = load_manifest(manifest_path)
+    previous_rows = iter_card_rows(output_path) if manifest else None
+    pending = {}
+    row_hashes = {}
+    report = TagReport()
+
+    def iter_tagged_rows():
+        for card_key, card_data in iter_card_rows(source_path):
+            row_hash = get_row_hash(card_data)
+            row_hashes[card_key] = row_hash
+            if manifest.get(card_key) == row_hash:
+                previous_row = get_previous_row(previous_rows, pending, card_key)
+                if previous_row is not None:
+                    report.unchanged += 1
+                    yield previous_row
+                    continue
+            if card_key in manifest:
+                report.changed.append(card_key)
             else:
-                if (
-                    "[NT]" not in tags
-                    and "[NT]" not in card_data["Identifier"]
-                    and "O.T." not in card_data.get("Identifier", "")
-                ):
-                    tags.append("[NT]")
-
-        # Update Identifier field
-        if tags:
-            current_identifier = card_data["Identifier"].strip()
-            tag_string = ",".join(tags)  # No sorting, maintain original order
-            card_data["Identifier"] = (
-                f"{current_identifier},{tag_string}"
-                if current_identifier
-                else tag_string
-            )
+                report.added.append(card_key)
+            yield tag_card(card_data)
 
-    return card_database
+    # Write next to the output so the previous output can be read while merging
+    temp_path = f"{output_path}.tmp"
+    n_cards = write_card_rows(iter_tagged_rows(), temp_path)
+    if previous_rows is not None:
+        previous_rows.close()
+    if not n_cards:
+        # Nothing was written, so keep the previous output and manifest
+        return report
+    os.replace(temp_path, output_path)
+    save_manifest(row_hashes, manifest_path)
+
+    report.removed = [card_key for card_key in manifest if card_key not in row_hashes]
+    report.print()
+    return report
 
 
 if __name__ == "__main__":
-    # card_data = load_card_data(CARD_DATA_PATH)
-    card_data = load_card_data("data/carddata/carddata_original.txt")
-    card_data = add_tags(card_data)
-    save_card_data(card_data, CARD_DATA_PATH)
+    parser = argparse.ArgumentParser(
+        description="Add scripture reference tags to the card data"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="re-tag every card instead of only new or changed ones",
+    )
+    args = parser.parse_args()
+
+    update_card_data(full=args.full)
     # save_card_data(
     #     card_data, "/Applications/LackeyCCG/plugins/Redemption/sets/carddata.txt"
     # )
@@ -1,7 +1,19 @@
 import os
 import re
-
-from PyPDF2 import PdfReader, PdfWriter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from io import BytesIO
+
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    StreamObject,
+)
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
 
 # Precompile regex patterns for efficiency.
@@ -10,6 +22,49 @@ LOST_SOUL_PREFIX_PATTERN = re.compile(r"^Lost Soul\s+")
 BRACKET_PATTERN = re.compile(r"\[([^\]]+)\]")
 HYPHEN_PATTERN = re.compile(r"\s*-\s*[^]]+")
 
+# Check sheet boxes and the card types listed in each, in drawing order. Cards of
+# any other type go to the misc box.
+SECTION_TYPES = {
+    "Dominant": ("Dominant",),
+    "Hero": ("Hero",),
+    "GE": ("GE",),
+    "Lost Soul": ("Lost Soul",),
+    "Evil Character": ("Evil Character",),
+    "EE": ("EE",),
+    "Artifact": ("Artifact", "Covenant", "Curse"),
+    "Fortress": ("Fortress", "Site", "City"),
+}
+MISC_SECTION = "Misc"
+RESERVE_SECTION = "Reserve"
+SECTION_NAMES = [*SECTION_TYPES, MISC_SECTION, RESERVE_SECTION]
+TYPE_SECTIONS = {
+    card_type: section_name
+    for section_name, card_types in SECTION_TYPES.items()
+    for card_type in card_types
+}
+ALIGNMENTS = ("Good", "Evil", "Neutral")
+
+# The reserve list template is a 3 x 4 grid of identical slips with 10 numbered
+# lines each, cut apart and handed in one per round. Only Type 1 has one; the
+# slip layout below is measured from it.
+RESERVE_TEMPLATE_PATHS = {
+    "type_1": "data/pdfs/Reserve List T1.pdf",
+}
+RESERVE_LIST_SIZE = 10
+RESERVE_SLIP_COLUMNS = 3
+RESERVE_SLIP_ROWS = 4
+RESERVE_SLIP_WIDTH = 280
+RESERVE_SLIP_HEIGHT = 246
+RESERVE_FIRST_LINE = (60, 968)  # Start of line 1 on the top left slip
+RESERVE_LINE_SPACING = 16
+RESERVE_LINE_WIDTH = 200
+RESERVE_MIN_FONT_SIZE = 7
+
+TEMPLATE_PATHS = {
+    "type_1": "data/pdfs/Type 1 Deck Check Sheet.pdf",
+    "type_2": "data/pdfs/Type 2 Deck Check Sheet.pdf",
+}
+
 
 def clean_card_name(card_name, card_data):
     """
@@ -42,116 +97,165 @@ def clean_card_name(card_name, card_data):
     return card_name
 
 
-def place_section(c, section_data, x, y, line_spacing, add_quantity=True):
+@dataclass
+class Section:
+    """The cards listed in one box of the check sheet, sorted by card name."""
+
+    entries: list = field(default_factory=list)  # (card_name, display_name, quantity)
+    count: int = 0
+
+    def add(self, card_name: str, card_data: dict):
+        quantity = card_data.get("quantity", 1)
+        self.entries.append(
+            (card_name, clean_card_name(card_name, card_data), quantity)
+        )
+        self.count += quantity
+
+
+@dataclass
+class DeckSections:
+    """A deck bucketed once into check sheet sections and alignment totals."""
+
+    sections: dict
+    total_main: int
+    alignment_counts: dict
+
+
+def get_section_name(card_data: dict) -> str:
+    return TYPE_SECTIONS.get(card_data.get("type"), MISC_SECTION)
+
+
+def get_deck_sections(deck_data) -> DeckSections:
     """
-    Place sorted items from section_data at (x, y) on the canvas.
+    Bucket the main deck by type and alignment and the reserve into one section,
+    in a single pass over each, cleaning every card name once.
     """
-    for card_name, card_data in sorted(section_data.items(), key=lambda item: item[0]):
-        display_name = clean_card_name(card_name, card_data)
-        display_text = (
-            f"{card_data.get('quantity', 1)}x {display_name}"
-            if add_quantity
-            else display_name
-        )
+    sections = {section_name: Section() for section_name in SECTION_NAMES}
+    alignment_counts = dict.fromkeys(ALIGNMENTS, 0)
+    total_main = 0
+    for card_name, card_data in deck_data.get("main_deck", {}).items():
+        sections[get_section_name(card_data)].add(card_name, card_data)
+        total_main += int(card_data.get("quantity", 1))
+        alignment = card_data.get("alignment")
+        if alignment in alignment_counts:
+            alignment_counts[alignment] += card_data.get("quantity", 1)
+    for card_name, card_data in deck_data.get("reserve", {}).items():
+        sections[RESERVE_SECTION].add(card_name, card_data)
+
+    for section in sections.values():
+        section.entries.sort(key=lambda entry: entry[0])
+    return DeckSections(sections, total_main, alignment_counts)
+
+
+def place_section(c, section: Section, x, y, line_spacing=16, add_quantity=True):
+    """
+    Place the section's sorted cards at (x, y) on the canvas.
+    """
+    for _, display_name, quantity in section.entries:
+        display_text = f"{quantity}x {display_name}" if add_quantity else display_name
         c.drawString(x, y, display_text)
         y -= line_spacing
 
 
-def draw_count(
-    c, cards, height_points, card_types, x, y, font="Helvetica", font_size=12
-):
-    """Draw just the total count (number) for cards at (x, y)."""
-    y = height_points - y
-    total = 0
-    for card_data in cards.values():
-        if card_types == "misc":
-            if card_data.get("type") not in [
-                "Dominant",
-                "Hero",
-                "GE",
-                "Lost Soul",
-                "Evil Character",
-                "EE",
-                "Artifact",
-                "Fortress",
-                "Site",
-                "Curse",
-                "Covenant",
-                "City",
-            ]:
-                total += card_data.get("quantity", 1)
-        elif card_data.get("type") == card_types or card_data.get("type") in card_types:
-            total += card_data.get("quantity", 1)
-        elif card_types == "all":
-            total += card_data.get("quantity", 1)
-
+def draw_count(c, count: int, x, y, font="Helvetica", font_size=12):
+    """Draw just the total count (number) for a section at (x, y)."""
     c.setFont(font, font_size)
-    c.drawString(x, y, str(total))
+    c.drawString(x, y, str(count))
+
+
+@lru_cache(maxsize=None)
+def load_template(template_path: str) -> PageObject:
+    """Parse a template PDF once per process and return its first page."""
+    return PdfReader(template_path).pages[0]
+
+
+def get_page_size(page: PageObject) -> tuple[float, float]:
+    return float(page.mediabox.width), float(page.mediabox.height)
 
 
-def place_section_by_type(c, deck, height_points, card_types, x, y, add_quantity=True):
+def read_overlay(overlay: BytesIO) -> PageObject:
+    """Read back the single page of an overlay rendered into memory."""
+    overlay.seek(0)
+    return PdfReader(overlay).pages[0]
+
+
+def page_to_form(page: PageObject) -> StreamObject:
     """
-    Filter main_deck by card_types and place the section.
+    Wrap a page's content and resources in a Form XObject, so it can be drawn on
+    other pages with a single 'Do' instead of re-parsing its content stream.
     """
-    y = height_points - y
-    line_spacing = 16
-    if isinstance(card_types, str):
-        filtered = {k: v for k, v in deck.items() if v.get("type") == card_types}
+    contents = page.get_contents()
+    if isinstance(contents, ArrayObject):
+        data = b"\n".join(stream.get_object().get_data() for stream in contents)
     else:
-        filtered = {k: v for k, v in deck.items() if v.get("type") in card_types}
-    if card_types == "misc":
-        filtered = {}
-        for key, value in deck.items():
-            if value.get("type") not in [
-                "Dominant",
-                "Hero",
-                "GE",
-                "Lost Soul",
-                "Evil Character",
-                "EE",
-                "Artifact",
-                "Fortress",
-                "Site",
-                "Curse",
-                "Covenant",
-                "City",
-            ]:
-                filtered[key] = value
-    elif card_types == "all":
-        filtered = deck
-    place_section(c, filtered, x, y, line_spacing, add_quantity)
+        data = contents.get_data()
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    # flate_encode returns a fresh stream, so the form entries are set afterwards
+    form = stream.flate_encode()
+    form.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): page.mediabox,
+            NameObject("/Resources"): page[NameObject("/Resources")],
+        }
+    )
+    return form
 
 
-def generate_decklist(deck_type: str, deck_data, filename: str):
+def add_template_page(
+    writer: PdfWriter,
+    template_form,
+    overlay_page: PageObject,
+    page_size: tuple[float, float],
+) -> PageObject:
     """
-    Generate a deck check sheet overlay with card listings, section counts,
-    and a total card count.
+    Add a new page to the writer that draws the template with the overlay on top.
 
-    Args:
-        deck_type (str): The type of deck check sheet ('type_1' or 'type_2')
-        deck_data (dict): The deck data containing main_deck and reserve
-        filename (str): Name for the output file (without extension)
+    'template_form' is the form from page_to_form for the first page, and the
+    reference from get_template_form for every page after it. add_page copies
+    the forms and the content stream into the writer as objects of their own,
+    so the template is referenced rather than merged: the cached template page
+    is never modified and its content and fonts are stored once per output PDF.
     """
-    if deck_type == "type_1":
-        template_path = "data/pdfs/Type 1 Deck Check Sheet.pdf"
-    elif deck_type == "type_2":
-        template_path = "data/pdfs/Type 2 Deck Check Sheet.pdf"
+    page = PageObject.create_blank_page(width=page_size[0], height=page_size[1])
+    page[NameObject("/Resources")] = DictionaryObject(
+        {
+            NameObject("/XObject"): DictionaryObject(
+                {
+                    NameObject("/Template"): template_form,
+                    NameObject("/Overlay"): page_to_form(overlay_page),
+                }
+            )
+        }
+    )
+    contents = DecodedStreamObject()
+    contents.set_data(b"q /Template Do Q q /Overlay Do Q")
+    page[NameObject("/Contents")] = contents
+    page = writer.add_page(page)
+    # Each overlay has its own reader, and the writer matches copied objects by
+    # the reader's id(), which a later overlay's reader may reuse
+    writer.reset_translation(overlay_page.pdf)
+    return page
 
-    # Create output directory if it doesn't exist
-    os.makedirs("tbd", exist_ok=True)
 
-    # Use dynamic filename for output
-    output_path = f"tbd/{filename}.pdf"
-    temp_overlay = f"tbd/temp_{filename}.pdf"
+def get_template_form(page: PageObject) -> IndirectObject:
+    """Return the writer's reference to the template form drawn by 'page'."""
+    x_objects = page[NameObject("/Resources")][NameObject("/XObject")]
+    return x_objects.raw_get(NameObject("/Template"))
 
-    reader = PdfReader(template_path)
-    page = reader.pages[0]
-    width_points = float(page.mediabox.width)
-    height_points = float(page.mediabox.height)
 
-    c = canvas.Canvas(temp_overlay, pagesize=(width_points, height_points))
-    main_deck = deck_data.get("main_deck", {})
-    reserve = deck_data.get("reserve", {})
+def render_decklist_overlay(
+    deck_type: str, deck_data, width_points: float, height_points: float
+) -> BytesIO:
+    """
+    Draw the card listings, section counts and total card count for a deck
+    check sheet into an in-memory PDF.
+    """
+    overlay = BytesIO()
+    c = canvas.Canvas(overlay, pagesize=(width_points, height_points))
+    deck_sections = get_deck_sections(deck_data)
 
     if deck_type == "type_1":
         section_mappings = {
@@ -208,180 +312,30 @@ def generate_decklist(deck_type: str, deck_data, filename: str):
             },
         }
 
-    # Draw card listings
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "Dominant",
-        x=section_mappings["lists"]["Dominant"]["x"],
-        y=section_mappings["lists"]["Dominant"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "Hero",
-        x=section_mappings["lists"]["Hero"]["x"],
-        y=section_mappings["lists"]["Hero"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "GE",
-        x=section_mappings["lists"]["GE"]["x"],
-        y=section_mappings["lists"]["GE"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "Lost Soul",
-        x=section_mappings["lists"]["Lost Soul"]["x"],
-        y=section_mappings["lists"]["Lost Soul"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "Evil Character",
-        x=section_mappings["lists"]["Evil Character"]["x"],
-        y=section_mappings["lists"]["Evil Character"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "EE",
-        x=section_mappings["lists"]["EE"]["x"],
-        y=section_mappings["lists"]["EE"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        ["Artifact", "Covenant", "Curse"],
-        x=section_mappings["lists"]["Artifact"]["x"],
-        y=section_mappings["lists"]["Artifact"]["y"],
-    )
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        ["Fortress", "Site", "City"],
-        x=section_mappings["lists"]["Fortress"]["x"],
-        y=section_mappings["lists"]["Fortress"]["y"],
-    )
-
-    # Misc section (cards not fitting other types)
-    place_section_by_type(
-        c,
-        main_deck,
-        height_points,
-        "misc",
-        x=section_mappings["lists"]["Misc"]["x"],
-        y=section_mappings["lists"]["Misc"]["y"],
-    )
-    # Reserve section (without quantity)
-    place_section_by_type(
-        c,
-        reserve,
-        height_points,
-        card_types="all",
-        x=section_mappings["lists"]["Reserve"]["x"],
-        y=section_mappings["lists"]["Reserve"]["y"],
-        add_quantity=False,
-    )
-
-    # Draw section counts (numbers only; positions are fully controlled)
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Dominant",
-        x=section_mappings["numbers"]["Dominant"]["x"],
-        y=section_mappings["numbers"]["Dominant"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Hero",
-        x=section_mappings["numbers"]["Hero"]["x"],
-        y=section_mappings["numbers"]["Hero"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "GE",
-        x=section_mappings["numbers"]["GE"]["x"],
-        y=section_mappings["numbers"]["GE"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Lost Soul",
-        x=section_mappings["numbers"]["Lost Soul"]["x"],
-        y=section_mappings["numbers"]["Lost Soul"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Evil Character",
-        x=section_mappings["numbers"]["Evil Character"]["x"],
-        y=section_mappings["numbers"]["Evil Character"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "EE",
-        x=section_mappings["numbers"]["EE"]["x"],
-        y=section_mappings["numbers"]["EE"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        ["Artifact", "Covenant", "Curse"],
-        x=section_mappings["numbers"]["Artifact"]["x"],
-        y=section_mappings["numbers"]["Artifact"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        ["Fortress", "Site", "City"],
-        x=section_mappings["numbers"]["Fortress"]["x"],
-        y=section_mappings["numbers"]["Fortress"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "misc",
-        x=section_mappings["numbers"]["Misc"]["x"],
-        y=section_mappings["numbers"]["Misc"]["y"],
-    )
-    draw_count(
-        c,
-        reserve,
-        height_points,
-        card_types="all",
-        x=section_mappings["numbers"]["Reserve"]["x"],
-        y=section_mappings["numbers"]["Reserve"]["y"],
-    )
+    # Draw card listings, then the section counts (numbers only; positions are
+    # fully controlled). The reserve is listed without quantities.
+    for section_name, position in section_mappings["lists"].items():
+        place_section(
+            c,
+            deck_sections.sections[section_name],
+            x=position["x"],
+            y=height_points - position["y"],
+            add_quantity=section_name != RESERVE_SECTION,
+        )
+    for section_name, position in section_mappings["numbers"].items():
+        draw_count(
+            c,
+            deck_sections.sections[section_name].count,
+            x=position["x"],
+            y=height_points - position["y"],
+        )
 
     # Draw total card count in the top right corner
     box_width = 50
     box_height = 30
     right_margin = 41
     top_margin = 97
-    total_main = sum(int(card.get("quantity", 1)) for card in main_deck.values())
+    total_main = deck_sections.total_main
     c.setFont("Helvetica-Bold", 18)  # Changed from 14 to 18
     c.drawString(
         width_points - right_margin - box_width + 5,
@@ -389,68 +343,201 @@ def generate_decklist(deck_type: str, deck_data, filename: str):
         f"{total_main}",
     )
 
-    # Draw good count
+    # Draw good, evil and neutral counts
     box_width = 50
     box_height = 30
     right_margin = 85
-    top_margin = 29
-    total_good = 0
-    for card in main_deck.values():
-        if card.get("alignment") == "Good":
-            total_good += card.get("quantity")
+    alignment_margins = {"Good": 29, "Evil": 42, "Neutral": 53}
     c.setFont("Helvetica", 10)  # Changed from 18 to 10
-    c.drawString(
-        width_points - right_margin - box_width + 5,
-        height_points - top_margin - box_height + 10,
-        f"Good Count: {total_good}",
-    )
-
-    # Draw evil count
-    box_width = 50
-    box_height = 30
-    right_margin = 85
-    top_margin = 42
-    total_evil = 0
-    for card in main_deck.values():
-        if card.get("alignment") == "Evil":
-            total_evil += card.get("quantity")
-    c.setFont("Helvetica", 10)  # Changed from 18 to 10
-    c.drawString(
-        width_points - right_margin - box_width + 5,
-        height_points - top_margin - box_height + 10,
-        f"Evil Count: {total_evil}",
-    )
-
-    # Draw neutral count
-    box_width = 50
-    box_height = 30
-    right_margin = 85
-    top_margin = 53
-    total_neutral = 0
-    for card in main_deck.values():
-        if card.get("alignment") == "Neutral":
-            total_neutral += card.get("quantity")
-    c.setFont("Helvetica", 10)  # Changed from 18 to 10
-    c.drawString(
-        width_points - right_margin - box_width + 5,
-        height_points - top_margin - box_height + 10,
-        f"Neutral Count: {total_neutral}",
-    )
+    for alignment, top_margin in alignment_margins.items():
+        c.drawString(
+            width_points - right_margin - box_width + 5,
+            height_points - top_margin - box_height + 10,
+            f"{alignment} Count: {deck_sections.alignment_counts[alignment]}",
+        )
 
     c.showPage()
     c.save()
+    return overlay
+
+
+def render_check_sheet_overlay(deck_type: str, deck_data) -> BytesIO:
+    """Draw a deck's overlay sized to the page of its check sheet template."""
+    template_page = load_template(TEMPLATE_PATHS[deck_type])
+    width_points, height_points = get_page_size(template_page)
+    return render_decklist_overlay(deck_type, deck_data, width_points, height_points)
+
+
+def write_template_pages(template_path: str, overlays, output_path: str) -> int:
+    """
+    Write one page per overlay, each drawn over the same template, into one PDF.
+
+    Every page draws the same template form, so the template's fonts and images
+    are stored once no matter how many decks are in the file. Overlays are read
+    as they arrive from the iterable, but PyPDF2 writes the whole file in one
+    go at the end, so every page stays in memory until then: the template once
+    plus a few KB of compressed overlay per deck.
+
+    Args:
+        template_path (str): Path of the template PDF
+        overlays (Iterable[BytesIO]): Overlays sized to the template page
+        output_path (str): Path of the PDF to write
+
+    Returns:
+        int: The number of pages written
+    """
+    template_page = load_template(template_path)
+    page_size = get_page_size(template_page)
 
-    overlay_pdf = PdfReader(temp_overlay)
-    if overlay_pdf.pages:
-        page.merge_page(overlay_pdf.pages[0])
     writer = PdfWriter()
-    writer.add_page(page)
+    template_form = page_to_form(template_page)
+    n_pages = 0
+    for overlay in overlays:
+        page = add_template_page(
+            writer, template_form, read_overlay(overlay), page_size
+        )
+        # Later pages share the form the first page added to the writer
+        template_form = get_template_form(page)
+        n_pages += 1
+
     with open(output_path, "wb") as f:
         writer.write(f)
+    return n_pages
+
+
+def write_check_sheets(deck_type: str, overlays, output_path: str) -> int:
+    """Write one check sheet page per overlay from render_check_sheet_overlay."""
+    return write_template_pages(TEMPLATE_PATHS[deck_type], overlays, output_path)
+
+
+def generate_decklist(deck_type: str, deck_data, filename: str):
+    """
+    Generate a deck check sheet overlay with card listings, section counts,
+    and a total card count.
+
+    Args:
+        deck_type (str): The type of deck check sheet ('type_1' or 'type_2')
+        deck_data (dict): The deck data containing main_deck and reserve
+        filename (str): Name for the output file (without extension)
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs("tbd", exist_ok=True)
+
+    # Use dynamic filename for output
+    output_path = f"tbd/{filename}.pdf"
+
+    overlay = render_check_sheet_overlay(deck_type, deck_data)
+    write_check_sheets(deck_type, [overlay], output_path)
+
+
+def fit_font_size(text: str, max_width: float, font="Helvetica", font_size=12):
+    """Shrink the font size until the text fits in max_width, down to a minimum."""
+    while (
+        font_size > RESERVE_MIN_FONT_SIZE
+        and stringWidth(text, font, font_size) > max_width
+    ):
+        font_size -= 1
+    return font_size
+
+
+def layout_reserve_list(reserve_data) -> list[tuple[float, float, int, str]]:
+    """
+    Place each reserve card on its own numbered line of a reserve slip.
+
+    Cards are sorted by name and every copy gets a line, so the line number
+    matches the card count. Positions are relative to the first line.
+
+    Returns:
+        list: (x, y, font_size, text) for every line of the slip
+    """
+    card_names = [
+        clean_card_name(card_name, card_data)
+        for card_name, card_data in sorted(reserve_data.items())
+        for _ in range(card_data.get("quantity", 1))
+    ]
+    if len(card_names) > RESERVE_LIST_SIZE:
+        raise ValueError(
+            f"Reserve list contains {len(card_names)} cards. "
+            f"Maximum allowed is {RESERVE_LIST_SIZE}."
+        )
+    return [
+        (
+            0,
+            -n * RESERVE_LINE_SPACING,
+            fit_font_size(card_name, RESERVE_LINE_WIDTH),
+            card_name,
+        )
+        for n, card_name in enumerate(card_names)
+    ]
+
+
+def get_reserve_template_path(deck_type: str) -> str:
+    """Raises ValueError if there is no reserve list template for 'deck_type'."""
+    if deck_type not in RESERVE_TEMPLATE_PATHS:
+        raise ValueError(f"No reserve list template for {deck_type} decks.")
+    return RESERVE_TEMPLATE_PATHS[deck_type]
+
+
+def render_reserve_list_overlay(deck_type: str, reserve_data) -> BytesIO:
+    """
+    Draw the reserve onto every slip of the deck type's reserve list template.
+
+    The slip is laid out once as a form and stamped into each cell of the grid.
+    """
+    template_page = load_template(get_reserve_template_path(deck_type))
+    overlay = BytesIO()
+    c = canvas.Canvas(overlay, pagesize=get_page_size(template_page))
+
+    # Lines run down from the first one, so the form's box extends below zero
+    c.beginForm(
+        "reserve_slip",
+        lowery=-RESERVE_SLIP_HEIGHT,
+        upperx=RESERVE_SLIP_WIDTH,
+        uppery=RESERVE_LINE_SPACING,
+    )
+    for x, y, font_size, text in layout_reserve_list(reserve_data):
+        c.setFont("Helvetica", font_size)
+        c.drawString(x, y, text)
+    c.endForm()
+
+    first_x, first_y = RESERVE_FIRST_LINE
+    for row in range(RESERVE_SLIP_ROWS):
+        for col in range(RESERVE_SLIP_COLUMNS):
+            c.saveState()
+            c.translate(
+                first_x + col * RESERVE_SLIP_WIDTH, first_y - row * RESERVE_SLIP_HEIGHT
+            )
+            c.doForm("reserve_slip")
+            c.restoreState()
+
+    c.showPage()
+    c.save()
+    return overlay
+
+
+def write_reserve_lists(deck_type: str, overlays, output_path: str) -> int:
+    """Write one reserve list page per overlay from render_reserve_list_overlay."""
+    return write_template_pages(
+        get_reserve_template_path(deck_type), overlays, output_path
+    )
 
-    # Clean up temp file
-    if os.path.exists(temp_overlay):
-        os.remove(temp_overlay)
+
+def generate_reserve_list(deck_type: str, reserve_data, filename: str):
+    """
+    Generate a reserve list sheet with the reserve written on every slip.
+
+    Args:
+        deck_type (str): The type of deck ('type_1', the only one with a reserve
+            list template)
+        reserve_data (dict): The deck's reserve
+        filename (str): Name for the output file (without extension)
+    """
+    os.makedirs("tbd", exist_ok=True)
+    output_path = f"tbd/{filename}.pdf"
+    write_reserve_lists(
+        deck_type, [render_reserve_list_overlay(deck_type, reserve_data)], output_path
+    )
+    print(f"Reserve list generated: {output_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import os
+from collections import OrderedDict
+
+import PIL.Image as Image
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class TileCache:
+    """
+    In-process LRU cache of decoded card images, keyed by image file and size.
+
+    Tiles are kept as RGB images until the memory budget is reached, at which
+    point the least recently used tiles are dropped. If 'cache_dir' is set,
+    resized tiles are also written there so later runs can skip the resize.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: str = None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+
+    @staticmethod
+    def _tile_bytes(tile: Image.Image) -> int:
+        return tile.width * tile.height * len(tile.getbands())
+
+    def _disk_path(self, image_path: str, size: tuple) -> str:
+        base_name = os.path.splitext(os.path.basename(image_path))[0]
+        return os.path.join(self.cache_dir, f"{base_name}_{size[0]}x{size[1]}.png")
+
+    def _load_from_disk(self, image_path: str, size: tuple) -> Image.Image:
+        """Return a cached resized tile if it is newer than its source image."""
+        if not self.cache_dir or size is None:
+            return None
+        disk_path = self._disk_path(image_path, size)
+        if not os.path.exists(disk_path) or os.path.getmtime(
+            disk_path
+        ) < os.path.getmtime(image_path):
+            return None
+        with Image.open(disk_path) as tile:
+            return tile.convert("RGB")
+
+    def _save_to_disk(self, image_path: str, size: tuple, tile: Image.Image):
+        if not self.cache_dir or size is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tile.save(self._disk_path(image_path, size), format="PNG", compress_level=1)
+
+    def _decode(self, image_path: str, size: tuple) -> Image.Image:
+        with Image.open(image_path) as image:
+            tile = image.convert("RGB")
+        if size is not None and tile.size != size:
+            tile = tile.resize(size, Image.LANCZOS)
+            self._save_to_disk(image_path, size, tile)
+        return tile
+
+    def get(self, image_path: str, size: tuple = None) -> Image.Image:
+        """
+        Return the decoded RGB tile for 'image_path', resized to 'size' if given.
+
+        Raises FileNotFoundError if the image does not exist.
+        """
+        key = (image_path, size)
+        if key in self._tiles:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+
+        self.misses += 1
+        tile = self._load_from_disk(image_path, size)
+        if tile is None:
+            tile = self._decode(image_path, size)
+        tile_bytes = self._tile_bytes(tile)
+        if tile_bytes <= self.max_bytes:
+            self._tiles[key] = tile
+            self.current_bytes += tile_bytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._tiles.popitem(last=False)
+                self.current_bytes -= self._tile_bytes(evicted)
+        return tile
+
+    def clear(self):
+        self._tiles.clear()
+        self.current_bytes = 0
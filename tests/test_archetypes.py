@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from src.m_count.archetypes import (
+    MinHasher,
+    PairScorer,
+    get_exact_pairs,
+    get_similar_pairs,
+    get_similarity,
+)
+
+
+def get_vectors(n_vectors: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    bases = [
+        {card_id: rng.randint(1, 4) for card_id in rng.sample(range(300), 25)}
+        for _ in range(5)
+    ]
+    vectors = []
+    for _ in range(n_vectors):
+        vector = dict(rng.choice(bases))
+        for _ in range(rng.randint(0, 10)):
+            vector.pop(rng.choice(list(vector)))
+            vector[rng.randrange(300)] = rng.randint(1, 3)
+        vectors.append(vector)
+    return vectors
+
+
+@pytest.mark.parametrize("metric", ["jaccard", "cosine"])
+def test_pair_scorer_matches_dict_similarity(metric):
+    vectors = get_vectors(30) + [{}]
+    scorer = PairScorer(vectors, metric)
+    pairs = [(i, j) for i in range(len(vectors)) for j in range(i + 1, len(vectors))]
+    scored = {(i, j): s for i, j, s in scorer.get_similar_pairs(pairs, 0.0)}
+    for i, j in pairs:
+        similarity = get_similarity(vectors[i], vectors[j], metric)
+        assert scored.get((i, j), 0.0) == pytest.approx(similarity)
+
+
+def test_exact_pairs_find_every_similar_pair():
+    vectors = get_vectors(60)
+    expected = {
+        (i, j)
+        for i in range(len(vectors))
+        for j in range(i + 1, len(vectors))
+        if get_similarity(vectors[i], vectors[j], "jaccard") >= 0.3
+    }
+    assert {(i, j) for i, j, _ in get_exact_pairs(vectors, 0.3, "jaccard")} == (
+        expected
+    )
+
+
+def test_minhash_pairs_are_a_subset_of_exact_pairs(monkeypatch):
+    monkeypatch.setattr("src.m_count.archetypes.MINHASH_MIN_VECTORS", 0)
+    vectors = get_vectors(200)
+    exact = {(i, j) for i, j, _ in get_exact_pairs(vectors, 0.3, "jaccard")}
+    found = {(i, j) for i, j, _ in get_similar_pairs(vectors, 0.3, "jaccard")}
+    assert found <= exact
+    assert len(found) >= 0.95 * len(exact)
+
+
+def test_minhash_keeps_large_quantities_apart():
+    # With the copy number in 8 bits, copy 256 of card 0 was card 1's first copy
+    min_hasher = MinHasher()
+    assert min_hasher.signature({0: 257}) != min_hasher.signature({0: 256, 1: 1})
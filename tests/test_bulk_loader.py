@@ -0,0 +1,55 @@
+import zipfile
+
+import pytest
+
+from src.m_count.bulk_loader import load_decks
+
+TXT_DECK = b"1\tSon of God (2016 Promo)\r\n2\tThree Woes [Fundraiser]\r\nReserve:\r\n"
+DEK_DECK = (
+    b'<deck><superzone name="Deck">'
+    b"<card><name>Son of God (2016 Promo)</name></card>"
+    b"</superzone></deck>"
+)
+DECK_FILES = {
+    "good.txt": TXT_DECK,
+    "nested/good.dek": DEK_DECK,
+    "empty.txt": b"Reserve:\r\n1\tSon of God (2016 Promo)\r\n",
+    "broken.dek": b"<deck><superzone",
+    "notes.md": b"not a deck",
+}
+
+
+@pytest.fixture
+def deck_folder(tmp_path):
+    for name, contents in DECK_FILES.items():
+        path = tmp_path / "decks" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(contents)
+    return str(tmp_path / "decks")
+
+
+@pytest.fixture
+def deck_zip(tmp_path):
+    path = tmp_path / "decks.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, contents in DECK_FILES.items():
+            archive.writestr(name, contents)
+        archive.writestr("__MACOSX/._good.txt", b"\x00\x05")
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("source", ["deck_folder", "deck_zip"])
+def test_bad_decks_are_reported_and_skipped(source, workers, request):
+    errors = []
+    decks = list(load_decks(request.getfixturevalue(source), workers, errors))
+
+    assert [deck.name for deck in decks] == ["good", "good"]
+    assert [deck.deck_size for deck in decks] == [3, 1]
+    assert [entry_name for entry_name, _ in errors] == ["broken.dek", "empty.txt"]
+    assert isinstance(errors[1][1], AssertionError)
+
+
+def test_missing_path_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(load_decks(str(tmp_path / "missing")))
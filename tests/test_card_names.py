@@ -0,0 +1,95 @@
+import pytest
+
+from src.utilities.card_names import (
+    CardNameIndex,
+    changes_number,
+    edit_distance,
+    load_card_name_index,
+    normalize_card_name,
+)
+
+CARD_DATA_PATH = "data/carddata/carddata.txt"
+
+
+@pytest.fixture(scope="module")
+def card_name_index():
+    return load_card_name_index(CARD_DATA_PATH)
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("", "abc"),
+        ("kitten", "sitting"),
+        ("samson", "samsonn"),
+        ("fifth bowl of wrath", "sixth bowl of wrath"),
+        ("lost soul ecclesiastes 10 3", "lost soul ecclesiastes 10 15"),
+    ],
+)
+def test_edit_distance_matches_dynamic_programming(a, b):
+    rows = [list(range(len(b) + 1))]
+    for i, char_a in enumerate(a, start=1):
+        row = [i]
+        for j, char_b in enumerate(b, start=1):
+            row.append(
+                min(row[-1] + 1, rows[-1][j] + 1, rows[-1][j - 1] + (char_a != char_b))
+            )
+        rows.append(row)
+    assert edit_distance(a, b) == rows[-1][-1]
+
+
+def test_normalize_card_name_ignores_quotes_and_brackets():
+    assert normalize_card_name("Lost Soul “Fool” [Ecclesiastes 10:3]") == (
+        normalize_card_name('Lost Soul "Fool" (Ecclesiastes 10:3)')
+    )
+    assert normalize_card_name("God’s Provision") == "gods provision"
+
+
+def test_changes_number():
+    assert changes_number("sixth bowl of wrath", "fifth bowl of wrath")
+    assert changes_number("lost soul ecclesiastes 10 3", "lost soul ecclesiastes 10 5")
+    assert not changes_number("samsonn (j)", "samson (j)")
+
+
+@pytest.mark.parametrize(
+    "card_name, resolved_name",
+    [
+        ("Gods Provision", "God's Provision"),
+        ("god’s provision", "God's Provision"),
+        ("Samsonn (J)", "Samson (J)"),
+        ("Lost Soul Ecclesiastes 10:3", "Lost Soul Ecclesiastes 10:3"),
+    ],
+)
+def test_resolve_exact_keys_and_single_typos(card_name_index, card_name, resolved_name):
+    assert card_name_index.resolve(card_name) == resolved_name
+
+
+def test_resolve_leaves_ambiguous_base_names_unresolved(card_name_index):
+    # Every printing of Son of God has the same name without its set suffix
+    assert card_name_index.resolve("Son of God") is None
+    assert card_name_index.suggest("Son of God")[0][1] == 1.0
+
+
+@pytest.mark.parametrize(
+    "card_name, near_miss",
+    [
+        ("Sixth Bowl of Wrath (RoJ)", "Fifth Bowl of Wrath (RoJ)"),
+        ("The Sixth Trumpet", "The Fifth Trumpet"),
+        ("Ithamar", "Eleazar Son of Aaron"),
+        ("Plague of Boils (LoC)", "Plague of Flies (LoC)"),
+        ("Lost Soul Ecclesiastes 10:3", "Lost Soul Ecclesiastes 10:15"),
+        ("Lost Soul Ecclesiastes 10:3", "Lost Soul Ecclesiastes 10:5"),
+        ("Egyptian Charioteers", "Egyptian Chariots"),
+        ("Faith of Sarah", "Faith of Barak"),
+    ],
+)
+def test_resolve_never_picks_a_different_card(card_name, near_miss):
+    # The index holds only the near miss, as when a card is newer than the data
+    card_name_index = CardNameIndex([near_miss])
+    assert card_name_index.resolve(card_name) is None
+
+
+def test_near_misses_are_still_suggested():
+    card_name_index = CardNameIndex(["Fifth Bowl of Wrath (RoJ)", "Faith of Barak"])
+    suggestions = card_name_index.suggest("Sixth Bowl of Wrath (RoJ)")
+    assert suggestions[0][0] == "Fifth Bowl of Wrath (RoJ)"
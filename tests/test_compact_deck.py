@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from src.m_count.card_catalog import load_card_catalog
+from src.m_count.compact_deck import MAIN_DECK, RESERVE, CompactDeck
+from src.m_count.decklist import Decklist, parse_txt_lines
+
+DECKLIST_FOLDER = Path(__file__).resolve().parents[1] / "data" / "decklists"
+DECK_PATHS = sorted(str(path) for path in DECKLIST_FOLDER.glob("*.txt"))[:5]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_card_catalog()
+
+
+@pytest.mark.parametrize("deck_path", DECK_PATHS)
+def test_compact_deck_matches_decklist(deck_path, catalog, monkeypatch):
+    # Decklist writes debugging JSON files to the working directory
+    monkeypatch.setattr(Decklist, "_save_json", lambda *args: None)
+    decklist = Decklist(deck_path)
+    with open(deck_path, encoding="utf-8") as file:
+        main_deck_list, reserve_list, _ = parse_txt_lines(file)
+
+    deck = CompactDeck.from_card_lists("deck", main_deck_list, reserve_list, catalog)
+    assert deck == CompactDeck.from_decklist("other name", decklist, catalog)
+    assert deck.deck_size == decklist.deck_size
+    assert deck.reserve_size == decklist.reserve_size
+    assert {
+        catalog.get_name(card_id): quantity
+        for card_id, quantity in deck.iter_cards(MAIN_DECK)
+    } == {
+        card_name: card["quantity"]
+        for card_name, card in decklist.mapped_main_deck_list.items()
+    }
+
+
+def test_card_order_and_repeats_do_not_change_the_deck(catalog):
+    main_deck_list = [
+        {"quantity": 1, "name": "Son of God (2016 Promo)"},
+        {"quantity": 2, "name": "Three Woes [Fundraiser]"},
+    ]
+    deck = CompactDeck.from_card_lists("a", main_deck_list, [], catalog)
+    shuffled = CompactDeck.from_card_lists(
+        "b",
+        [
+            {"quantity": 1, "name": "Three Woes [Fundraiser]"},
+            {"quantity": 1, "name": "Son of God (2016 Promo)"},
+            {"quantity": 1, "name": "Three Woes [Fundraiser]"},
+        ],
+        [],
+        catalog,
+    )
+    assert deck == shuffled
+    assert hash(deck) == hash(shuffled)
+    assert len({deck, shuffled}) == 1
+
+
+def test_zones_and_unresolved_cards(catalog):
+    deck = CompactDeck.from_card_lists(
+        "deck",
+        [{"quantity": 1, "name": "Son of God (2016 Promo)"}],
+        [
+            {"quantity": 1, "name": "Son of God (2016 Promo)"},
+            {"quantity": 1, "name": "Not A Real Card"},
+        ],
+        catalog,
+    )
+    assert deck != CompactDeck.from_card_lists(
+        "deck", [{"quantity": 2, "name": "Son of God (2016 Promo)"}], [], catalog
+    )
+    assert deck.get_counts(RESERVE) == deck.get_counts(MAIN_DECK)
+    assert deck.unresolved_cards == ("Not A Real Card",)
+    main_deck_list, reserve_list = deck.to_card_lists(catalog)
+    assert main_deck_list == [{"quantity": 1, "name": "Son of God (2016 Promo)"}]
+    assert reserve_list == main_deck_list
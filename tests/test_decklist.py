@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+from src.m_count.decklist import iter_dek_decks, parse_dek_file, parse_txt_lines
+
+DEK = b"""<?xml version="1.0" encoding="UTF-8"?>
+<deck version="0.8">
+  <meta><game>redemption</game></meta>
+  <superzone name="Deck">
+    <card><name id="1">Son of God</name><set>Pri</set></card>
+    <card><name id="2">Moses\xe2\x80\x99 Staff</name><set>Roots</set></card>
+    <card><name id="1">Son of God</name><set>Pri</set></card>
+    <card><name id="3">Lost Soul "Hopper" [II Chronicles 28:13]</name><set>S</set></card>
+  </superzone>
+  <superzone name="Reserve">
+    <card><name id="4">Three Woes</name><set>S</set></card>
+  </superzone>
+  <superzone name="Tokens">
+    <card><name id="5">Token</name><set>S</set></card>
+  </superzone>
+</deck>
+"""
+
+
+def test_dek_cards_are_counted_per_zone():
+    main_deck_list, reserve_list = parse_dek_file(io.BytesIO(DEK))
+    assert main_deck_list == [
+        {"quantity": 2, "name": "Son of God"},
+        {"quantity": 1, "name": "Moses' Staff"},
+        {"quantity": 1, "name": 'Lost Soul "Hopper" [II Chronicles 28:13]'},
+    ]
+    assert reserve_list == [{"quantity": 1, "name": "Three Woes"}]
+
+
+def test_dek_files_with_several_decks_yield_each_deck():
+    decks = DEK.replace(b'<?xml version="1.0" encoding="UTF-8"?>\n', b"")
+    collection = (
+        b"<decks>" + decks + decks.replace(b"Son of God", b"Moses") + (b"</decks>")
+    )
+    (first, _), (second, _) = iter_dek_decks(io.BytesIO(collection))
+    assert first[0] == {"quantity": 2, "name": "Son of God"}
+    assert second[0] == {"quantity": 2, "name": "Moses"}
+
+
+def test_dek_without_main_deck_cards_is_rejected():
+    with pytest.raises(AssertionError):
+        parse_dek_file(io.BytesIO(b'<deck><superzone name="Deck"/></deck>'))
+
+
+def test_dek_matches_the_equivalent_txt_deck():
+    txt_lines = [
+        "2\tSon of God",
+        "1\tMoses’ Staff",
+        '1\tLost Soul "Hopper" [II Chronicles 28:13]',
+        "Reserve:",
+        "1\tThree Woes",
+        "Tokens:",
+        "1\tToken",
+    ]
+    main_deck_list, reserve_list, has_reserve = parse_txt_lines(txt_lines)
+    assert has_reserve
+    assert (main_deck_list, reserve_list) == parse_dek_file(io.BytesIO(DEK))
@@ -0,0 +1,106 @@
+import os
+import random
+import sys
+
+import PIL.Image as Image
+import pytest
+
+from src.utilities.image_optimizer import (
+    TargetSizeOptimizer,
+    TinifyOptimizer,
+    get_optimizer,
+    optimize_images,
+)
+
+
+class StubTinifyError(Exception):
+    pass
+
+
+class StubSource:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def to_file(self, path: str):
+        with open(path, "wb") as file:
+            file.write(self.data)
+
+
+class StubTinify:
+    """Stands in for the tinify module: compresses every file to 'data'."""
+
+    def __init__(self, data: bytes = b"tiny", error: Exception = None):
+        self.key = None
+        self.data = data
+        self.error = error
+        self.paths = []
+
+    def from_file(self, path: str) -> StubSource:
+        self.paths.append(path)
+        if self.error:
+            raise self.error
+        return StubSource(self.data)
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    rng = random.Random(0)
+    paths = []
+    for extension in [".webp", ".png"]:
+        # Noise compresses badly, so the encoder setting decides the file size
+        image = Image.frombytes("RGB", (200, 200), rng.randbytes(200 * 200 * 3))
+        path = str(tmp_path / f"deck{extension}")
+        image.save(path, quality=100)
+        paths.append(path)
+    return paths
+
+
+def test_tinify_compresses_every_image(image_paths, monkeypatch):
+    monkeypatch.setenv("TINIFY_API_KEY", "env-key")
+    client = StubTinify()
+    results = optimize_images(image_paths, TinifyOptimizer(client=client), workers=2)
+
+    assert client.key == "env-key"
+    assert sorted(client.paths) == sorted(image_paths)
+    assert [result.path for result in results] == image_paths
+    for result in results:
+        assert result.optimized_bytes == len(b"tiny")
+        assert result.bytes_saved == result.original_bytes - len(b"tiny")
+
+
+def test_tinify_failure_is_raised_and_keeps_the_image(image_paths):
+    original = open(image_paths[0], "rb").read()
+    client = StubTinify(error=StubTinifyError("Credentials are invalid"))
+
+    with pytest.raises(StubTinifyError):
+        optimize_images(image_paths[:1], TinifyOptimizer("bad-key", client=client))
+    assert client.key == "bad-key"
+    assert open(image_paths[0], "rb").read() == original
+
+
+def test_tinify_without_the_package_raises_import_error(monkeypatch):
+    # A None entry makes the import fail whether or not tinify is installed
+    monkeypatch.setitem(sys.modules, "tinify", None)
+    with pytest.raises(ImportError, match="pip install tinify"):
+        TinifyOptimizer()
+
+
+@pytest.mark.parametrize("target_kb", [20, 30])
+def test_target_size_lands_under_the_target(image_paths, target_kb):
+    results = optimize_images(image_paths, get_optimizer("target-size", target_kb))
+    for result in results:
+        assert result.optimized_bytes <= target_kb * 1024
+        assert result.optimized_bytes < result.original_bytes
+
+
+def test_target_size_keeps_the_smallest_encoding_when_out_of_reach(image_paths):
+    (result,) = optimize_images(image_paths[:1], TargetSizeOptimizer(1024))
+    assert 1024 < result.optimized_bytes < result.original_bytes
+
+
+def test_target_size_never_grows_the_image(image_paths):
+    with Image.open(image_paths[0]) as image:
+        image.save(image_paths[0], quality=1)
+    size = os.path.getsize(image_paths[0])
+    (result,) = optimize_images(image_paths[:1], TargetSizeOptimizer(1024 * 1024))
+    assert result.optimized_bytes == size
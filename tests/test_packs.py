@@ -0,0 +1,119 @@
+import pytest
+
+from src.flows.get_packs import (
+    PACK_DISTRIBUTIONS,
+    PackGenerator,
+    iter_chunks,
+    load_pack_distributions,
+    simulate_chunk,
+)
+from src.utilities.tools import load_card_data
+
+CARD_DATA = {
+    f"{card_set} {rarity} {n}": {"OfficialSet": card_set, "Rarity": rarity}
+    for card_set, rarity, n_cards in [
+        ("Roots", "Common", 10),
+        ("Roots", "Rare", 2),
+        ("Kings", "Common", 4),
+    ]
+    for n in range(n_cards)
+}
+
+
+def test_pools_group_card_indices_by_set_and_rarity():
+    generator = PackGenerator(CARD_DATA, {})
+    for (card_set, rarity), pool in generator.pools.items():
+        for index in pool:
+            card = generator.cards[index]
+            assert card["OfficialSet"] == card_set
+            assert rarity is None or card["Rarity"] == rarity
+    assert len(generator.pools[("Roots", "Rare")]) == 2
+    assert len(generator.pools[("Roots", None)]) == 12
+
+
+def test_rare_indices_are_found_once_per_generator():
+    generator = PackGenerator(CARD_DATA, {})
+    assert generator.rare_indices == set(generator.pools[("Roots", "Rare")])
+
+
+def test_packs_only_draw_from_their_slot_pools():
+    distributions = {
+        "Roots": [
+            {"set": "Roots", "count": 1, "rarity_weights": {"Rare": 1}},
+            {"set": "Kings", "count": 4},
+        ]
+    }
+    generator = PackGenerator(CARD_DATA, distributions)
+    for _ in range(100):
+        rare, *kings = generator.get_pack("Roots")
+        assert rare == {"OfficialSet": "Roots", "Rarity": "Rare"}
+        assert len(kings) == 4
+        assert all(card["OfficialSet"] == "Kings" for card in kings)
+
+
+def test_pack_distributions_compile_against_the_card_data():
+    generator = PackGenerator(load_card_data())
+    assert set(generator.slots) == set(PACK_DISTRIBUTIONS)
+    for set_name, slots in PACK_DISTRIBUTIONS.items():
+        pack = generator.draw_pack_indices(set_name)
+        assert len(pack) == sum(slot["count"] for slot in slots)
+
+
+def test_missing_pack_folder_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_pack_distributions(tmp_path / "missing")
+
+
+def test_invalid_slots_are_all_reported():
+    distributions = {
+        "Bad": [
+            {"set": "Roots", "count": 5},
+            {"set": "Unknown", "count": 1},
+            {"set": "Roots", "count": 0},
+            {"set": "Roots", "count": 1, "rarity_weights": {"Ultra Rare": 1}},
+            {"set": "Roots", "count": 1, "rarity_weights": {"Rare": 0}},
+            {"set": "Kings", "count": 5},
+        ]
+    }
+    with pytest.raises(ValueError) as error:
+        PackGenerator(CARD_DATA, distributions)
+    message = str(error.value)
+    assert "slot 1" not in message
+    for expected in [
+        "Bad slot 2: no cards in Unknown",
+        "Bad slot 3: count must be positive",
+        "Bad slot 4: no Ultra Rare cards in Roots",
+        "Bad slot 5: weight of Rare must be positive",
+        "Bad slot 6: draws 5 cards from 4",
+    ]:
+        assert expected in message
+
+
+def test_weighted_slots_draw_distinct_cards():
+    distributions = {
+        "Roots": [
+            {"set": "Roots", "count": 3, "rarity_weights": {"Common": 1, "Rare": 5}}
+        ]
+    }
+    generator = PackGenerator(CARD_DATA, distributions)
+    for _ in range(100):
+        pack = generator.draw_pack_indices("Roots")
+        assert len(set(pack)) == 3
+
+
+def get_seeded_simulations(workers: int) -> list:
+    pack_weight = {set_name: 2 for set_name in PACK_DISTRIBUTIONS}
+    return [
+        simulation
+        for chunk in iter_chunks(
+            simulate_chunk, 25, pack_weight, seed=7, workers=workers, chunk_size=4
+        )
+        for simulation in chunk
+    ]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_seeded_packs_do_not_depend_on_workers(workers):
+    expected = get_seeded_simulations(workers=1)
+    assert len(expected) == 25
+    assert get_seeded_simulations(workers) == expected
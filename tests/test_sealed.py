@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from src.flows.get_packs import PACK_DISTRIBUTIONS
+from src.flows.get_sealed import SIMULATION_SETTINGS, get_sealed_statistics
+from src.m_count.spectrograph_simulation import SpectrographSimulation
+
+PACK_WEIGHT = {next(iter(PACK_DISTRIBUTIONS)): 6}
+
+
+def get_seeded_m_counts(workers: int) -> list:
+    statistics = get_sealed_statistics(
+        6, PACK_WEIGHT, seed=3, workers=workers, n_hands=20, chunk_size=2
+    )
+    return statistics.m_counts
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_seeded_pools_do_not_touch_the_global_random(workers):
+    random.seed(1)
+    state = random.getstate()
+    expected = get_seeded_m_counts(workers=1)
+    assert random.getstate() == state
+
+    # Draws from the global random between runs do not change the results
+    random.random()
+    assert get_seeded_m_counts(workers) == expected
+
+
+def test_print_results_without_a_log_file():
+    simulation = SpectrographSimulation(
+        deck_file_path="data/decklists/nats2024_1st_tim_estes.txt",
+        n_simulations=20,
+        log_file=None,
+        rng=random.Random(0),
+        **SIMULATION_SETTINGS,
+    )
+    simulation.initialize_decklist()
+    simulation.run(only_matthew_results=True)
+    m_count = simulation.m_count
+    simulation.print_results()
+    assert simulation.m_count == m_count > 0
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+
+from src.utilities import sniper
+from src.utilities.text_to_pdf import render_reserve_list_overlay
+
+DECKLIST_FOLDER = Path(__file__).resolve().parents[1] / "data" / "decklists"
+DECK_PATHS = sorted(str(path) for path in DECKLIST_FOLDER.glob("*.txt"))[:3]
+
+
+@pytest.fixture
+def oversized_reserve_deck(tmp_path):
+    """A deck with an 11th reserve card, one more than a reserve slip holds."""
+    text = Path(DECK_PATHS[0]).read_text(encoding="utf-8")
+    path = tmp_path / "oversized_reserve.txt"
+    path.write_text(
+        text.replace("Reserve:\n", "Reserve:\n1\tSon of God (2016 Promo)\n"),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reserve_failure_keeps_the_check_sheet(
+    oversized_reserve_deck, tmp_path, monkeypatch, workers
+):
+    monkeypatch.setattr(sniper, "OUTPUT_PDF_FOLDER", str(tmp_path))
+    deck_paths = [DECK_PATHS[0], oversized_reserve_deck, DECK_PATHS[1]]
+
+    output_path, errors, reserve_errors = sniper.generate_check_sheet_batch(
+        "type_1", deck_paths, "batch", workers=workers, reserve_list=True
+    )
+
+    assert errors == []
+    assert [deck_path for deck_path, _ in reserve_errors] == [oversized_reserve_deck]
+    assert isinstance(reserve_errors[0][1], ValueError)
+    assert len(PdfReader(output_path).pages) == 3
+    assert len(PdfReader(str(tmp_path / "batch_reserve_lists.pdf")).pages) == 2
+
+
+def test_type_2_has_no_reserve_list_template():
+    with pytest.raises(ValueError, match="No reserve list template for type_2"):
+        render_reserve_list_overlay("type_2", {})
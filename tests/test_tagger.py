@@ -0,0 +1,216 @@
+import csv
+
+import pytest
+
+from src.utilities.tagger import (
+    CITATION_PATTERN,
+    Citation,
+    get_reference_tags,
+    is_nativity_passage,
+    load_card_data,
+    parse_reference,
+    split_references,
+    tag_card,
+    update_card_data,
+)
+
+FIELDS = ["Name", "OfficialSet", "Identifier", "Reference"]
+CARDS = [
+    ["Shepherds", "Promo", "", "Luke 2:8"],
+    ["Moses", "Roots", "", "Exodus 3:10"],
+    ["Paul", "Roots", "", "Acts 9:15"],
+]
+
+
+@pytest.mark.parametrize(
+    "ref, book",
+    [
+        ("John 3:16", "John"),
+        ("I John 4:8", "I John"),
+        ("III John 1:4", "III John"),
+        ("II Kings 2:11", "II Kings"),
+        ("Song of Solomon 2:1", "Song of Solomon"),
+        ("Psalms 23:1", "Psalms"),
+        ("Psalm 23:1", "Psalm"),
+    ],
+)
+def test_citation_pattern_matches_the_longest_book_name(ref, book):
+    assert CITATION_PATTERN.match(ref).group("book") == book
+
+
+@pytest.mark.parametrize(
+    "ref, citations",
+    [
+        ("Genesis 1:1", [Citation("Genesis", 1, 1, 1)]),
+        ("Matthew 1:18-25", [Citation("Matthew", 1, 18, 25)]),
+        ("Matthew 2", [Citation("Matthew", 2, None, None)]),
+        ("Hebrews", [Citation("Hebrews", None, None, None)]),
+        (
+            "Isaiah 11:10/Romans 15:12",
+            [Citation("Isaiah", 11, 10, 10), Citation("Romans", 15, 12, 12)],
+        ),
+        (
+            "I John 2:1-2 and John 1:29",
+            [Citation("I John", 2, 1, 2), Citation("John", 1, 29, 29)],
+        ),
+        ("Not a reference", []),
+    ],
+)
+def test_parse_reference(ref, citations):
+    assert parse_reference(ref) == tuple(citations)
+
+
+@pytest.mark.parametrize(
+    "ref, is_nativity",
+    [
+        ("Matthew 1:17", False),
+        ("Matthew 1:18", True),
+        ("Matthew 1:18-25", True),
+        ("Matthew 1:25", True),
+        ("Matthew 1:17-19", False),
+        ("Matthew 1:24-26", False),
+        ("Matthew 1", False),
+        ("Matthew 2", True),
+        ("Matthew 2:1", False),
+        ("Matthew 3", False),
+        ("Luke 1", True),
+        ("Luke 1:5", True),
+        ("Luke 2:52", True),
+        ("Luke 3:1", False),
+        ("John 1:14", False),
+    ],
+)
+def test_is_nativity_passage(ref, is_nativity):
+    (citation,) = parse_reference(ref)
+    assert is_nativity_passage(citation) is is_nativity
+
+
+@pytest.mark.parametrize(
+    "ref, tags",
+    [
+        ("Genesis 1:1", ("[OT]",)),
+        ("Acts 9:15", ("[NT]",)),
+        ("John 3:16", ("[Gospel]", "[NT]")),
+        ("I John 4:8", ("[NT]",)),
+        ("Luke 2:8", ("Nativity", "[Gospel]", "[NT]")),
+        ("Matthew 2:1", ("[Gospel]", "[NT]")),
+        ("Isaiah 7:14/Matthew 1:23", ("Nativity", "[Gospel]", "[OT]")),
+        ("  Luke 1:31 ", ("Nativity", "[Gospel]", "[NT]")),
+    ],
+)
+def test_get_reference_tags(ref, tags):
+    assert get_reference_tags(ref) == tags
+
+
+@pytest.mark.parametrize(
+    "reference_field, references",
+    [
+        ("Luke 2:8", ["Luke 2:8"]),
+        ("Genesis 1:1; Luke 2:8", ["Genesis 1:1", "Luke 2:8"]),
+        (
+            "Matthew 1:20; Luke 2:8 (Isaiah 9:6, Micah 5:2)",
+            ["Matthew 1:20", "Luke 2:8", "Isaiah 9:6", "Micah 5:2"],
+        ),
+    ],
+)
+def test_split_references(reference_field, references):
+    assert split_references(reference_field) == references
+
+
+@pytest.mark.parametrize(
+    "identifier, reference, tagged",
+    [
+        ("", "Genesis 1:1; Luke 2:8", "[OT],Nativity,[Gospel],[NT]"),
+        ("", "Luke 2:8; Luke 1:26", "Nativity,[Gospel],[NT]"),
+        ("O.T.", "Matthew 5:1", "O.T.,[Gospel]"),
+        ("O.T.", "Acts 9:15", "O.T."),
+        ("[OT]", "Genesis 1:1", "[OT]"),
+        ("Hero", "", "Hero"),
+    ],
+)
+def test_tag_card(identifier, reference, tagged):
+    card_data = {"Identifier": identifier, "Reference": reference}
+    assert tag_card(card_data)["Identifier"] == tagged
+
+
+def write_source(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, delimiter="\t", lineterminator="\r\n")
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    source_path = tmp_path / "carddata_original.txt"
+    write_source(source_path, CARDS)
+    return (
+        str(source_path),
+        str(tmp_path / "carddata.txt"),
+        str(tmp_path / "carddata_manifest.json"),
+    )
+
+
+def test_first_run_tags_every_card(paths):
+    report = update_card_data(*paths)
+    assert len(report.added) == len(CARDS)
+    assert report.unchanged == 0
+    card_data = load_card_data(paths[1])
+    assert card_data["Shepherds____Promo"]["Identifier"] == "Nativity,[Gospel],[NT]"
+    assert card_data["Moses____Roots"]["Identifier"] == "[OT]"
+
+
+def test_unchanged_cards_are_copied_from_the_previous_output(paths):
+    source_path, output_path, manifest_path = paths
+    update_card_data(*paths)
+    # Mark the previous output, so a copied row can be told from a re-tagged one
+    with open(output_path, encoding="utf-8") as file:
+        text = file.read()
+    with open(output_path, "w", encoding="utf-8", newline="") as file:
+        file.write(text.replace("[OT]", "[OT],Copied"))
+
+    report = update_card_data(*paths)
+    assert report.unchanged == len(CARDS)
+    assert not report.added and not report.changed and not report.removed
+    assert load_card_data(output_path)["Moses____Roots"]["Identifier"] == (
+        "[OT],Copied"
+    )
+
+
+def test_changed_added_and_removed_cards_are_reported(paths):
+    source_path, output_path, manifest_path = paths
+    update_card_data(*paths)
+    write_source(
+        source_path,
+        [
+            ["Shepherds", "Promo", "", "Luke 2:8"],
+            ["Moses", "Roots", "", "Matthew 17:3"],
+            ["Daniel", "Roots", "", "Daniel 6:22"],
+        ],
+    )
+
+    report = update_card_data(*paths)
+    assert report.changed == ["Moses____Roots"]
+    assert report.added == ["Daniel____Roots"]
+    assert report.removed == ["Paul____Roots"]
+    assert report.unchanged == 1
+
+    incremental = load_card_data(output_path)
+    update_card_data(*paths, full=True)
+    assert incremental == load_card_data(output_path)
+
+
+def test_empty_source_keeps_the_previous_output(paths):
+    source_path, output_path, manifest_path = paths
+    update_card_data(*paths)
+    with open(output_path, encoding="utf-8") as file:
+        previous_output = file.read()
+    write_source(source_path, [])
+
+    report = update_card_data(*paths)
+    assert not report.added and not report.changed and not report.removed
+    with open(output_path, encoding="utf-8") as file:
+        assert file.read() == previous_output
+    # The manifest still matches the previous output
+    write_source(source_path, CARDS)
+    assert update_card_data(*paths).unchanged == len(CARDS)